@@ -3,107 +3,198 @@ import sys
 import asyncio
 import json
 import subprocess
-import functools
+import importlib.metadata
+import importlib.util
 import re
-import math
+import shutil
 import signal
-import unicodedata
+import time
 import urllib.request
 from io import BytesIO
-from difflib import SequenceMatcher
 from pathlib import Path
 from datetime import datetime
 import traceback
-import yt_dlp
+
+_MODULE_T0 = time.perf_counter()
 
 # ARCHITECT: MATTHEW BUBB (SOLE PROGRAMMER)
 # ==============================================================================
 
-DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 DUR_REGEX = re.compile(r'^\d{1,2}:\d{2}(:\d{2})?$')
 
-def bootstrap_dependencies():
-    """Ensure system vectors are aligned."""
+APP_DATA_DIR = Path.home() / "AppData" / "Local" / "AetherArchivist"
+PROBE_MANIFEST_PATH = APP_DATA_DIR / "probe_manifest.json"
+PROBE_MAX_AGE_DAYS = 7
+
+# import name -> pip distribution name
+BOOTSTRAP_DEPS = {
+    "playwright": "playwright",
+    "yt_dlp": "yt-dlp",
+    "textual": "textual",
+    "rich": "rich",
+    "mutagen": "mutagen",
+    "PIL": "Pillow",
+}
+
+def _configure_runtime_paths() -> Path:
+    """Point Playwright and yt-dlp at persistent browser/ffmpeg locations. Cheap, runs every start."""
     # Playwright expects a browsers path. For PyInstaller, it defaults to the temporary MEIPASS,
     # which is deleted on exit. We should set it to the user's Local AppData to persist the browser.
     local_app_data = Path.home() / "AppData" / "Local" / "ms-playwright"
     os.environ["PLAYWRIGHT_BROWSERS_PATH"] = str(local_app_data)
 
     # Bootstrapper for FFmpeg/FFprobe binaries (required for yt-dlp audio extraction)
-    ffmpeg_dir = Path.home() / "AppData" / "Local" / "AetherArchivist" / "ffmpeg"
+    ffmpeg_dir = APP_DATA_DIR / "ffmpeg"
     ffmpeg_dir.mkdir(parents=True, exist_ok=True)
     os.environ["PATH"] = str(ffmpeg_dir) + os.pathsep + os.environ.get("PATH", "")
 
-    if not (ffmpeg_dir / "ffmpeg.exe").exists() or not (ffmpeg_dir / "ffprobe.exe").exists():
-        try:
-            print("[*] DOWNLOADING FFMPEG/FFPROBE CORE (REQUIRED FOR AUDIO)...")
-            import urllib.request
-            import zipfile
-            from io import BytesIO
-            if not (ffmpeg_dir / "ffmpeg.exe").exists():
-                req = urllib.request.Request("https://github.com/ffbinaries/ffbinaries-prebuilt/releases/download/v4.4.1/ffmpeg-4.4.1-win-64.zip", headers={'User-Agent': 'Mozilla/5.0'})
-                with urllib.request.urlopen(req) as resp:
-                    with zipfile.ZipFile(BytesIO(resp.read())) as z:
-                        z.extract("ffmpeg.exe", ffmpeg_dir)
-            if not (ffmpeg_dir / "ffprobe.exe").exists():
-                req = urllib.request.Request("https://github.com/ffbinaries/ffbinaries-prebuilt/releases/download/v4.4.1/ffprobe-4.4.1-win-64.zip", headers={'User-Agent': 'Mozilla/5.0'})
-                with urllib.request.urlopen(req) as resp:
-                    with zipfile.ZipFile(BytesIO(resp.read())) as z:
-                        z.extract("ffprobe.exe", ffmpeg_dir)
-        except Exception as e:
-            print(f"Failed to bootstrap FFmpeg: {e}")
-
     # Frozen EXE mode: all deps are bundled, just configure paths
     if getattr(sys, 'frozen', False):
         bundle_dir = Path(sys._MEIPASS) if hasattr(sys, '_MEIPASS') else Path(sys.executable).parent
-        ffmpeg_dir = bundle_dir / "ffmpeg_bundle"
-        if ffmpeg_dir.exists():
-            os.environ["PATH"] = str(ffmpeg_dir) + os.pathsep + os.environ.get("PATH", "")
-
-        # In frozen mode, ensure playwright browser is installed in Local AppData
-        try:
-            from playwright.async_api import async_playwright
-            async def check_playwright():
-                async with async_playwright() as p:
-                    try:
-                        # Test if browser exists
-                        browser = await p.chromium.launch()
-                        await browser.close()
-                    except Exception:
-                        print("[*] DOWNLOADING CHROMIUM HEADLESS SHELL...")
-                        import subprocess
-                        from playwright._impl._driver import compute_driver_executable, get_driver_env
-                        driver_executable, driver_cli = compute_driver_executable()
-                        env = get_driver_env()
-                        env["PLAYWRIGHT_BROWSERS_PATH"] = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
-                        subprocess.run([str(driver_executable), str(driver_cli), "install", "chromium"], env=env, check=True)
-            asyncio.run(check_playwright())
-        except Exception as e:
-            print(f"Failed to bootstrap Playwright: {e}")
+        bundled_ffmpeg = bundle_dir / "ffmpeg_bundle"
+        if bundled_ffmpeg.exists():
+            os.environ["PATH"] = str(bundled_ffmpeg) + os.pathsep + os.environ.get("PATH", "")
+    return ffmpeg_dir
+
+def _ensure_ffmpeg(ffmpeg_dir: Path) -> None:
+    """Download the FFmpeg/FFprobe core into ffmpeg_dir if neither PATH nor the cache provides it."""
+    if shutil.which("ffmpeg") and shutil.which("ffprobe"):
         return
+    try:
+        print("[*] DOWNLOADING FFMPEG/FFPROBE CORE (REQUIRED FOR AUDIO)...")
+        import zipfile
+        if not (ffmpeg_dir / "ffmpeg.exe").exists():
+            req = urllib.request.Request("https://github.com/ffbinaries/ffbinaries-prebuilt/releases/download/v4.4.1/ffmpeg-4.4.1-win-64.zip", headers={'User-Agent': 'Mozilla/5.0'})
+            with urllib.request.urlopen(req) as resp:
+                with zipfile.ZipFile(BytesIO(resp.read())) as z:
+                    z.extract("ffmpeg.exe", ffmpeg_dir)
+        if not (ffmpeg_dir / "ffprobe.exe").exists():
+            req = urllib.request.Request("https://github.com/ffbinaries/ffbinaries-prebuilt/releases/download/v4.4.1/ffprobe-4.4.1-win-64.zip", headers={'User-Agent': 'Mozilla/5.0'})
+            with urllib.request.urlopen(req) as resp:
+                with zipfile.ZipFile(BytesIO(resp.read())) as z:
+                    z.extract("ffprobe.exe", ffmpeg_dir)
+    except Exception as e:
+        print(f"Failed to bootstrap FFmpeg: {e}")
+
+def _dist_version(dist: str) -> str | None:
+    try:
+        return importlib.metadata.version(dist)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+def _ffmpeg_version() -> str | None:
+    exe = shutil.which("ffmpeg")
+    if not exe:
+        return None
+    try:
+        out = subprocess.run([exe, "-version"], capture_output=True, text=True, timeout=10).stdout
+        return out.splitlines()[0].strip() if out else None
+    except Exception:
+        return None
+
+def _install_chromium() -> None:
+    """Install the Playwright Chromium build (driver CLI in frozen mode, pip module otherwise)."""
+    print("[*] DOWNLOADING CHROMIUM HEADLESS SHELL...")
+    if getattr(sys, 'frozen', False):
+        from playwright._impl._driver import compute_driver_executable, get_driver_env
+        driver_executable, driver_cli = compute_driver_executable()
+        env = get_driver_env()
+        env["PLAYWRIGHT_BROWSERS_PATH"] = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+        subprocess.run([str(driver_executable), str(driver_cli), "install", "chromium"], env=env, check=True)
+    else:
+        subprocess.check_call([sys.executable, "-m", "playwright", "install", "chromium"])
+
+def _probe_chromium() -> str | None:
+    """Launch Chromium once (installing it if missing) and return its executable path."""
+    from playwright.async_api import async_playwright
+    async def check_playwright():
+        async with async_playwright() as p:
+            try:
+                browser = await p.chromium.launch()
+                await browser.close()
+            except Exception:
+                _install_chromium()
+            return p.chromium.executable_path
+    try:
+        return asyncio.run(check_playwright())
+    except Exception as e:
+        print(f"Failed to bootstrap Playwright: {e}")
+        return None
 
+def _full_probe() -> dict:
+    """Cold path: install missing deps, launch Chromium, record versions for later warm starts."""
     print("[*] SYNCING SYSTEM VECTORS (BOOTSTRAPPING)...")
-    deps = ["playwright", "yt-dlp", "textual", "rich", "mutagen", "Pillow"]
-    for dep in deps:
-        try:
-            __import__(dep)
-        except ImportError:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", dep, "-q"])
+    if not getattr(sys, 'frozen', False):
+        for module, dist in BOOTSTRAP_DEPS.items():
+            if importlib.util.find_spec(module) is None:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", dist, "-q"])
+        importlib.invalidate_caches()
+    return {
+        "verified_at": datetime.now().isoformat(),
+        "python": sys.executable,
+        "frozen": bool(getattr(sys, 'frozen', False)),
+        "versions": {dist: _dist_version(dist) for dist in ("playwright", "yt-dlp")},
+        "ffmpeg": {"path": shutil.which("ffmpeg"), "version": _ffmpeg_version()},
+        "browser_path": _probe_chromium(),
+    }
 
-    # Playwright browser validation
+def _load_probe_manifest() -> dict | None:
     try:
-        from playwright.async_api import async_playwright
-        async def check_playwright():
-            async with async_playwright() as p:
-                try:
-                    await p.chromium.launch()
-                except Exception:
-                    subprocess.check_call([sys.executable, "-m", "playwright", "install", "chromium"])
-        asyncio.run(check_playwright())
-    except Exception:
-        pass
-# Initialize environment
-bootstrap_dependencies()
+        with open(PROBE_MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else None
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+def _manifest_is_fresh(manifest: dict) -> bool:
+    """Warm path: only find_spec / file-exists / metadata checks, no subprocesses or browsers."""
+    try:
+        verified = datetime.fromisoformat(manifest["verified_at"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    if (datetime.now() - verified).days >= PROBE_MAX_AGE_DAYS:
+        return False
+    if manifest.get("python") != sys.executable:
+        return False
+    if not getattr(sys, 'frozen', False):
+        if any(importlib.util.find_spec(m) is None for m in BOOTSTRAP_DEPS):
+            return False
+        for dist, version in manifest.get("versions", {}).items():
+            if _dist_version(dist) != version:
+                return False
+    browser_path = manifest.get("browser_path")
+    if not browser_path or not Path(browser_path).exists():
+        return False
+    ffmpeg_path = (manifest.get("ffmpeg") or {}).get("path")
+    if not ffmpeg_path or not Path(ffmpeg_path).exists():
+        return False
+    return True
+
+def bootstrap_dependencies(force_probe: bool = False) -> dict:
+    """Ensure system vectors are aligned. Re-probes only when the cached manifest is stale or forced."""
+    ffmpeg_dir = _configure_runtime_paths()
+    manifest = None if force_probe else _load_probe_manifest()
+    if manifest and _manifest_is_fresh(manifest):
+        return manifest
+
+    _ensure_ffmpeg(ffmpeg_dir)
+    manifest = _full_probe()
+    try:
+        PROBE_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(PROBE_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+    except OSError as e:
+        print(f"Failed to persist probe manifest: {e}")
+    return manifest
+
+# Initialize environment — script entry only, so importing this module stays side-effect free.
+# Runs ahead of the Textual imports below so a cold probe can still pip-install them.
+if __name__ == "__main__":
+    if "--harvest-worker" in sys.argv:
+        # Frozen builds re-launch this binary as the harvest worker process (aether_harvest.worker_command)
+        from aether_harvest import run_worker
+        sys.exit(run_worker())
+    bootstrap_dependencies(force_probe="--reprobe" in sys.argv)
 
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, DataTable, Log, Input, Button, Label, Static, Select, ProgressBar
@@ -119,25 +210,56 @@ from rich.text import Text
 from rich.segment import Segment
 from rich.style import Style
 
-# ── Optional dependencies (gracefully degrade if unavailable) ──
-try:
-    from mutagen.id3 import ID3, TIT2, TPE1, TALB, TRCK, APIC, TDRC, ID3NoHeaderError
-    MUTAGEN_OK = True
-except ImportError:
-    MUTAGEN_OK = False
+from aether_engine import (
+    IngestEngine, TrackStatus, TrackProgress, TrackComplete, TrackFailed, EngineLog,
+    HEDGE_DELAY, MATCH_CONCURRENCY, MATCH_LOOKAHEAD, SEARCH_MODES, MatchScheduler, _parse_duration, _signature,
+    set_score_in_thread, set_search_hedge, set_search_mode, shutdown_ydl_pool, track_key,
+)
+from aether_harvest import (
+    HARVEST_STRATEGIES, cached_harvest, scrape_playlist_data, shutdown_browser_pool, shutdown_harvest_worker,
+    format_route_report,
+)
+from aether_store import (
+    NO_MATCH_TTL, SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_TTL, configure_no_match_cache, configure_search_cache,
+    get_no_match_cache, get_resolved_tracks,
+)
+
+# ── Startup profile ────────────────────────────────────────────
+# yt-dlp, Playwright, Pillow and mutagen load on first use (aether_engine._lazy_import),
+# not before the Launchpad paints.
+STARTUP_MODULES = ("textual.app", "textual.widgets", "rich.text")
+DEFERRED_MODULES = ("yt_dlp", "playwright.async_api", "PIL.Image", "mutagen.id3")
+def _cold_import_ms(module_name: str) -> float | None:
+    """Cost of importing module_name in a fresh interpreter, so shared deps aren't already warm."""
+    code = ("import time; t = time.perf_counter(); import " + module_name +
+            "; print((time.perf_counter() - t) * 1000)")
+    try:
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=120)
+        return float(proc.stdout.strip()) if proc.returncode == 0 else None
+    except (subprocess.TimeoutExpired, ValueError, OSError):
+        return None
 
-try:
-    from PIL import Image
-    PILLOW_OK = True
-except ImportError:
-    PILLOW_OK = False
+def profile_startup() -> list[dict]:
+    """Per-module cold import cost, split into first-frame and deferred (lazy) modules."""
+    rows = []
+    for phase, modules in (("first-frame", STARTUP_MODULES), ("deferred", DEFERRED_MODULES)):
+        for module in modules:
+            rows.append({"module": module, "phase": phase, "ms": _cold_import_ms(module)})
+    return rows
+
+def print_startup_profile(rows: list[dict], first_frame_ms: float | None = None) -> None:
+    print(f"{'MODULE':<24}{'PHASE':<14}{'COLD IMPORT':>12}")
+    for row in rows:
+        cost = f"{row['ms']:.1f} ms" if row["ms"] is not None else "MISSING"
+        print(f"{row['module']:<24}{row['phase']:<14}{cost:>12}")
+    # Measured together: the first-frame modules share most of their dependency tree
+    critical = _cold_import_ms(", ".join(STARTUP_MODULES))
+    if critical is not None:
+        print(f"FIRST-FRAME IMPORT BUDGET: {critical:.1f} ms")
+    if first_frame_ms is not None:
+        print(f"TIME TO FIRST FRAME (module load -> Launchpad painted): {first_frame_ms:.1f} ms")
 
 # ── Constants ──────────────────────────────────────────────────
-BLOCKLIST_TERMS = frozenset([
-    'podcast', 'mix', 'compilation', 'full album', 'hour', 'hrs',
-    'mashup', 'megamix', 'medley', 'karaoke', 'instrumental only',
-])
-
 STATUS_MAP = {
     "WAITING FOR PROPAGATION": ("[ WAIT ]", "yellow"),
     "MATCHING":                ("[ SRCH ]", "cyan"),
@@ -150,82 +272,7 @@ STATUS_MAP = {
     "ALREADY ARCHIVED":        ("[ SKIP ]", "green"),
 }
 
-_SEARCH_CACHE: dict = {}
-
 # ── Helper functions ───────────────────────────────────────────
-def _is_blocked(title: str) -> bool:
-    """P17: Filter podcast/mix/compilation results."""
-    t = title.lower()
-    return any(term in t for term in BLOCKLIST_TERMS)
-
-def _score_result(result: dict, track: dict, spotify_dur: int) -> float:
-    """P15: Multi-signal scorer — duration 45%, title 20%, views 20%, channel_auth 15%."""
-    dur = result.get('duration', 0) or 0
-    title = result.get('title', '').lower()
-
-    dur_diff = abs(dur - spotify_dur)
-    if dur_diff > 90:
-        dur_score = 0.0
-    elif dur_diff > 30:
-        dur_score = 0.45 * (1.0 - (dur_diff - 30) / 60.0)
-    else:
-        dur_score = 1.0 - (dur_diff / 30.0) * 0.45
-
-    search_str = f"{track.get('artist','')} {track.get('title','')}".lower()
-    title_score = SequenceMatcher(None, search_str, title).ratio()
-
-    views = result.get('view_count', 0) or 0
-    view_score = min(math.log10(max(views, 1)) / 9.0, 1.0)
-
-    artist = track.get('artist', '').lower()
-    channel = (result.get('channel') or '').lower()
-    uploader = (result.get('uploader') or '').lower()
-    is_verified = result.get('channel_is_verified', False)
-
-    auth_score = 0.0
-    if is_verified:
-        auth_score += 0.5
-
-    artist_clean = artist.replace(' ', '')
-    channel_clean = channel.replace(' ', '')
-    uploader_clean = uploader.replace(' ', '')
-
-    if artist_clean and (artist_clean in channel_clean or artist_clean in uploader_clean):
-        auth_score += 0.5
-    elif "vevo" in channel_clean or "official" in channel_clean or "-topic" in channel_clean:
-        auth_score += 0.3
-
-    auth_score = min(auth_score, 1.0)
-
-    penalty = 0.0
-    if "cover" not in search_str and "cover" in title:
-        penalty += 0.2
-    if "live" not in search_str and "live" in title:
-        penalty += 0.1
-
-    return max(0.0, (dur_score * 0.45) + (title_score * 0.20) + (view_score * 0.20) + (auth_score * 0.15) - penalty)
-
-def _sanitise_filename(name: str) -> str:
-    """Refactor: NFC-normalized, filesystem-safe filename preservation."""
-    name = unicodedata.normalize('NFC', name)
-    unsafe = set('<>:"/\\|?*')
-    return "".join(c if c not in unsafe else "_" for c in name).strip()
-
-def _fetch_art(thumbnail_url: str) -> bytes | None:
-    """P37: Fetch and resize album art thumbnail."""
-    if not PILLOW_OK or not thumbnail_url:
-        return None
-    try:
-        req = urllib.request.Request(thumbnail_url, headers={'User-Agent': DEFAULT_USER_AGENT})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = resp.read()
-        img = Image.open(BytesIO(data)).convert('RGB').resize((500, 500), Image.LANCZOS)
-        out = BytesIO()
-        img.save(out, format='JPEG', quality=85)
-        return out.getvalue()
-    except Exception:
-        return None
-
 def _make_ratio_bar(complete: int, no_match: int, failed: int, total: int, width: int = 38) -> Text:
     """P28: ASCII proportion bar for StatsScreen."""
     if total == 0:
@@ -393,98 +440,142 @@ class Launchpad(Screen):
             thread_count = 36
         self.app.push_screen(WatchdogScreen(library, thread_count, engine))
 
-def _write_failure_log(entry: dict) -> None:
-    """Append a structured failure entry to failure_log.json for debugging."""
-    log_path = Path(os.getcwd()) / "failure_log.json"
-    history = []
-    if log_path.exists():
-        try:
-            with open(log_path, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-                if not isinstance(history, list): history = []
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            history = []
-    history.append(entry)
-    with open(log_path, 'w', encoding='utf-8') as f:
-        json.dump(history, f, indent=2)
+def _clean_library_name(library: str) -> str:
+    return "".join([c for c in library if c.isalnum() or c in " -_"]).strip() or "Aether_Archive"
+
+def read_url_file(path: str) -> list[str]:
+    """One playlist URL per line; blank lines and '#' comments are ignored."""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+class HeadlessMission:
+    """Unattended harvest→match→download→tag runner. No widgets; JSON Lines progress on stdout."""
+
+    def __init__(self, library: str = "Aether_Archive", threads: int = 36,
+                 include_recommended: bool = False, out=None, harvest_strategy: str = "json",
+                 harvest_in_worker: bool = False, refresh_harvest: bool = False, stream: bool = False):
+        self.library = _clean_library_name(library)
+        self.threads = max(threads, 1)
+        self.include_recommended = include_recommended
+        self.harvest_strategy = harvest_strategy
+        self.harvest_in_worker = harvest_in_worker
+        self.refresh_harvest = refresh_harvest
+        self.stream = stream
+        self.out = out or sys.stdout
+        self.target_dir = Path(os.getcwd()) / "Audio_Libraries" / self.library
+        self.totals = {"total": 0, "complete": 0, "no_match": 0, "failed": 0}
 
-async def scrape_playlist_data(url: str, include_recommended: bool = False) -> tuple[str, list[dict]]:
-    """Standalone Playwright scraper — returns (playlist_name, [{artist, title, duration}, ...])."""
-    from playwright.async_api import async_playwright
-    # Scope selector: only main tracklist, or all rows if including recommended
-    ROW_SCOPE = '[data-testid="tracklist-row"]' if include_recommended else '[data-testid="playlist-tracklist"] [data-testid="tracklist-row"]'
-    playlist_name = "Unknown Playlist"
-    dur_regex = re.compile(r'^\d{1,2}:\d{2}(:\d{2})?$')
-    tracks = []
-    processed_ids = set()
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        try:
-            await page.goto(url, timeout=60000)
-            await page.wait_for_load_state("load")
-            try: await page.click('button#onetrust-accept-btn-handler', timeout=3000)
-            except: pass
-            await page.wait_for_selector(ROW_SCOPE, timeout=30000)
-            # Extract playlist name from page
-            try:
-                raw_title = await page.title()
-                # Spotify titles are like "Playlist Name - playlist by Creator | Spotify"
-                playlist_name = raw_title.split(" - ")[0].strip() if raw_title else "Unknown Playlist"
-            except Exception:
-                pass
+    def emit(self, event: str, **fields) -> None:
+        record = {"ts": datetime.now().isoformat(), "event": event, **fields}
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
 
-            last_count = -1
-            stable_count = 0
-            while stable_count < 10:
-                scroll_scope = 'document' if include_recommended else '(document.querySelector(\'[data-testid="playlist-tracklist"]\') || document)'
-                await page.evaluate('() => { const r = ' + scroll_scope + '.querySelectorAll(\'[data-testid="tracklist-row"]\'); if (r.length > 0) r[r.length-1].scrollIntoView(); return r.length; }')
-                await page.mouse.wheel(0, 5000)
-                for _ in range(2):
-                    await page.keyboard.press("PageDown")
-                    await asyncio.sleep(0.1)
-
-                scope_js = 'document' if include_recommended else '(document.querySelector(\'[data-testid="playlist-tracklist"]\') || document)'
-                extracted = await page.evaluate('() => { const scope = ' + scope_js + '''; return Array.from(scope.querySelectorAll('[data-testid="tracklist-row"]')).map(row => {
-                        const titleElem = row.querySelector('div[dir="auto"]');
-                        const artistElems = row.querySelectorAll('a[href*="/artist/"]');
-                        const durElem = row.querySelector('div[data-testid="tracklist-row-duration"]');
-                        let duration = durElem ? durElem.innerText : "0:00";
-                        if (duration === "0:00") {
-                            const potentialDurs = Array.from(row.querySelectorAll('div')).filter(d => d.innerText.includes(':'));
-                            const durRegex = /^\\d{1,2}:\\d{2}(:\\d{2})?$/;
-                            for (const pd of potentialDurs) {
-                                if (durRegex.test(pd.innerText.trim())) { duration = pd.innerText.trim(); break; }
-                            }
-                        }
-                        return {
-                            title: titleElem ? titleElem.innerText : "Unknown",
-                            artists: Array.from(artistElems).map(a => a.innerText).join(", "),
-                            duration: duration
-                        };
-                    });
-                }''')
-
-                for td in extracted:
-                    tid = f"{td['artists']}_{td['title']}".strip()
-                    if tid and tid not in processed_ids:
-                        processed_ids.add(tid)
-                        tracks.append({"artist": td["artists"], "title": td["title"], "duration": td["duration"]})
-
-                current = len(tracks)
-                if current == last_count:
-                    stable_count += 1
-                else:
-                    stable_count = 0
-                    last_count = current
-        except Exception:
-            pass
+    async def run(self, urls: list[str]) -> int:
+        """Process playlists sequentially. Exit code 1 if any playlist failed to harvest."""
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        harvest_failures = 0
+        try:
+            for url in urls:
+                if not await self.run_playlist(url):
+                    harvest_failures += 1
         finally:
-            await browser.close()
-    return playlist_name, tracks
+            await shutdown_browser_pool()
+            await shutdown_harvest_worker()
+            shutdown_ydl_pool()
+        self.emit("batch_complete", playlists=len(urls), harvest_failures=harvest_failures,
+                  stats=self.totals)
+        return 1 if harvest_failures else 0
+
+    async def run_playlist(self, url: str) -> bool:
+        if "http" in url:
+            url = url[url.find("http"):].strip()
+        self.emit("mission_start", url=url, library=self.library, threads=self.threads)
+        if self.stream:
+            return await self._run_playlist_streaming(url)
+        harvest_start = time.perf_counter()
+        try:
+            name, tracks = await scrape_playlist_data(url, self.include_recommended, self.harvest_strategy,
+                                                      self.harvest_in_worker, self.refresh_harvest)
+        except Exception as e:
+            self.emit("harvest_failed", url=url, error=str(e))
+            return False
+        harvest_dur = time.perf_counter() - harvest_start
+        self.emit("harvest_complete", url=url, playlist=name, tracks=len(tracks),
+                  seconds=round(harvest_dur, 2))
+        if not tracks:
+            self.emit("harvest_failed", url=url, error="No track descriptors harvested")
+            return False
+
+        stats = {"total": len(tracks), "complete": 0, "no_match": 0, "failed": 0}
+        ingest_start = time.perf_counter()
+        # Default resolver: no one to ask in an unattended run, so ambiguous matches take the top rank
+        engine = IngestEngine(self.target_dir, self.library, self.threads)
+        async for event in engine.run(tracks):
+            self._emit_engine_event(url, tracks, event, stats)
+        for k, v in stats.items():
+            self.totals[k] += v
+        stats.update(engine.search_stats)
+        self.emit("mission_complete", url=url, playlist=name, stats=stats,
+                  harvest_seconds=round(harvest_dur, 2),
+                  ingest_seconds=round(time.perf_counter() - ingest_start, 2))
+        return True
+
+    async def _run_playlist_streaming(self, url: str) -> bool:
+        """Harvest, match, download and tag concurrently: each row enters the pipeline as it is harvested."""
+        start = time.perf_counter()
+        tracks: list[dict] = []
+        stats = {"total": 0, "complete": 0, "no_match": 0, "failed": 0}
+        harvest = {"name": "Unknown Playlist", "error": None}
+
+        async def rows():
+            try:
+                async for batch in cached_harvest(url, self.include_recommended, self.harvest_strategy,
+                                                  self.harvest_in_worker, refresh=self.refresh_harvest):
+                    harvest["name"] = batch.playlist_name
+                    for track in batch.tracks:
+                        tracks.append(track)
+                        stats["total"] += 1
+                        yield len(tracks) - 1, track
+            except Exception as e:
+                harvest["error"] = str(e)  # keep streaming what was harvested, like scrape_playlist_data
+            self.emit("harvest_complete", url=url, playlist=harvest["name"], tracks=len(tracks),
+                      seconds=round(time.perf_counter() - start, 2))
+
+        engine = IngestEngine(self.target_dir, self.library, self.threads)
+        async for event in engine.run_stream(rows()):
+            self._emit_engine_event(url, tracks, event, stats)
+        if not tracks:
+            self.emit("harvest_failed", url=url, error=harvest["error"] or "No track descriptors harvested")
+            return False
+        for k, v in stats.items():
+            self.totals[k] += v
+        stats.update(engine.search_stats)
+        self.emit("mission_complete", url=url, playlist=harvest["name"], stats=stats, streamed=True,
+                  seconds=round(time.perf_counter() - start, 2))
+        return True
+
+    def _emit_engine_event(self, url: str, tracks: list[dict], event, stats: dict) -> None:
+        if isinstance(event, EngineLog):
+            self.emit("log", url=url, index=event.index, message=event.message)
+            return
+        if isinstance(event, TrackProgress):
+            return  # per-chunk speed is UI sugar; keep the JSONL stream to state changes
+        track = tracks[event.index]
+        fields = {"url": url, "index": event.index, "artist": track.get("artist", ""),
+                  "title": track.get("title", ""), "track_id": track.get("track_id"),
+                  "status": event.status}
+        if isinstance(event, TrackComplete):
+            stats["complete"] += 1
+            fields.update(seconds=round(event.elapsed, 2), size_bytes=event.size_bytes,
+                          file=str(event.path))
+        elif isinstance(event, TrackFailed):
+            stats["failed"] += 1
+            fields.update(phase=event.phase, error=event.error)
+        elif event.status == "ALREADY ARCHIVED":
+            stats["complete"] += 1
+        elif event.status == "NO MATCH":
+            stats["no_match"] += 1
+        self.emit("track", **fields)
 
 class WatchdogScreen(Screen):
     """Clipboard Watchdog — collect Spotify URLs, preview tracks, then process on demand."""
@@ -494,6 +585,7 @@ class WatchdogScreen(Screen):
         Binding("p", "preview_selected", "Preview Playlist"),
         Binding("s", "start_selected", "Start Selected"),
         Binding("d", "remove_selected", "Remove Selected"),
+        Binding("r", "refresh_selected", "Re-sync Playlist"),
     ]
 
     def __init__(self, library: str = "Aether_Archive", threads: int = 36, engine: str = "cpu"):
@@ -679,8 +771,8 @@ $urls | Out-File -FilePath $outputFile -Encoding utf8
         self._update_counts()
 
     @work(thread=False)
-    async def _scan_playlist(self, idx: int) -> None:
-        """Background scrape to get track list and count."""
+    async def _scan_playlist(self, idx: int, refresh: bool = False) -> None:
+        """Background scrape to get track list and count (served from the harvest cache when fresh)."""
         entry = self._url_list[idx]
         self._scraping_count += 1
         try:
@@ -690,19 +782,34 @@ $urls | Out-File -FilePath $outputFile -Encoding utf8
         except Exception:
             pass
         try:
-            name, tracks = await scrape_playlist_data(entry["url"])
+            name, tracks = "Unknown Playlist", []
+            table = self.query_one("#wd-table", DataTable)
+            # Rows stream in while Spotify is still scrolling; keep the count live
+            stop_reason = None
+            async for batch in cached_harvest(entry["url"], in_worker=self.app.harvest_in_worker, refresh=refresh):
+                name = batch.playlist_name
+                tracks.extend(batch.tracks)
+                stop_reason = batch.stop_reason
+                entry["track_count"] = batch.total
+                entry["name"] = name
+                declared = f"/{batch.declared_total}" if batch.declared_total else ""
+                try:
+                    table.update_cell(str(idx), "name", name[:60])
+                    table.update_cell(str(idx), "tracks", f"{batch.total}{declared}…")
+                except Exception:
+                    pass
+            # Publish the list only once complete so processing never starts on a partial scan
             entry["tracks"] = tracks
             entry["track_count"] = len(tracks)
             entry["name"] = name
             entry["status"] = "QUEUED"
-            table = self.query_one("#wd-table", DataTable)
             try:
                 table.update_cell(str(idx), "name", name[:60])
                 table.update_cell(str(idx), "tracks", str(len(tracks)))
                 table.update_cell(str(idx), "status", "QUEUED")
             except Exception:
                 pass
-            self._wd_log(f"SCANNED [{idx+1}]: \"{name}\" — {len(tracks)} tracks")
+            self._wd_log(f"SCANNED [{idx+1}]: \"{name}\" — {len(tracks)} tracks ({stop_reason})")
         except Exception as e:
             entry["status"] = "SCAN FAIL"
             self._wd_log(f"SCAN FAILED [{idx+1}]: {e}")
@@ -857,6 +964,24 @@ $urls | Out-File -FilePath $outputFile -Encoding utf8
             self._wd_log(f"REMOVED: {url[:60]}")
             self._update_counts()
 
+    def action_refresh_selected(self) -> None:
+        """Re-sync the highlighted playlist: re-harvest from the top, stopping at already-known rows."""
+        if self._is_running:
+            return
+        idx = self._get_highlighted_idx()
+        if idx < 0 or idx >= len(self._url_list):
+            return
+        entry = self._url_list[idx]
+        if entry["status"] not in ("QUEUED", "SCAN FAIL"):
+            return
+        entry["status"] = "SCANNING"
+        try:
+            self.query_one("#wd-table", DataTable).update_cell(str(idx), "status", "SCANNING")
+        except Exception:
+            pass
+        self._wd_log(f"RE-SYNC [{idx+1}]: {entry['url'][:60]}")
+        self._scan_playlist(idx, refresh=True)
+
     @on(Button.Pressed, "#wd-back-btn")
     def action_stop_watchdog(self) -> None:
         if self._poll_timer:
@@ -994,6 +1119,7 @@ class Archivist(Screen):
         Binding("a", "select_all", "Select Global All"),
         Binding("n", "select_none", "Deselect All"),
         Binding("s", "toggle_autoscroll", "Toggle Auto-Scroll"),
+        Binding("m", "retry_no_match", "Retry No-Match"),
         Binding("enter", "start_ingest", "COMMENCE INGESTION"),
         Binding("escape", "app.pop_screen", "Back to Launchpad"),
     ]
@@ -1007,7 +1133,7 @@ class Archivist(Screen):
             url = url[url.find("http"):]
 
         self.url = url.strip()
-        self.library = "".join([c for c in library if c.isalnum() or c in " -_"]).strip() or "Aether_Archive"
+        self.library = _clean_library_name(library)
         self.threads = threads
         self.engine = engine
         self.target_dir = Path(os.getcwd()) / "Audio_Libraries" / self.library
@@ -1018,9 +1144,7 @@ class Archivist(Screen):
         self.stats = {"total": 0, "complete": 0, "no_match": 0, "failed": 0}
         self.track_times = {}
         self.track_sizes = {}
-        self.pending_tasks = 0
         self.col_keys = {}
-        self.semaphore = None
         self.is_ingesting = False
         self.gpu_failures = 0
         self.live_timer = None
@@ -1034,9 +1158,12 @@ class Archivist(Screen):
         self._running_size: int = 0
         self._matched_set: set = set()
         self._dispatched: set = set()
-        self.ingest_queue = asyncio.Queue()
-        self._resolve_gate = asyncio.Event()  # gates workers during ambiguity
-        self._resolve_gate.set()  # open by default
+        # DataTable rows are keyed by track identity (Spotify ID when harvested), not list position
+        self._row_keys: list[str] = []
+        self._row_index: dict[str, int] = {}
+        # Pipeline runs in the UI-independent engine; this screen only renders its events
+        self.ingest_engine = IngestEngine(self.target_dir, self.library, threads,
+                                          resolver=self._resolve_ambiguity)
         self.worker_tasks = []
         self.auto_ingest = auto_ingest
         self.pre_tracks = pre_tracks
@@ -1054,6 +1181,7 @@ class Archivist(Screen):
              yield Label("INGEST: 0.0s", id="ingest-timer")
              yield Label("SIZE: 0.00 MB", id="total-size-label")
              yield Label("RATE: 0/min", id="rate-label")         # P25
+             yield Label("MATCH Q: 0", id="match-queue-label")
              yield MiniSparkline(id="sparkline")                # P21
              yield Label("[ ↓ LIVE ]", id="scroll-indicator")
              yield Button("GO (COMMENCE INGESTION)", id="go-btn", variant="success")
@@ -1068,6 +1196,12 @@ class Archivist(Screen):
         self.col_keys["DUR"]    = table.add_column("DUR", width=7)
         self.col_keys["SPEED"]  = table.add_column("SPEED", width=9)  # P27
         table.cursor_type = "row"
+        # Bounded pre-matching: a 3,000-row playlist queues 3,000 tracks, not 3,000 concurrent searches
+        self.match_scheduler = MatchScheduler(
+            self.match_vector, concurrency=self.app.match_concurrency, lookahead=self.app.match_lookahead,
+            is_selected=lambda i: self.tracks[i].get("selected", False),
+            visible=self._visible_rows, on_change=self._update_match_queue)
+        self.match_scheduler.start()
         self.log_kernel("SYSTEM INITIALIZED. WELCOME, ARCHITECT BUBB.")
         self.live_timer = self.set_interval(0.25, self.update_timers)  # P7: 4Hz not 10Hz
 
@@ -1078,6 +1212,9 @@ class Archivist(Screen):
         except Exception:
             pass
 
+        self.streaming = self.app.stream_pipeline
+        if self.streaming:
+            self._start_streaming()
         if self.pre_tracks:
             self._load_pre_tracks()
         else:
@@ -1109,6 +1246,60 @@ class Archivist(Screen):
             indicator.styles.color = "ansi_default"
             indicator.styles.text_style = "none"
 
+    # ── Streaming mode ──
+    def _dispatch_match(self, index: int) -> None:
+        """A harvested row goes to the pre-match scheduler, or straight into the streaming pipeline."""
+        self._dispatched.add(index)
+        if self.streaming:
+            self._stream_rows.put_nowait(index)
+        else:
+            self.match_scheduler.submit(index)
+
+    def _end_stream_rows(self) -> None:
+        if self.streaming:
+            self._stream_rows.put_nowait(None)
+
+    def _start_streaming(self) -> None:
+        """Ingest from the first harvested row: the engine's match/download/tag stages run while
+        the harvest is still scrolling. Rows deselected before they reach the pipeline are skipped."""
+        self._stream_rows: asyncio.Queue = asyncio.Queue()
+        self.is_ingesting = True
+        self.ingest_start = datetime.now()
+        self.stats.update({"total": 0, "complete": 0, "no_match": 0, "failed": 0})
+        self.query_one(ProgressBar).update(total=0, progress=0)
+        self.log_kernel(f"STREAMING PIPELINE ENGAGED (POOL: {self.threads}, MATCH: {self.app.match_concurrency}).")
+        self.ingest_engine.start_stream(self._streamed_rows(), match_workers=self.app.match_concurrency)
+        self.worker_tasks.append(asyncio.create_task(self._drain_engine_events()))
+
+    async def _streamed_rows(self):
+        while (index := await self._stream_rows.get()) is not None:
+            if not self.tracks[index].get("selected"):
+                continue
+            self.stats["total"] += 1
+            self.query_one(ProgressBar).update(total=self.stats["total"])
+            yield index, self.tracks[index]
+
+    def _visible_rows(self) -> range:
+        """Track indices currently on screen (rows are appended in track order, one line each)."""
+        table = self.query_one(DataTable)
+        top = int(table.scroll_y)
+        return range(top, top + table.size.height)
+
+    def _update_match_queue(self, queued: int, running: int) -> None:
+        try: self.query_one("#match-queue-label").update(f"MATCH Q: {queued} ({running} ACTIVE)")
+        except Exception: pass
+
+    def _register_row(self, index: int) -> str:
+        """Row key for track #index; a track listed twice in one playlist gets a suffixed key."""
+        key = base = track_key(self.tracks[index])
+        n = 1
+        while key in self._row_index:
+            n += 1
+            key = f"{base}#{n}"
+        self._row_keys.append(key)
+        self._row_index[key] = index
+        return key
+
     def _load_pre_tracks(self) -> None:
         """Load pre-scraped tracks directly, bypassing Playwright."""
         self.harvest_start = datetime.now()
@@ -1119,6 +1310,7 @@ class Archivist(Screen):
                 "artist": t.get("artist", ""),
                 "title": t.get("title", ""),
                 "duration": t.get("duration", "0:00"),
+                **{k: t[k] for k in ("duration_ms", "track_id") if t.get(k)},
                 "selected": t.get("selected", True),
                 "status": "WAITING FOR PROPAGATION"
             })
@@ -1130,7 +1322,7 @@ class Archivist(Screen):
                 t.get("title", "")[:40],
                 t.get("duration", ""),
                 "",
-                key=str(i)
+                key=self._register_row(i)
             )
         self.is_scraping = False
         self.harvest_dur = (datetime.now() - self.harvest_start).total_seconds()
@@ -1140,11 +1332,9 @@ class Archivist(Screen):
         # Dispatch matching for all tracks
         for i in range(len(self.tracks)):
             if self.tracks[i]["status"] == "WAITING FOR PROPAGATION":
-                self._dispatched.add(i)
-                self.tracks[i]["status"] = "MATCHING"
-                table.update_cell(str(i), self.col_keys["STATUS"], render_status_badge("MATCHING"))
-                self.match_vector(i)
-        if self.auto_ingest:
+                self._dispatch_match(i)
+        self._end_stream_rows()
+        if self.auto_ingest and not self.streaming:
             self.log_kernel("WATCHDOG: AUTO-SELECTING ALL VECTORS.")
             self.action_select_all()
             self.log_kernel("WATCHDOG: AUTO-INGESTION ENGAGED.")
@@ -1160,7 +1350,8 @@ class Archivist(Screen):
                 "library": self.library,
                 "stats": self.stats,
                 "tracks": [
-                    {"artist": t["artist"], "title": t["title"], "status": t["status"]}
+                    {"artist": t["artist"], "title": t["title"], "track_id": t.get("track_id"),
+                     "status": t["status"]}
                     for t in list(self.tracks) # ROBUST: Copy to avoid concurrent mutation errors
                 ]
             }
@@ -1178,6 +1369,8 @@ class Archivist(Screen):
         # Cancel workers
         for task in self.worker_tasks:
             task.cancel()
+        self.ingest_engine.cancel()
+        self.match_scheduler.cancel()
 
         # Cleanup temp files
         try:
@@ -1203,150 +1396,68 @@ class Archivist(Screen):
     @work(exclusive=True)
     async def scrape_tracks(self):
         self.harvest_start = datetime.now()
-        import re
-        dur_regex = re.compile(r'^\d{1,2}:\d{2}(:\d{2})?$')
         self.log_kernel(f"DEPLOYING PROXIES TO: {self.url}")
-        from playwright.async_api import async_playwright
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-
-            try:
-                await page.goto(self.url, timeout=60000)
-                await page.wait_for_load_state("load")
-
-                # Dismiss cookie wall
-                try: await page.click('button#onetrust-accept-btn-handler', timeout=3000)
-                except: pass
-
-                await page.wait_for_selector('[data-testid="tracklist-row"]', timeout=30000)
-
-                table = self.query_one(DataTable)
-                processed_ids = set()
-
-                self.log_kernel("HARVESTING VECTORS (BULK JS EXTRACTION)...")
-
-                # Infinite Scroll Engine with Bulk Extraction
-                last_count = -1
-                stable_count = 0
-                while stable_count < 10:
-                    rows_count = await page.evaluate('''() => {
-                        const scope = document.querySelector('[data-testid="playlist-tracklist"]') || document;
-                        const rows = scope.querySelectorAll('[data-testid="tracklist-row"]');
-                        if (rows.length > 0) {
-                            rows[rows.length - 1].scrollIntoView();
-                        }
-                        return rows.length;
-                    }''')
-
-                    await page.mouse.wheel(0, 5000)
-                    for _ in range(2):
-                         await page.keyboard.press("PageDown")
-                         # Reduced delay for snappier propagation
-                         await asyncio.sleep(0.1)
-
-                    # 20x Speedup: Extract all visible track data in one JS execution
-                    extracted_tracks = await page.evaluate('''() => {
-                        const scope = document.querySelector('[data-testid="playlist-tracklist"]') || document;
-                        return Array.from(scope.querySelectorAll('[data-testid="tracklist-row"]')).map(row => {
-                            const titleElem = row.querySelector('div[dir="auto"]');
-                            const artistElems = row.querySelectorAll('a[href*="/artist/"]');
-                            const durElem = row.querySelector('div[data-testid="tracklist-row-duration"]');
-
-                            // Fallback for duration if standard testid missing (virtualization artifact)
-                            let duration = durElem ? durElem.innerText : "0:00";
-                            if (duration === "0:00") {
-                                const potentialDurs = Array.from(row.querySelectorAll('div')).filter(d => d.innerText.includes(':'));
-                                const durRegex = /^\\d{1,2}:\\d{2}(:\\d{2})?$/;
-                                for (const p of potentialDurs) {
-                                    if (durRegex.test(p.innerText.trim())) {
-                                        duration = p.innerText.trim();
-                                        break;
-                                    }
-                                }
-                            }
-
-                            return {
-                                title: titleElem ? titleElem.innerText : "Unknown",
-                                artists: Array.from(artistElems).map(a => a.innerText).join(", "),
-                                duration: duration
-                            };
-                        });
-                    }''')
-
-                    table = self.query_one(DataTable)
-                    for track_data in extracted_tracks:
-                        track_id = f"{track_data['artists']}_{track_data['title']}".strip()
-                        if track_id and track_id not in processed_ids:
-                            processed_ids.add(track_id)
-                            idx = len(self.tracks)
-                            self.tracks.append({
-                                "artist": track_data['artists'],
-                                "title": track_data['title'],
-                                "duration": track_data['duration'],
-                                "selected": True,
-                                "status": "WAITING FOR PROPAGATION"
-                            })
-                            table.add_row(
-                                "[X]",
-                                render_status_badge("WAITING FOR PROPAGATION"),
-                                track_data['artists'],
-                                track_data['title'][:40],
-                                track_data['duration'],
-                                "",
-                                key=str(idx)
-                            )
-
-                    current_count = len(self.tracks)
-                    if current_count == last_count:
-                        stable_count += 1
-                    else:
-                        stable_count = 0
-                        last_count = current_count
-                        if current_count > 0:
-                            self.log_kernel(f"PROPAGATED {current_count} VECTORS...")
-
-                    # P2: FIXED O(N²) — only dispatch each index once via matched_set
-                    for i in range(len(self.tracks)):
-                        if i not in self._dispatched and self.tracks[i]["status"] == "WAITING FOR PROPAGATION":
-                            self._dispatched.add(i)
-                            self.tracks[i]["status"] = "MATCHING"
-                            table.update_cell(str(i), self.col_keys["STATUS"], render_status_badge("MATCHING"))
-                            self.match_vector(i)
-
-                self.is_scraping = False
-                self.harvest_dur = (datetime.now() - self.harvest_start).total_seconds()
-                self.harvest_dur_fixed = True
-                self.log_kernel(f"COMPLETE HARVEST: {len(self.tracks)} TRACK DESCRIPTORS IN {self.harvest_dur:.1f}s.")
-                self.log_kernel("VECTORS SYNCHRONIZED. READY FOR INGESTION.")
-                if self.auto_ingest:
-                    self.log_kernel("WATCHDOG: AUTO-SELECTING ALL VECTORS.")
-                    self.action_select_all()
-                    self.log_kernel("WATCHDOG: AUTO-INGESTION ENGAGED.")
-                    self.call_later(self.action_start_ingest)
-            except Exception as e:
-                self.log_kernel(f"CRITICAL SCRAPE FAILURE: {e}")
-                import traceback
-                self.log_kernel(traceback.format_exc())
-            finally:
-                await browser.close()
+        try:
+            self.log_kernel("HARVESTING VECTORS (INCREMENTAL MUTATION OBSERVER)...")
+            table = self.query_one(DataTable)
+            async for batch in cached_harvest(self.url, in_worker=self.app.harvest_in_worker):
+                for track_data in batch.tracks:
+                    idx = len(self.tracks)
+                    self.tracks.append({**track_data, "selected": True, "status": "WAITING FOR PROPAGATION"})
+                    table.add_row(
+                        "[X]",
+                        render_status_badge("WAITING FOR PROPAGATION"),
+                        track_data['artist'],
+                        track_data['title'][:40],
+                        track_data['duration'],
+                        "",
+                        key=self._register_row(idx)
+                    )
+                if batch.tracks:
+                    self.log_kernel(f"PROPAGATED {batch.total} VECTORS...")
+                if batch.stop_reason:
+                    declared = f"/{batch.declared_total} DECLARED" if batch.declared_total else ""
+                    self.log_kernel(f"HARVEST STOP: {batch.stop_reason.upper()} ({batch.total}{declared})")
+                if batch.route_report:
+                    self.log_kernel(f"ROUTE FILTER: {format_route_report(batch.route_report)}")
+
+                # Matching starts on the first rows while the rest of the list is still scrolling
+                # P2: FIXED O(N²) — only dispatch each index once via matched_set
+                for i in range(batch.total - len(batch.tracks), batch.total):
+                    if i not in self._dispatched and self.tracks[i]["status"] == "WAITING FOR PROPAGATION":
+                        self._dispatch_match(i)
+
+            self.is_scraping = False
+            self.harvest_dur = (datetime.now() - self.harvest_start).total_seconds()
+            self.harvest_dur_fixed = True
+            self.log_kernel(f"COMPLETE HARVEST: {len(self.tracks)} TRACK DESCRIPTORS IN {self.harvest_dur:.1f}s.")
+            self.log_kernel("VECTORS SYNCHRONIZED. READY FOR INGESTION.")
+            if self.auto_ingest and not self.streaming:
+                self.log_kernel("WATCHDOG: AUTO-SELECTING ALL VECTORS.")
+                self.action_select_all()
+                self.log_kernel("WATCHDOG: AUTO-INGESTION ENGAGED.")
+                self.call_later(self.action_start_ingest)
+        except Exception as e:
+            self.log_kernel(f"CRITICAL SCRAPE FAILURE: {e}")
+            self.log_kernel(traceback.format_exc())
+        finally:
+            self._end_stream_rows()
 
-    @work
     async def match_vector(self, index: int):
-        """Threaded background matching for harvested vectors."""
+        """Background matching for one harvested vector; run by the match scheduler, never directly."""
         track = self.tracks[index]
+        if track["status"] != "WAITING FOR PROPAGATION":
+            return
+        track["status"] = "MATCHING"
+        self.post_message(TrackUpdate(index, "MATCHING", "cyan"))
         try:
             best = await self.search_track(index, track)
             if best:
                 self.tracks[index]["youtube_best"] = best
-                self.tracks[index]["status"] = "QUEUED"
-                self.post_message(TrackUpdate(index, "QUEUED", "white"))
         except Exception as e:
             self.log_kernel(f"MATCH ERROR [{index}]: {e}")
-            self.mark_no_match(index)
+            if self.tracks[index]["status"] == "MATCHING":
+                self.mark_no_match(index)
 
     @on(Button.Pressed, "#go-btn")
     def start_ingest_btn(self) -> None:
@@ -1357,18 +1468,38 @@ class Archivist(Screen):
         if table.row_count == 0: return
         try:
             row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
-            idx = int(row_key.value)
+            idx = self._row_index[row_key.value]
             self.tracks[idx]["selected"] = not self.tracks[idx]["selected"]
             val = "[bold green][X][/]" if self.tracks[idx]["selected"] else "[ ]"
             table.update_cell(row_key, self.col_keys["SEL"], val)
         except: pass
 
+    def action_retry_no_match(self) -> None:
+        """Manual override: forget the remembered no-match verdict for the row under the cursor and search again."""
+        table = self.query_one(DataTable)
+        if table.row_count == 0: return
+        try:
+            row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+            idx = self._row_index[row_key.value]
+        except: return
+        track = self.tracks[idx]
+        if track["status"] != "NO MATCH":
+            self.app.notify("ROW IS NOT A NO-MATCH", severity="warning"); return
+        get_no_match_cache().forget(_signature(track))
+        self.log_kernel(f"NO-MATCH VERDICT CLEARED: {track['title']}")
+        if self.is_ingesting:
+            return  # the verdict is gone for the next run; this mission already passed the row
+        self.stats["no_match"] = max(self.stats["no_match"] - 1, 0)
+        track["status"] = "WAITING FOR PROPAGATION"
+        self.post_message(TrackUpdate(idx, "WAITING FOR PROPAGATION", "yellow"))
+        self.match_scheduler.submit(idx)
+
     def action_select_all(self) -> None:
         table = self.query_one(DataTable)
         sel_key = self.col_keys["SEL"]
         for i, track in enumerate(self.tracks):
             track["selected"] = True
-            try: table.update_cell(str(i), sel_key, "[bold green][X][/]")
+            try: table.update_cell(self._row_keys[i], sel_key, "[bold green][X][/]")
             except: pass
         self.log_kernel("GLOBAL SELECTION: ALL VECTORS ENGAGED.")
 
@@ -1377,7 +1508,7 @@ class Archivist(Screen):
         sel_key = self.col_keys["SEL"]
         for i, track in enumerate(self.tracks):
             track["selected"] = False
-            try: table.update_cell(str(i), sel_key, "[ ]")
+            try: table.update_cell(self._row_keys[i], sel_key, "[ ]")
             except: pass
         self.log_kernel("GLOBAL SELECTION: ALL VECTORS DISENGAGED.")
 
@@ -1394,316 +1525,137 @@ class Archivist(Screen):
         self.query_one(ProgressBar).update(total=len(selected), progress=0)
         self.stats.update({"total": len(selected), "complete": 0, "no_match": 0, "failed": 0})
         self.track_times.clear(); self.track_sizes.clear()
-        self.pending_tasks = len(selected)
         self.log_kernel(f"COMMENCING QUEUE-POOL INGESTION (POOL: {self.threads}, ENGINE: {self.engine.upper()}).")
 
-        # Initialize Workers
-        for _ in range(min(self.threads, len(selected))):
-            self.worker_tasks.append(asyncio.create_task(self.drain_worker()))
+        self.ingest_engine.start()
+        self.worker_tasks.append(asyncio.create_task(self._feed_engine(selected)))
+        self.worker_tasks.append(asyncio.create_task(self._drain_engine_events()))
 
+    async def _feed_engine(self, selected: list[int]) -> None:
+        """Producer: submit() blocks while the engine's job queue is full (backpressure)."""
         for idx in selected:
-            self.ingest_queue.put_nowait(idx)
-
-    async def drain_worker(self) -> None:
-        """Consumer coroutine: Drains the ingest_queue with persistence logic."""
-        while True:
+            # Tracks just ahead of the ingest cursor jump the match queue; one ingest reaches first is
+            # matched by the engine itself instead, once any pre-match already running for it is done
+            self.match_scheduler.set_cursor(idx)
+            await self.match_scheduler.claim(idx)
+            await self.ingest_engine.submit(idx, self.tracks[idx], self.tracks[idx].get("youtube_best"))
+        await self.ingest_engine.close()
+
+    async def _drain_engine_events(self) -> None:
+        """Consumer: render engine events until the mission drains, then close it out."""
+        async for event in self.ingest_engine.events():
             try:
-                index = await self.ingest_queue.get()
-                # Pause if ambiguity screen is active (reduces lag)
-                await self._resolve_gate.wait()
-                await self._process_track(index)
-                self.ingest_queue.task_done()
-
-                # Check if we are done
-                if self.ingest_queue.empty() and self.pending_tasks == 0:
-                    ingest_dur = (datetime.now() - self.ingest_start).total_seconds()
-                    await self.close_mission(ingest_dur)
-
-            except asyncio.CancelledError:
-                break
+                self._apply_engine_event(event)
             except Exception as e:
                 self.log_kernel(f"DRAIN WORKER ERROR: {e}")
-            finally:
-                # Small yield to prevent CPU pinning if errors occur rapidly
-                await asyncio.sleep(0.01)
-
-
-    async def _process_track(self, index: int) -> None:
-        track = self.tracks[index]
-        track_start = datetime.now()
-        try:
-            # P14: Dedup — skip if already in library
-            if self._already_archived(index, track):
-                return
-            self.tracks[index]["status"] = "ARCHIVING"
-            self.post_message(TrackUpdate(index, "ARCHIVING", "bright_cyan"))
-            best = track.get("youtube_best") or await self.search_track(index, track)
-            if not best:
-                return
-            temp_path = await self.download_with_retry(index, track, best)
-            if not temp_path:
-                self.tracks[index]["status"] = "FAILED"
-                self.stats["failed"] += 1
-                self.post_message(TrackUpdate(index, "FAILED", "bright_red"))
-                self.query_one(ProgressBar).advance(1)
-                self.log_kernel(f"SIGNAL LOSS: {track['title']}")
-                _write_failure_log({
-                    "timestamp": datetime.now().isoformat(),
-                    "phase": "download",
-                    "track_index": index,
-                    "artist": track.get("artist", "?"),
-                    "title": track.get("title", "?"),
-                    "youtube_url": best.get("url", "?"),
-                    "error": "Download returned no file (SIGNAL LOSS)",
-                })
-                return
-            elapsed = (datetime.now() - track_start).total_seconds()
-            await self.tag_track(index, track, temp_path, best, elapsed)
-        except Exception as e:
+        ingest_dur = (datetime.now() - self.ingest_start).total_seconds()
+        await self.close_mission(ingest_dur)
+
+    def _apply_engine_event(self, event) -> None:
+        if isinstance(event, EngineLog):
+            self.log_kernel(event.message)
+        elif isinstance(event, TrackProgress):
+            self._update_speed_cell(event.index, event.speed)
+        elif isinstance(event, TrackComplete):
+            self._on_track_complete(event)
+        elif isinstance(event, TrackFailed):
+            index = event.index
             self.tracks[index]["status"] = "FAILED"
             self.stats["failed"] += 1
             self.post_message(TrackUpdate(index, "FAILED", "bright_red"))
             self.query_one(ProgressBar).advance(1)
-            self.log_kernel(f"FAIL [{index}]: {track.get('title','?')} — {e}")
-            _write_failure_log({
-                "timestamp": datetime.now().isoformat(),
-                "phase": "process_track",
-                "track_index": index,
-                "artist": track.get("artist", "?"),
-                "title": track.get("title", "?"),
-                "error": str(e),
-                "traceback": traceback.format_exc(),
-            })
-        finally:
-            self.pending_tasks -= 1
-
-    def _already_archived(self, index: int, track: dict) -> bool:
-        """P14: Check if track file exists before downloading."""
-        safe = _sanitise_filename(f"{track['artist']} - {track['title']}.mp3")
-        if (self.target_dir / safe).exists():
-            self.tracks[index]["status"] = "ALREADY ARCHIVED"
-            self.stats["complete"] += 1
-            self.post_message(TrackUpdate(index, "ALREADY ARCHIVED", "green"))
-            self.query_one(ProgressBar).advance(1)
-            self.log_kernel(f"SKIP (exists): {track['title']}")
-            return True
-        return False
+            if event.phase == "download":
+                self.log_kernel(f"SIGNAL LOSS: {self.tracks[index]['title']}")
+            else:
+                self.log_kernel(f"FAIL [{index}]: {self.tracks[index].get('title','?')} — {event.error}")
+        elif isinstance(event, TrackStatus):
+            index, status = event.index, event.status
+            if status == "NO MATCH":
+                self.mark_no_match(index)
+                return
+            self.tracks[index]["status"] = status
+            self.post_message(TrackUpdate(index, status, STATUS_MAP.get(status, ("", "white"))[1]))
+            if status == "ALREADY ARCHIVED":
+                self.stats["complete"] += 1
+                self.query_one(ProgressBar).advance(1)
+                self.log_kernel(f"SKIP (exists): {self.tracks[index]['title']}")
 
     async def search_track(self, index: int, track: dict) -> dict | None:
         """P15/16/17/18: Scored multi-signal search with blocklist and expanded fallbacks."""
-        artist, title = track.get('artist', ''), track.get('title', '')
-        queries = [
-            f"{artist} {title} official audio",
-            f"{artist} {title} official video",
-            f"{title} {artist} audio",
-            f"{artist} {title} lyrics",
-            f"{artist} {title}",
-        ]
-        results = []
-        for q in queries:
-            if results:
-                break
-
-            # P16: Check cache before search
-            if q in _SEARCH_CACHE:
-                results = _SEARCH_CACHE[q]
-                break
-
-            try:
-                async with asyncio.timeout(120): # IMPLEMENT: timeout(120) guard
-                    results = await self.perform_youtube_search(q)
-                    if results:
-                        _SEARCH_CACHE[q] = results
-            except asyncio.TimeoutError:
-                self.log_kernel(f"SEARCH TIMEOUT for: {q}")
-                continue
-            except Exception:
-                continue
-
-        # P17: filter blocklist
-        results = [r for r in results if not _is_blocked(r.get('title', ''))]
-        spotify_dur = self.parse_duration(track['duration'])
-
-        # P15: score all candidates
-        scored = sorted(
-            [(s, e) for e in results if (s := _score_result(e, track, spotify_dur)) > 0.15],
-            key=lambda x: x[0], reverse=True
-        )
-        if scored:
-            # Auto-accept the top result if it scores well enough (>0.4)
-            # Only trigger ambiguity screen if the top score is marginal
-            if scored[0][0] >= 0.4 or len(scored) == 1:
-                self.tracks[index]["status"] = "QUEUED"
-                self.post_message(TrackUpdate(index, "QUEUED", "bright_white"))
-                return scored[0][1]
-            # Multiple close matches with low confidence — let user decide
-            self.tracks[index]["status"] = "AWAITING USER DECISION"
-            self.post_message(TrackUpdate(index, "AWAITING USER DECISION", "bright_yellow"))
-            # Pause all other workers while user decides
-            self._resolve_gate.clear()
-            self.post_message(ResolveFailed(index, track, results[:3]))
-            while self.tracks[index].get("youtube_url") is None and \
-                  self.tracks[index]["status"] == "AWAITING USER DECISION":
-                await asyncio.sleep(0.3)
-            # Resume workers
-            self._resolve_gate.set()
-            if self.tracks[index].get("youtube_url"):
-                return {"url": self.tracks[index]["youtube_url"],
-                        "id":  self.tracks[index].get("youtube_id", "manual"),
-                        "thumbnail": None}
+        best = await self.ingest_engine.match(index, track, log=self.log_kernel)
+        if self.tracks[index]["status"] != "MATCHING":
+            return best  # ingest moved the row on meanwhile; its own events own the status now
+        if best:
+            self.tracks[index]["status"] = "QUEUED"
+            self.post_message(TrackUpdate(index, "QUEUED", "bright_white"))
+            return best
         self.mark_no_match(index)
         return None
 
+    async def _resolve_ambiguity(self, index: int, track: dict, candidates: list) -> dict | None:
+        """Engine resolver: multiple close matches with low confidence — let the user decide.
+
+        The engine pauses its other workers until this returns.
+        """
+        self.tracks[index]["status"] = "AWAITING USER DECISION"
+        self.post_message(TrackUpdate(index, "AWAITING USER DECISION", "bright_yellow"))
+        self.post_message(ResolveFailed(index, track, candidates))
+        while self.tracks[index].get("youtube_url") is None and \
+              self.tracks[index]["status"] == "AWAITING USER DECISION":
+            await asyncio.sleep(0.3)
+        if self.tracks[index].get("youtube_url"):
+            # The full candidate, so the remembered choice carries its title and length too
+            for candidate in candidates:
+                if candidate.get("id") == self.tracks[index].get("youtube_id"):
+                    return candidate
+            return {"url": self.tracks[index]["youtube_url"],
+                    "id":  self.tracks[index].get("youtube_id", "manual"),
+                    "thumbnail": None}
+        return None
+
     def mark_no_match(self, index: int) -> None:
         self.tracks[index]["status"] = "NO MATCH"
         self.stats["no_match"] += 1
         self.query_one(ProgressBar).advance(1)
         self.post_message(TrackUpdate(index, "NO MATCH", "orange1"))
 
-    async def download_with_retry(self, index: int, track: dict, best: dict) -> Path | None:
-        """P8/9/10/11/6: yt-dlp Python API, smart format, correct flags, retry+timeout."""
-        track_id = best.get('id', 'tmp')
-        out_stem = self.target_dir / f"tmp_{track_id}"
-        out_path = out_stem.with_suffix('.mp3')
-        url = best.get('url') or best.get('webpage_url') or f"https://youtube.com/watch?v={track_id}"
-
-        for attempt in range(3):
-            if attempt:
-                wait = 2 ** attempt
-                self.log_kernel(f"RETRY [{attempt}] {track['title']} — backoff {wait}s")
-                await asyncio.sleep(wait)
-            try:
-                async with asyncio.timeout(120): # IMPLEMENT: asyncio.timeout(120)
-                    ok = await self._dl_api(index, url, out_stem)
-                    if ok and out_path.exists():
-                        return out_path
-            except asyncio.TimeoutError:
-                self.log_kernel(f"TIMEOUT [{index}]: {track['title']}")
-            except Exception as e:
-                self.log_kernel(f"DL ERR [{index}]: {e}")
-        return None
-
-    async def _dl_api(self, index: int, url: str, out_stem: Path) -> bool:
-        """P8: yt-dlp Python API (no subprocess). P9: smart format. P10: correct threads."""
-        def _run():
-            opts = {
-                'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
-                'outtmpl': str(out_stem) + '.%(ext)s',
-                'postprocessors': [{'key': 'FFmpegExtractAudio',
-                                    'preferredcodec': 'mp3', 'preferredquality': '0'}],
-                'postprocessor_args': {
-                    'ExtractAudio': ['-threads', '0'],
-                },
-                'quiet': True, 'no_warnings': True, 'noplaylist': True,
-                'progress_hooks': [self._make_progress_hook(index)],
-            }
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                ydl.download([url])
-            return True
-        try:
-            await asyncio.to_thread(_run)
-            return True
-        except Exception as e:
-            self.log_kernel(f"API DL: {e}")
-            return False
-
-    def _make_progress_hook(self, index: int):
-        """P27: Feed live KB/s into SPEED column via call_from_thread."""
-        def hook(d):
-            if d.get('status') == 'downloading':
-                speed = d.get('speed', 0) or 0
-                try:
-                    self.app.call_from_thread(self._update_speed_cell, index, speed)
-                except Exception:
-                    pass
-        return hook
-
     def _update_speed_cell(self, index: int, speed: float) -> None:
         try:
             kb = speed / 1024
             self.query_one(DataTable).update_cell(
-                str(index), self.col_keys["SPEED"], f"{kb:.0f}KB/s"
+                self._row_keys[index], self.col_keys["SPEED"], f"{kb:.0f}KB/s"
             )
         except Exception:
             pass
 
-    async def tag_track(self, index: int, track: dict, temp_path: Path,
-                        best: dict, elapsed: float) -> bool:
-        """P34/35/36/37: In-place mutagen tagging, full ID3, Unicode filename, album art."""
-        safe_name = _sanitise_filename(f"{track['artist']} - {track['title']}.mp3")
-        dest = self.target_dir / safe_name
-
-        def _tag_and_move():
-            if dest.exists():
-                dest.unlink()
-            temp_path.rename(dest)
-            if not dest.exists():
-                return False
-            if MUTAGEN_OK:
-                try:
-                    try:
-                        tags = ID3(str(dest))
-                    except ID3NoHeaderError:
-                        tags = ID3()
-
-                    tags.clear()
-                    # TIT2: Title, TPE1: Artist, TALB: Album (Library), TRCK: Track Num, TDRC: Year
-                    tags.add(TIT2(encoding=3, text=track['title']))
-                    tags.add(TPE1(encoding=3, text=track['artist']))
-                    tags.add(TALB(encoding=3, text=self.library))
-
-                    idx_str = str(track.get('track_num', index + 1))
-                    tags.add(TRCK(encoding=3, text=idx_str))
-
-                    # TDRC: Date (Year)
-                    year = (best.get('upload_date') or "")[:4]
-                    if year:
-                        tags.add(TDRC(encoding=3, text=year))
-
-                    # APIC: Album Art (YouTube Thumbnail)
-                    # Use existing art fetcher which handles Pillow scaling
-                    art = _fetch_art(best.get('thumbnail'))
-                    if art:
-                        tags.add(APIC(
-                            encoding=3, mime='image/jpeg', type=3,
-                            desc='Cover', data=art
-                        ))
-
-                    tags.save(str(dest), v2_version=3)
-                except Exception as e:
-                    self.app.call_from_thread(self.log_kernel, f"MUTAGEN OVERRIDE ERR: {e}")
-            return True
-
-        success = await asyncio.to_thread(_tag_and_move)
-        if success:
-            stat = await asyncio.to_thread(os.stat, dest)
-            self.track_sizes[index] = stat.st_size
-            self._running_size += stat.st_size          # P7: incremental sum
-            self.track_times[index] = elapsed
-            self.tracks[index]["status"] = "COMPLETE"
-            self.stats["complete"] += 1
-            self.post_message(TrackUpdate(index, "COMPLETE", "bright_green"))
-            self.query_one(ProgressBar).advance(1)
-            # P27: replace speed with final file size
-            size_mb = stat.st_size / (1024 * 1024)
-            try:
-                self.query_one(DataTable).update_cell(
-                    str(index), self.col_keys["SPEED"], f"{size_mb:.2f}MB"
-                )
-            except Exception:
-                pass
-            # P21: feed sparkline
-            try:
-                self.query_one(MiniSparkline).push_event()
-            except Exception:
-                pass
-            self.log_kernel(f"COMPLETE: {track['title']} ({elapsed:.1f}s, {size_mb:.2f}MB)")
-            return True
-        self.log_kernel(f"TAG FAIL: {track['title']}")
-        return False
+    def _on_track_complete(self, event: TrackComplete) -> None:
+        index, track = event.index, self.tracks[event.index]
+        self.track_sizes[index] = event.size_bytes
+        self._running_size += event.size_bytes          # P7: incremental sum
+        self.track_times[index] = event.elapsed
+        self.tracks[index]["status"] = "COMPLETE"
+        self.stats["complete"] += 1
+        self.post_message(TrackUpdate(index, "COMPLETE", "bright_green"))
+        self.query_one(ProgressBar).advance(1)
+        # P27: replace speed with final file size
+        size_mb = event.size_bytes / (1024 * 1024)
+        try:
+            self.query_one(DataTable).update_cell(
+                self._row_keys[index], self.col_keys["SPEED"], f"{size_mb:.2f}MB"
+            )
+        except Exception:
+            pass
+        # P21: feed sparkline
+        try:
+            self.query_one(MiniSparkline).push_event()
+        except Exception:
+            pass
+        self.log_kernel(f"COMPLETE: {track['title']} ({event.elapsed:.1f}s, {size_mb:.2f}MB)")
 
     async def close_mission(self, ingest_dur):
         ingest_dur = round(ingest_dur, 2)
+        # Matching runs during the harvest, so these cover the whole mission, not just ingestion
+        self.stats.update(self.ingest_engine.search_stats)
         await self.save_mission_report(ingest_dur)
         try:
             # Convenience: Open Explorer window to the target directory
@@ -1715,37 +1667,17 @@ class Archivist(Screen):
     def on_track_update(self, message: TrackUpdate) -> None:
         table = self.query_one(DataTable)
         try:
-            table.update_cell(str(message.index), self.col_keys["STATUS"], render_status_badge(message.status))
+            table.update_cell(self._row_keys[message.index], self.col_keys["STATUS"], render_status_badge(message.status))
             self.save_checkpoint() # P: Session checkpoint after state change
         except: pass
 
     def on_resolve_failed(self, message: ResolveFailed) -> None:
         self.app.push_screen(ResolveMatchScreen(message.index, message.track, message.results, self))
 
-    async def perform_youtube_search(self, query: str) -> list:
-        """Surgical search vector using direct yt-dlp library access."""
-        def run_search():
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'skip_download': True,
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Direct library usage is significantly faster than subprocess
-                result = ydl.extract_info(f"ytsearch5:{query}", download=False)
-                return result.get('entries', [])
-
-        return await asyncio.to_thread(run_search)
-
     @staticmethod
     def parse_duration(d_str):
         """Surgical parsing of temporal vectors."""
-        try:
-            parts = d_str.split(":")
-            if len(parts) == 2: return int(parts[0]) * 60 + int(parts[1])
-            if len(parts) == 3: return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        except: return 0
-        return 0
+        return _parse_duration(d_str)
 
     async def save_mission_report(self, ingest_dur):
         """Asynchronous mission debriefing."""
@@ -1785,6 +1717,7 @@ class Archivist(Screen):
                     {
                         "title": t["title"],
                         "artist": t["artist"],
+                        "track_id": t.get("track_id"),
                         "status": t["status"],
                         "time_seconds": self.track_times.get(i, 0),
                         "size_bytes": self.track_sizes.get(i, 0)
@@ -1981,7 +1914,9 @@ class StatsScreen(Screen):
         # Outcome Summary
         labels.append(Label(f"TOTAL VECTORS TARGETED:   [bold]{total}[/]"))
         labels.append(Label(f"SUCCESSFULLY ARCHIVED:    [bold green]{complete}[/]  ({success_rate:.1f}%)"))
-        labels.append(Label(f"NO MATCH FOUND:           [bold yellow]{no_match}[/]"))
+        skipped = self.stats.get("no_match_skipped", 0)
+        labels.append(Label(f"NO MATCH FOUND:           [bold yellow]{no_match}[/]"
+                            + (f"  ({skipped} KNOWN, NOT SEARCHED)" if skipped else "")))
         labels.append(Label(f"SYSTEM FAILURES:          [bold red]{failed}[/]"))
         labels.append(Static("", id="spacer-1"))
 
@@ -2022,6 +1957,22 @@ class StatsScreen(Screen):
             labels.append(Label(f"SMALLEST TRACK:            [bold magenta]{smallest_size / (1024*1024):.2f} MB[/]  {self._track_name(smallest_idx)[:35]}"))
 
         labels.append(Static("", id="spacer-3"))
+
+        # Search cache
+        hits, misses = self.stats.get("cache_hits", 0), self.stats.get("cache_misses", 0)
+        if hits or misses or self.stats.get("resolved_hits"):
+            labels.append(Static("── SEARCH CACHE ──────────────────────────────────"))
+            labels.append(Label(f"CACHE HITS / MISSES:       [bold cyan]{hits}[/] / [bold yellow]{misses}[/]"
+                                f"  ({hits / max(hits + misses, 1) * 100:.0f}% HIT RATE)"))
+            if self.stats.get("resolved_hits"):
+                labels.append(Label(f"KNOWN TRACKS (NO SEARCH):  [bold cyan]{self.stats['resolved_hits']}[/]"))
+            if self.stats.get("hedged_queries"):
+                labels.append(Label(f"HEDGED QUERIES:            [bold cyan]{self.stats['hedged_queries']}[/]"))
+        shared_searches, shared_downloads = self.stats.get("coalesced_searches", 0), self.stats.get("coalesced_downloads", 0)
+        if shared_searches or shared_downloads:
+            labels.append(Label(f"COALESCED (SEARCH / DL):   [bold cyan]{shared_searches}[/] / [bold cyan]{shared_downloads}[/]"))
+            labels.append(Static("", id="spacer-4"))
+
         labels.append(Label("[dim]Full report saved to mission_history.json[/]"))
         labels.append(Button("ACKNOWLEDGMENTS (BACK TO OPS)", variant="primary", id="close-stats-btn"))
 
@@ -2149,7 +2100,7 @@ class AetherApp(App):
         border-top: solid $dim;
     }
 
-    #harvest-timer, #ingest-timer, #total-size-label, #rate-label {
+    #harvest-timer, #ingest-timer, #total-size-label, #rate-label, #match-queue-label {
         color: $accent;
         text-style: bold;
         margin-right: 2;
@@ -2377,11 +2328,19 @@ class AetherApp(App):
             self.save_session_state()
 
 
-    def __init__(self, url="", library="Aether_Archive", threads=36):
+    def __init__(self, url="", library="Aether_Archive", threads=36, profile_startup=False,
+                 harvest_in_worker=False, match_concurrency=MATCH_CONCURRENCY, match_lookahead=MATCH_LOOKAHEAD,
+                 stream_pipeline=False):
         super().__init__()
         self.default_url = url
         self.default_library = library
         self.default_threads = threads
+        self.profile_startup = profile_startup
+        self.harvest_in_worker = harvest_in_worker
+        self.match_concurrency = match_concurrency
+        self.match_lookahead = match_lookahead
+        self.stream_pipeline = stream_pipeline
+        self.first_frame_ms = None
         self._load_session_state()
 
     def _load_session_state(self) -> None:
@@ -2408,6 +2367,19 @@ class AetherApp(App):
     def on_mount(self) -> None:
         self.update_theme_vars()
         self.push_screen(Launchpad())
+        if self.profile_startup:
+            self.call_after_refresh(self._record_first_frame)
+
+    async def on_unmount(self) -> None:
+        # One shared Chromium serves every scrape; take it down with the app
+        await shutdown_browser_pool()
+        await shutdown_harvest_worker()
+        shutdown_ydl_pool()
+
+    def _record_first_frame(self) -> None:
+        """--profile-startup: stamp time-to-first-frame once the Launchpad has painted, then exit."""
+        self.first_frame_ms = (time.perf_counter() - _MODULE_T0) * 1000
+        self.exit()
 
     def update_theme_vars(self) -> None:
         """Surgically update CSS variables on the screen style object."""
@@ -2429,7 +2401,76 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--url", default="")
     parser.add_argument("--threads", type=int, default=36)
+    parser.add_argument("--library", default="Aether_Archive")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run the full pipeline without the TUI, emitting JSON Lines progress on stdout")
+    parser.add_argument("--url-file", help="Headless: file with one playlist URL per line")
+    parser.add_argument("--include-recommended", action="store_true",
+                        help="Headless: also harvest Spotify's recommended rows")
+    parser.add_argument("--harvest-strategy", choices=HARVEST_STRATEGIES, default="json",
+                        help="Headless: read the web player's playlist JSON (DOM fallback) or scroll the DOM")
+    parser.add_argument("--harvest-process", action="store_true",
+                        help="Run the Playwright scraper in a worker process that streams batches back")
+    parser.add_argument("--refresh-harvest", action="store_true",
+                        help="Headless: re-sync cached playlists even if fresh (stops at already-known rows)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Start matching and downloading while the playlist is still being harvested "
+                             "(TUI: every selected row is ingested without pressing GO)")
+    parser.add_argument("--match-concurrency", type=int, default=MATCH_CONCURRENCY,
+                        help="Tracks pre-matched at once while the playlist is audited")
+    parser.add_argument("--match-lookahead", type=int, default=MATCH_LOOKAHEAD,
+                        help="Tracks ahead of the ingest cursor that are matched first")
+    parser.add_argument("--search-mode", choices=SEARCH_MODES, default="flat",
+                        help="flat: score metadata-only results, fully extract only the download; full: old behaviour")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Fire the next search query template alongside a slow one (one extra query at most)")
+    parser.add_argument("--hedge-delay", type=float, default=HEDGE_DELAY,
+                        help="With --hedge: seconds before a slow search query is hedged")
+    parser.add_argument("--score-in-thread", action="store_true",
+                        help="Rank search results on a worker thread so big missions never stall the interface")
+    parser.add_argument("--search-cache-ttl", type=float, default=SEARCH_CACHE_TTL / 3600,
+                        help="Hours a cached YouTube search stays valid")
+    parser.add_argument("--search-cache-size", type=int, default=SEARCH_CACHE_MAX_ENTRIES,
+                        help="Max cached searches; least recently used are evicted beyond this")
+    parser.add_argument("--no-match-ttl", type=float, default=NO_MATCH_TTL / 3600,
+                        help="Hours a track with no match is skipped on later runs before being searched again")
+    parser.add_argument("--retry-no-match", action="store_true",
+                        help="Search known no-match tracks again this run; ones that now match are forgotten")
+    parser.add_argument("--forget-no-match", action="store_true",
+                        help="Clear every remembered no-match verdict before starting")
+    parser.add_argument("--rematch", action="store_true",
+                        help="Search again even for tracks matched on earlier runs; new choices replace the old")
+    parser.add_argument("urls", nargs="*", help="Headless: playlist URL(s)")
+    parser.add_argument("--reprobe", action="store_true",
+                        help="Ignore the cached probe manifest and re-verify all dependencies")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Report per-module import cost and time-to-first-frame, then exit")
     args = parser.parse_args()
-
-    app = AetherApp(url=args.url, threads=args.threads)
+    configure_search_cache(ttl=args.search_cache_ttl * 3600, max_entries=args.search_cache_size)
+    no_match = configure_no_match_cache(ttl=args.no_match_ttl * 3600, bypass=args.retry_no_match)
+    if args.forget_no_match:
+        print(f"Forgot {no_match.clear()} no-match verdict(s).")
+    get_resolved_tracks().bypass = args.rematch
+    set_search_mode(args.search_mode)
+    set_search_hedge(args.hedge_delay if args.hedge else None)
+    set_score_in_thread(args.score_in_thread)
+
+    if args.headless:
+        urls = list(args.urls) + ([args.url] if args.url else [])
+        if args.url_file:
+            urls += read_url_file(args.url_file)
+        if not urls:
+            parser.error("--headless needs at least one playlist URL or --url-file")
+        mission = HeadlessMission(args.library, args.threads, args.include_recommended,
+                                  harvest_strategy=args.harvest_strategy,
+                                  harvest_in_worker=args.harvest_process,
+                                  refresh_harvest=args.refresh_harvest, stream=args.stream)
+        sys.exit(asyncio.run(mission.run(urls)))
+
+    app = AetherApp(url=args.url, library=args.library, threads=args.threads,
+                    profile_startup=args.profile_startup, harvest_in_worker=args.harvest_process,
+                    match_concurrency=args.match_concurrency, match_lookahead=args.match_lookahead,
+                    stream_pipeline=args.stream)
     app.run()
+    if args.profile_startup:
+        print_startup_profile(profile_startup(), app.first_frame_ms)
@@ -0,0 +1,1127 @@
+"""Aether ingestion engine — the harvest→match→download→tag pipeline without any UI.
+
+Importable without Textual. The Archivist screen, the Watchdog and --headless
+runs are thin consumers of IngestEngine's typed event stream.
+"""
+import os
+import asyncio
+import importlib
+import json
+import math
+import shutil
+import threading
+import time
+import traceback
+import unicodedata
+import urllib.request
+from dataclasses import dataclass
+from io import BytesIO
+from difflib import SequenceMatcher
+from pathlib import Path
+from datetime import datetime
+
+from aether_store import (
+    STORE_DIR, get_no_match_cache, get_resolved_tracks, get_search_cache, normalize_query, track_signature,
+)
+
+# ARCHITECT: MATTHEW BUBB (SOLE PROGRAMMER)
+# ==============================================================================
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# ── Heavy dependencies (loaded on first use) ───────────────────
+_LAZY_MODULES: dict = {}
+
+def _lazy_import(module_name: str):
+    """Import a heavy dependency on first use; later calls are a dict lookup."""
+    mod = _LAZY_MODULES.get(module_name)
+    if mod is None:
+        mod = _LAZY_MODULES[module_name] = importlib.import_module(module_name)
+    return mod
+
+def _optional_import(module_name: str):
+    """Lazy import for optional dependencies — returns None so callers gracefully degrade."""
+    try:
+        return _lazy_import(module_name)
+    except ImportError:
+        return None
+
+# ── Constants ──────────────────────────────────────────────────
+BLOCKLIST_TERMS = frozenset([
+    'podcast', 'mix', 'compilation', 'full album', 'hour', 'hrs',
+    'mashup', 'megamix', 'medley', 'karaoke', 'instrumental only',
+])
+
+MIN_MATCH_SCORE = 0.15
+AUTO_ACCEPT_SCORE = 0.4
+
+MATCH_CONCURRENCY = 8   # searches in flight at once, however long the playlist
+MATCH_LOOKAHEAD = 50    # tracks ahead of the ingest cursor that jump the queue
+TAG_WORKERS = 2         # streaming: tagging is local disk + Pillow, a couple of workers keep up
+
+# ── Helper functions ───────────────────────────────────────────
+def _is_blocked(title: str) -> bool:
+    """P17: Filter podcast/mix/compilation results."""
+    t = title.lower()
+    return any(term in t for term in BLOCKLIST_TERMS)
+
+@dataclass(frozen=True)
+class TrackFeatures:
+    """The track side of the scorer, normalized once per track instead of once per candidate."""
+    search_str: str
+    artist_clean: str
+    duration: float
+    wants_cover: bool
+    wants_live: bool
+
+    @classmethod
+    def of(cls, track: dict, duration: float | None = None) -> "TrackFeatures":
+        search_str = f"{track.get('artist','')} {track.get('title','')}".lower()
+        return cls(search_str, track.get('artist', '').lower().replace(' ', ''),
+                   _track_seconds(track) if duration is None else duration,
+                   "cover" in search_str, "live" in search_str)
+
+def _score_candidate(result: dict, features: TrackFeatures, title: str, title_score: float) -> float:
+    """P15: Multi-signal scorer — duration 45%, title 20%, views 20%, channel_auth 15%.
+
+    ``title`` is the candidate's lowercased title and ``title_score`` its ratio against the track.
+    """
+    dur = result.get('duration', 0) or 0
+
+    dur_diff = abs(dur - features.duration)
+    if dur_diff > 90:
+        dur_score = 0.0
+    elif dur_diff > 30:
+        dur_score = 0.45 * (1.0 - (dur_diff - 30) / 60.0)
+    else:
+        dur_score = 1.0 - (dur_diff / 30.0) * 0.45
+
+    views = result.get('view_count', 0) or 0
+    view_score = min(math.log10(max(views, 1)) / 9.0, 1.0)
+
+    channel = (result.get('channel') or '').lower()
+    uploader = (result.get('uploader') or '').lower()
+    is_verified = result.get('channel_is_verified', False)
+
+    auth_score = 0.0
+    if is_verified:
+        auth_score += 0.5
+
+    artist_clean = features.artist_clean
+    channel_clean = channel.replace(' ', '')
+    uploader_clean = uploader.replace(' ', '')
+
+    if artist_clean and (artist_clean in channel_clean or artist_clean in uploader_clean):
+        auth_score += 0.5
+    elif "vevo" in channel_clean or "official" in channel_clean or "-topic" in channel_clean:
+        auth_score += 0.3
+
+    auth_score = min(auth_score, 1.0)
+
+    penalty = 0.0
+    if not features.wants_cover and "cover" in title:
+        penalty += 0.2
+    if not features.wants_live and "live" in title:
+        penalty += 0.1
+
+    return max(0.0, (dur_score * 0.45) + (title_score * 0.20) + (view_score * 0.20) + (auth_score * 0.15) - penalty)
+
+def score_batch(jobs: list[tuple[list, TrackFeatures]]) -> list[list[float]]:
+    """Score the candidates of many tracks in one pass: one score list per (results, features) job.
+
+    Track features are computed once per track by the caller, and a title already compared with
+    the same track in this batch (the same upload returned by several rungs or playlists) reuses
+    its SequenceMatcher ratio instead of running the diff again.
+    """
+    ratios: dict[tuple[str, str], float] = {}
+    batch = []
+    for results, features in jobs:
+        scores = []
+        for result in results:
+            title = (result.get('title') or '').lower()
+            key = (features.search_str, title)
+            ratio = ratios.get(key)
+            if ratio is None:
+                ratio = ratios[key] = SequenceMatcher(None, features.search_str, title).ratio()
+            scores.append(_score_candidate(result, features, title, ratio))
+        batch.append(scores)
+    return batch
+
+def score_candidates(results: list, features: TrackFeatures) -> list[float]:
+    """Score every candidate of one track against features computed once for it."""
+    return score_batch([(results, features)])[0]
+
+def _score_result(result: dict, track: dict, spotify_dur: int) -> float:
+    return score_candidates([result], TrackFeatures.of(track, spotify_dur))[0]
+
+_SCORE_IN_THREAD = False
+
+def set_score_in_thread(enabled: bool) -> None:
+    """Rank search results on a worker thread instead of the event loop (--score-in-thread)."""
+    global _SCORE_IN_THREAD
+    _SCORE_IN_THREAD = bool(enabled)
+
+def _sanitise_filename(name: str) -> str:
+    """Refactor: NFC-normalized, filesystem-safe filename preservation."""
+    name = unicodedata.normalize('NFC', name)
+    unsafe = set('<>:"/\\|?*')
+    return "".join(c if c not in unsafe else "_" for c in name).strip()
+
+def _fetch_art(thumbnail_url: str) -> bytes | None:
+    """P37: Fetch and resize album art thumbnail."""
+    if not thumbnail_url:
+        return None
+    Image = _optional_import("PIL.Image")
+    if Image is None:
+        return None
+    try:
+        req = urllib.request.Request(thumbnail_url, headers={'User-Agent': DEFAULT_USER_AGENT})
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            data = resp.read()
+        img = Image.open(BytesIO(data)).convert('RGB').resize((500, 500), Image.LANCZOS)
+        out = BytesIO()
+        img.save(out, format='JPEG', quality=85)
+        return out.getvalue()
+    except Exception:
+        return None
+
+# ── Pipeline stages (no widget access) ─────────────────────────
+def _parse_duration(d_str) -> int:
+    """Surgical parsing of temporal vectors."""
+    try:
+        parts = d_str.split(":")
+        if len(parts) == 2: return int(parts[0]) * 60 + int(parts[1])
+        if len(parts) == 3: return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+    except: return 0
+    return 0
+
+def _track_seconds(track: dict) -> float:
+    """Exact length when the harvest saw it in milliseconds, else the displayed m:ss."""
+    if track.get("duration_ms"):
+        return track["duration_ms"] / 1000
+    return _parse_duration(track.get("duration", ""))
+
+def _signature(track: dict) -> str:
+    return track_signature(track.get("artist", ""), track.get("title", ""), _track_seconds(track))
+
+def track_key(track: dict) -> str:
+    """Stable identity across playlists and missions: the Spotify track ID when the harvest saw one,
+    else the artist/title text (which cannot tell apart two songs sharing a title)."""
+    if track.get("track_id"):
+        return f"spotify:{track['track_id']}"
+    return "text:" + f"{track.get('artist', '')}_{track.get('title', '')}".strip().lower()
+
+def _track_filename(track: dict) -> str:
+    return _sanitise_filename(f"{track['artist']} - {track['title']}.mp3")
+
+# ── yt-dlp instance pool ───────────────────────────────────────
+# Shared by every instance and every run: player-JS signature solutions survive restarts
+YTDLP_CACHE_DIR = STORE_DIR / "yt-dlp-cache"
+
+YDL_PROFILES = {
+    "search": {
+        'quiet': True,
+        'no_warnings': True,
+        'skip_download': True,
+    },
+    # One results-page request per query: title, duration, views, channel and verification are all
+    # the scorer reads. The winner's full extraction happens once, inside its download.
+    "search_flat": {
+        'quiet': True,
+        'no_warnings': True,
+        'skip_download': True,
+        'extract_flat': 'in_playlist',
+    },
+    "download": {
+        'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
+        'postprocessors': [{'key': 'FFmpegExtractAudio',
+                            'preferredcodec': 'mp3', 'preferredquality': '0'}],
+        'postprocessor_args': {
+            'ExtractAudio': ['-threads', '0'],
+        },
+        'quiet': True, 'no_warnings': True, 'noplaylist': True,
+    },
+}
+
+
+class YdlPool:
+    """One long-lived YoutubeDL per executor thread and profile.
+
+    Building a YoutubeDL (option parsing, format selector, extractor and HTTP session setup) costs
+    tens of ms per call; to_thread's executor threads are long-lived, so each pays it once.
+    An instance is only ever used by the thread that owns it.
+    """
+
+    def __init__(self, cache_dir: Path = YTDLP_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.created = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances: list = []
+
+    def get(self, profile: str):
+        ydl = getattr(self._local, profile, None)
+        if ydl is None:
+            yt_dlp = _lazy_import("yt_dlp")
+            ydl = yt_dlp.YoutubeDL({**YDL_PROFILES[profile], 'cachedir': str(self.cache_dir)})
+            if profile == "download":
+                # Per-call progress hook, routed through one permanent hook on the instance
+                ydl.add_progress_hook(self._dispatch_progress)
+            setattr(self._local, profile, ydl)
+            with self._lock:
+                self._instances.append(ydl)
+                self.created += 1
+        return ydl
+
+    def set_progress_hook(self, hook) -> None:
+        self._local.progress_hook = hook
+
+    def _dispatch_progress(self, d) -> None:
+        hook = getattr(self._local, "progress_hook", None)
+        if hook:
+            hook(d)
+
+    def close(self) -> None:
+        with self._lock:
+            instances, self._instances = self._instances, []
+        self._local = threading.local()
+        for ydl in instances:
+            try: ydl.close()
+            except Exception: pass
+
+
+_YDL_POOL = YdlPool()
+
+def shutdown_ydl_pool() -> None:
+    _YDL_POOL.close()
+
+SEARCH_MODES = ("flat", "full")
+_SEARCH_MODE = "flat"
+
+def set_search_mode(mode: str) -> None:
+    """"flat" scores metadata-only results; "full" extracts all five candidates like before."""
+    global _SEARCH_MODE
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"unknown search mode: {mode}")
+    _SEARCH_MODE = mode
+
+async def perform_youtube_search(query: str) -> list:
+    """Surgical search vector using direct yt-dlp library access."""
+    profile = "search_flat" if _SEARCH_MODE == "flat" else "search"
+
+    def run_search():
+        # Direct library usage is significantly faster than subprocess; the pooled instance skips setup
+        result = _YDL_POOL.get(profile).extract_info(f"ytsearch5:{query}", download=False)
+        return result.get('entries', [])
+
+    return await asyncio.to_thread(run_search)
+
+# ── Single-flight ──────────────────────────────────────────────
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight task instead of repeating the work.
+
+    The shared task is cancelled only when every caller waiting on it has been cancelled.
+    ``calls`` counts tasks actually started, ``coalesced`` callers that joined one already running.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: dict = {}  # key -> [task, waiters]
+
+    async def do(self, key, factory) -> tuple:
+        """(result of factory(), whether this caller joined an in-flight call)."""
+        entry = self._inflight.get(key)
+        joined = entry is not None
+        if joined:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(factory())
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda t, key=key: self._forget(key, t))
+            self.calls += 1
+        entry[1] += 1
+        try:
+            return await asyncio.shield(entry[0]), joined
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                entry[0].cancel()
+
+    def _forget(self, key, task) -> None:
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved: a failure nobody awaited anymore is not "never retrieved"
+
+    def counters(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+# Process-wide: match_vector, the ingest workers and every engine in the app share them
+_SEARCH_FLIGHTS = SingleFlight()
+_DOWNLOAD_FLIGHTS = SingleFlight()
+_DOWNLOAD_REFS: dict = {}  # shared temp file -> jobs that have not claimed it yet
+
+# Hedged search: a rung slower than this gets the next rung fired alongside it (None: strictly in order)
+HEDGE_DELAY = 2.0  # suggested --hedge-delay; hedging is opt-in, each hedge is one more yt-dlp query
+HEDGE_MAX_INFLIGHT = 2  # the slow rung plus one hedge: at worst twice the sequential search load
+_HEDGE_DELAY: float | None = None
+
+def set_search_hedge(delay: float | None) -> None:
+    global _HEDGE_DELAY
+    _HEDGE_DELAY = delay if delay is None else max(delay, 0.0)
+
+def _search_queries(track: dict) -> list[str]:
+    artist, title = track.get('artist', ''), track.get('title', '')
+    return [
+        f"{artist} {title} official audio",
+        f"{artist} {title} official video",
+        f"{title} {artist} audio",
+        f"{artist} {title} lyrics",
+        f"{artist} {title}",
+    ]
+
+def _filter_blocked(results: list) -> list:
+    # P17: filter blocklist
+    return [r for r in results if not _is_blocked(r.get('title', ''))]
+
+async def _run_query(q: str, cache, log=None, stats: dict | None = None) -> list:
+    """One rung of the ladder: persistent cache, then yt-dlp behind the 120s guard. [] on failure,
+    counted as a "search_errors" so the miss isn't mistaken for a track with no upload."""
+    # P16: Check cache before search
+    cached = await asyncio.to_thread(cache.get, q)
+    if stats is not None:
+        stats["cache_hits" if cached is not None else "cache_misses"] += 1
+    if cached is not None:
+        return cached
+    # Identical queries already in flight (same track in two playlists, match_vector vs. a worker) join it
+    results, joined = await _SEARCH_FLIGHTS.do(normalize_query(q), lambda: _search_and_store(q, cache, log))
+    if joined and stats is not None:
+        stats["coalesced_searches"] += 1
+    if results is None:
+        if stats is not None:
+            stats["search_errors"] += 1
+        return []
+    return results
+
+async def _search_and_store(q: str, cache, log=None) -> list | None:
+    try:
+        async with asyncio.timeout(120): # IMPLEMENT: timeout(120) guard
+            results = await perform_youtube_search(q)
+    except asyncio.TimeoutError:
+        if log: log(f"SEARCH TIMEOUT for: {q}")
+        return None
+    except Exception:
+        return None
+    if results:
+        await asyncio.to_thread(cache.put, q, results)
+    return results
+
+async def _search_candidates(track: dict, log=None, stats: dict | None = None) -> list:
+    """P16/18: Walk the query ladder (persistent cache first) and return blocklist-filtered candidates.
+
+    ``stats`` gets "cache_hits"/"cache_misses" incremented per query looked up, "hedged_queries"
+    per rung fired early because the running ones were slow, "coalesced_searches" per query
+    that joined an identical one in flight and "search_errors" per query that timed out or raised.
+    """
+    cache = get_search_cache()
+    queries = _search_queries(track)
+    if _HEDGE_DELAY is not None:
+        return await _search_hedged(track, queries, cache, _HEDGE_DELAY, log, stats)
+    results = []
+    for q in queries:
+        results = await _run_query(q, cache, log, stats)
+        if results:
+            break
+    return _filter_blocked(results)
+
+async def _search_hedged(track: dict, queries: list[str], cache, delay: float, log=None,
+                         stats: dict | None = None) -> list:
+    """Walk the ladder like the sequential path, but hedge slow rungs: while nothing usable has come
+    back, the next rung also starts when the running one is slower than ``delay`` (at most
+    HEDGE_MAX_INFLIGHT rungs at once). An empty answer
+    moves down the ladder at once. A marginal answer stops the escalation and only waits out the
+    rungs already in flight. The first set with an auto-accept candidate wins and the rest are
+    cancelled; otherwise the best-scoring set."""
+    rungs = iter(enumerate(queries))
+    pending: dict[asyncio.Task, int] = {}  # task -> rung, so simultaneous answers keep ladder order
+    best_results, best_score = [], -1.0
+
+    def fire() -> bool:
+        rung = next(rungs, None)
+        if rung is None:
+            return False
+        pending[asyncio.create_task(_run_query(rung[1], cache, log, stats))] = rung[0]
+        return True
+
+    fire()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                if not best_results and len(pending) < HEDGE_MAX_INFLIGHT and fire() and stats is not None:
+                    stats["hedged_queries"] += 1
+                continue
+            for task in sorted(done, key=pending.get):
+                del pending[task]
+                results = _filter_blocked(task.result())
+                scored = await _rank_off_loop(results, track)
+                top = scored[0][0] if scored else -1.0
+                if top >= AUTO_ACCEPT_SCORE:
+                    return results
+                if top > best_score:
+                    best_results, best_score = results, top
+            # Only empty answers move on; a marginal set is kept unless a rung in flight beats it
+            if not best_results:
+                fire()
+        return best_results
+    finally:
+        for task in pending:
+            task.cancel()
+
+def _rank_candidates(results: list, track: dict) -> list[tuple[float, dict]]:
+    """P15: Score every candidate, drop the hopeless ones, best first."""
+    scores = score_candidates(results, TrackFeatures.of(track))
+    return sorted(
+        [(s, e) for s, e in zip(scores, results) if s > MIN_MATCH_SCORE],
+        key=lambda x: x[0], reverse=True
+    )
+
+async def _rank_off_loop(results: list, track: dict) -> list[tuple[float, dict]]:
+    """_rank_candidates, on a worker thread when --score-in-thread keeps the event loop free for the UI."""
+    if _SCORE_IN_THREAD and results:
+        return await asyncio.to_thread(_rank_candidates, results, track)
+    return _rank_candidates(results, track)
+
+def _download_audio(url: str, out_stem: Path, progress_hook=None) -> dict | None:
+    """P8: yt-dlp Python API (no subprocess). P9: smart format. P10: correct threads. Blocking.
+
+    Runs on this thread's pooled download instance; only the output template and hook vary per call.
+    Returns the video's full info dict.
+    """
+    ydl = _YDL_POOL.get("download")
+    ydl.params['outtmpl']['default'] = str(out_stem) + '.%(ext)s'
+    _YDL_POOL.set_progress_hook(progress_hook)
+    try:
+        return ydl.extract_info(url, download=True)
+    finally:
+        _YDL_POOL.set_progress_hook(None)
+
+# Tag fields a flat search result lacks; the download's full extraction supplies them
+_FULL_ONLY_FIELDS = ('upload_date', 'thumbnail')
+
+def _fill_from_full(best: dict, info: dict | None) -> None:
+    for key in _FULL_ONLY_FIELDS:
+        if not best.get(key) and info and info.get(key):
+            best[key] = info[key]
+
+async def _download_with_retry(url: str, out_stem: Path, label: str, log=None,
+                               progress_hook=None, best: dict | None = None) -> Path | None:
+    """P11/6: Three attempts with exponential backoff, each behind a 120s timeout.
+
+    ``best`` gets any tag fields it is missing from the downloaded video's full info.
+    """
+    log = log or (lambda _msg: None)
+    out_path = out_stem.with_suffix('.mp3')
+    for attempt in range(3):
+        if attempt:
+            wait = 2 ** attempt
+            log(f"RETRY [{attempt}] {label} — backoff {wait}s")
+            await asyncio.sleep(wait)
+        try:
+            async with asyncio.timeout(120): # IMPLEMENT: asyncio.timeout(120)
+                info = await asyncio.to_thread(_download_audio, url, out_stem, progress_hook)
+                if out_path.exists():
+                    if best is not None:
+                        _fill_from_full(best, info)
+                    return out_path
+        except asyncio.TimeoutError:
+            log(f"TIMEOUT: {label}")
+        except Exception as e:
+            log(f"DL ERR {label}: {e}")
+    return None
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def _tag_and_move(temp_path: Path, dest: Path, track: dict, best: dict, album: str,
+                  track_num, log=None) -> bool:
+    """P34/35/36/37: Move into the library, then full ID3 + album art via mutagen. Blocking."""
+    if dest.exists():
+        dest.unlink()
+    temp_path.rename(dest)
+    if not dest.exists():
+        return False
+    id3 = _optional_import("mutagen.id3")
+    if id3 is not None:
+        try:
+            try:
+                tags = id3.ID3(str(dest))
+            except id3.ID3NoHeaderError:
+                tags = id3.ID3()
+
+            tags.clear()
+            # TIT2: Title, TPE1: Artist, TALB: Album (Library), TRCK: Track Num, TDRC: Year
+            tags.add(id3.TIT2(encoding=3, text=track['title']))
+            tags.add(id3.TPE1(encoding=3, text=track['artist']))
+            tags.add(id3.TALB(encoding=3, text=album))
+            tags.add(id3.TRCK(encoding=3, text=str(track_num)))
+            if track.get('track_id'):
+                # TXXX: the Spotify ID lets library scans join files back to playlists
+                tags.add(id3.TXXX(encoding=3, desc='SPOTIFY_TRACK_ID', text=track['track_id']))
+
+            # TDRC: Date (Year)
+            year = (best.get('upload_date') or "")[:4]
+            if year:
+                tags.add(id3.TDRC(encoding=3, text=year))
+
+            # APIC: Album Art (YouTube Thumbnail)
+            # Use existing art fetcher which handles Pillow scaling
+            art = _fetch_art(best.get('thumbnail'))
+            if art:
+                tags.add(id3.APIC(
+                    encoding=3, mime='image/jpeg', type=3,
+                    desc='Cover', data=art
+                ))
+
+            tags.save(str(dest), v2_version=3)
+        except Exception as e:
+            if log: log(f"MUTAGEN OVERRIDE ERR: {e}")
+    return True
+
+def _write_failure_log(entry: dict) -> None:
+    """Append a structured failure entry to failure_log.json for debugging."""
+    log_path = Path(os.getcwd()) / "failure_log.json"
+    history = []
+    if log_path.exists():
+        try:
+            with open(log_path, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+                if not isinstance(history, list): history = []
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            history = []
+    history.append(entry)
+    with open(log_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+
+# ── Typed progress events ──────────────────────────────────────
+@dataclass
+class EngineEvent:
+    index: int | None
+
+@dataclass
+class TrackStatus(EngineEvent):
+    """Stage transition — status is a STATUS_MAP key (ARCHIVING, NO MATCH, ALREADY ARCHIVED...)."""
+    status: str
+
+@dataclass
+class TrackProgress(EngineEvent):
+    """Live download speed in bytes/s (lossy: dropped when the event buffer is full)."""
+    speed: float
+
+@dataclass
+class TrackComplete(EngineEvent):
+    path: Path
+    size_bytes: int
+    elapsed: float
+    status: str = "COMPLETE"
+
+@dataclass
+class TrackFailed(EngineEvent):
+    phase: str
+    error: str
+    status: str = "FAILED"
+
+@dataclass
+class EngineLog(EngineEvent):
+    message: str
+
+async def _take_top(index: int, track: dict, candidates: list) -> dict | None:
+    """Default resolver for ambiguous matches: trust the ranking."""
+    return candidates[0] if candidates else None
+
+class IngestEngine:
+    """Bounded worker pool that turns track descriptors into tagged library files.
+
+    Producers `await submit(...)`, which blocks while the job queue is full; workers
+    `await` on a bounded event queue, so a slow consumer of `events()` throttles the
+    pipeline instead of letting it buffer without limit.
+    """
+
+    PROGRESS_INTERVAL = 0.25  # seconds between TrackProgress events per track
+
+    def __init__(self, target_dir: Path, library: str, concurrency: int = 36,
+                 queue_size: int | None = None, event_buffer: int = 256, resolver=None):
+        self.target_dir = Path(target_dir)
+        self.library = library
+        self.concurrency = max(concurrency, 1)
+        # resolver(index, track, candidates) -> awaitable[dict | None], called on ambiguous matches
+        self.resolver = resolver or _take_top
+        self._jobs: asyncio.Queue = asyncio.Queue(maxsize=queue_size or self.concurrency * 2)
+        self._events: asyncio.Queue = asyncio.Queue(maxsize=event_buffer)
+        self._gate = asyncio.Event()  # cleared while a resolver is waiting on the user
+        self._gate.set()
+        self._workers: list[asyncio.Task] = []
+        self._monitor: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # track_key -> chosen candidate for this mission; later missions go through ResolvedTracks
+        self._matches: dict = {}
+        self.search_stats = {"cache_hits": 0, "cache_misses": 0, "hedged_queries": 0,
+                             "coalesced_searches": 0, "coalesced_downloads": 0,
+                             "search_errors": 0, "no_match_skipped": 0, "resolved_hits": 0}
+
+    # ── Lifecycle ──
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._monitor = asyncio.create_task(self._finish_when_drained())
+
+    async def submit(self, index: int, track: dict, best: dict | None = None) -> None:
+        """Queue a track for ingestion. Waits while the bounded job queue is full."""
+        await self._jobs.put((index, track, best))
+
+    async def close(self) -> None:
+        """No more submissions; events() ends once every queued track has finished."""
+        for _ in self._workers:
+            await self._jobs.put(None)
+
+    def cancel(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        if self._monitor:
+            self._monitor.cancel()
+
+    async def events(self):
+        """Async iterator over progress events until the engine is closed and drained."""
+        while True:
+            event = await self._events.get()
+            if event is None:
+                return
+            yield event
+
+    def start_stream(self, source, match_workers: int = MATCH_CONCURRENCY, tag_workers: int = TAG_WORKERS,
+                     stage_queue: int | None = None) -> None:
+        """Streaming mode: tracks flow match → download → tag as soon as each stage is done with them.
+
+        ``source`` is an async iterable of (index, track), typically fed by a harvest still in
+        progress; it is only pulled while the match queue has room. Every stage has its own worker
+        pool and a bounded inbox, so a slow stage backs up the ones before it instead of memory.
+        events() ends once the source is exhausted and every stage has drained.
+        """
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        size = stage_queue or self.concurrency * 2
+        layout = [
+            (asyncio.Queue(maxsize=size), self._stream_match, max(match_workers, 1)),
+            (asyncio.Queue(maxsize=size), self._stream_download, self.concurrency),
+            (asyncio.Queue(maxsize=size), self._stream_tag, max(tag_workers, 1)),
+        ]
+
+        async def feed():
+            inbox = layout[0][0]
+            try:
+                async for index, track in source:
+                    await inbox.put((index, track, track.get("youtube_best"), time.perf_counter()))
+            except Exception as e:
+                await self._emit(EngineLog(None, f"STREAM SOURCE ERROR: {e}"))
+
+        async def stage(inbox, outbox, step):
+            while True:
+                job = await inbox.get()
+                if job is None:
+                    return
+                # Pause while an ambiguity is being resolved
+                await self._gate.wait()
+                nxt = await self._failsafe(job[0], job[1], step(*job))
+                if nxt and outbox is not None:
+                    await outbox.put(nxt)
+
+        feeder = asyncio.create_task(feed())
+        pools = []
+        for i, (inbox, step, workers) in enumerate(layout):
+            outbox = layout[i + 1][0] if i + 1 < len(layout) else None
+            pools.append([asyncio.create_task(stage(inbox, outbox, step)) for _ in range(workers)])
+
+        async def drain():
+            # Close each stage only after everything upstream of it has finished
+            await asyncio.gather(feeder, return_exceptions=True)
+            for (inbox, _, workers), pool in zip(layout, pools):
+                for _ in range(workers):
+                    await inbox.put(None)
+                await asyncio.gather(*pool, return_exceptions=True)
+            await self._events.put(None)
+
+        self._workers = [feeder, *(task for pool in pools for task in pool)]
+        self._monitor = asyncio.create_task(drain())
+
+    async def run_stream(self, source, **kwargs):
+        """Convenience: stream tracks from ``source`` and yield their events."""
+        self.start_stream(source, **kwargs)
+        try:
+            async for event in self.events():
+                yield event
+        finally:
+            self.cancel()
+
+    async def run(self, tracks: list[dict]):
+        """Convenience: ingest tracks (by list index) and yield their events."""
+        self.start()
+
+        async def feed():
+            for index, track in enumerate(tracks):
+                await self.submit(index, track, track.get("youtube_best"))
+            await self.close()
+
+        feeder = asyncio.create_task(feed())
+        try:
+            async for event in self.events():
+                yield event
+        finally:
+            feeder.cancel()
+
+    # ── Matching ──
+    async def match(self, index: int, track: dict, log=None) -> dict | None:
+        """Search + rank one track. Ambiguous results go to the resolver with workers paused.
+
+        A recording matched on an earlier run (or by the user) reuses that video without searching.
+        """
+        key = track_key(track) if track.get("track_id") else None
+        if key in self._matches:
+            return self._matches[key]
+        log = log or self._log_soon(index)
+        resolved, no_match, signature = get_resolved_tracks(), get_no_match_cache(), _signature(track)
+        known = await asyncio.to_thread(resolved.get, signature)
+        if known:
+            self.search_stats["resolved_hits"] += 1
+            if key:
+                self._matches[key] = known
+            return known
+        if await asyncio.to_thread(no_match.contains, signature):
+            self.search_stats["no_match_skipped"] += 1
+            log(f"KNOWN NO MATCH (CACHED): {track.get('artist', '?')} - {track.get('title', '?')}")
+            return None
+        calls = dict.fromkeys(self.search_stats, 0)  # this track's own counts: did any rung fail?
+        try:
+            results = await _search_candidates(track, log=log, stats=calls)
+        finally:
+            for k, v in calls.items():
+                self.search_stats[k] += v
+        scored = await _rank_off_loop(results, track)
+        if not scored:
+            # Only a clean miss is remembered; a timed-out or failed rung gets another chance next run
+            if not calls["search_errors"]:
+                await asyncio.to_thread(no_match.add, signature, track.get("artist", ""), track.get("title", ""))
+            return None
+        if no_match.bypass:
+            await asyncio.to_thread(no_match.forget, signature)
+        # Auto-accept the top result if it scores well enough; only a marginal top asks the resolver
+        source = "auto"
+        if scored[0][0] >= AUTO_ACCEPT_SCORE or len(scored) == 1:
+            best = scored[0][1]
+        else:
+            self._gate.clear()
+            try:
+                best = await self.resolver(index, track, [e for _, e in scored[:3]])
+            finally:
+                self._gate.set()
+            # An unattended guess is not a decision: a later interactive run still gets to ask
+            source = None if self.resolver is _take_top else "user"
+        if best and source:
+            await asyncio.to_thread(resolved.put, signature, best, source)
+        elif source == "user":
+            await asyncio.to_thread(no_match.add, signature, track.get("artist", ""), track.get("title", ""))
+        if key and best:
+            self._matches[key] = best
+        return best
+
+    # ── Internals ──
+    async def _emit(self, event: EngineEvent) -> None:
+        await self._events.put(event)
+
+    def _emit_soon(self, event: EngineEvent) -> None:
+        """Non-blocking emit for sync callbacks; overflow waits behind the bound rather than dropping."""
+        try:
+            self._events.put_nowait(event)
+        except asyncio.QueueFull:
+            asyncio.ensure_future(self._events.put(event))
+
+    def _emit_lossy(self, event: EngineEvent) -> None:
+        try:
+            self._events.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    def _log_soon(self, index: int | None):
+        return lambda msg: self._emit_soon(EngineLog(index, msg))
+
+    def _log_from_thread(self, index: int | None):
+        return lambda msg: self._loop.call_soon_threadsafe(self._emit_soon, EngineLog(index, msg))
+
+    def _progress_hook(self, index: int):
+        """P27: yt-dlp progress hook (runs in the download thread), throttled per track."""
+        last = [0.0]
+        def hook(d):
+            if d.get('status') != 'downloading':
+                return
+            now = time.monotonic()
+            if now - last[0] < self.PROGRESS_INTERVAL:
+                return
+            last[0] = now
+            speed = d.get('speed', 0) or 0
+            self._loop.call_soon_threadsafe(self._emit_lossy, TrackProgress(index, speed))
+        return hook
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._jobs.get()
+            if job is None:
+                return
+            # Pause while an ambiguity is being resolved
+            await self._gate.wait()
+            await self._process(*job)
+
+    async def _finish_when_drained(self) -> None:
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        await self._events.put(None)
+
+    async def _download_shared(self, index: int, track: dict, url: str, out_stem: Path,
+                               best: dict) -> Path | None:
+        """Download via the single-flight layer: jobs wanting the same video into the same library share
+        one download, and each one past the first tags its own hard link (or copy) of the file."""
+        shared_path = out_stem.with_suffix('.mp3')
+        full = {}
+
+        async def download():
+            path = await _download_with_retry(url, out_stem, f"[{index}] {track['title']}",
+                                              log=self._log_soon(index), progress_hook=self._progress_hook(index),
+                                              best=full)
+            return path, full
+
+        _DOWNLOAD_REFS[shared_path] = _DOWNLOAD_REFS.get(shared_path, 0) + 1
+        temp_path, took_shared = None, False
+        try:
+            (temp_path, fields), joined = await _DOWNLOAD_FLIGHTS.do(shared_path, download)
+            if joined:
+                self.search_stats["coalesced_downloads"] += 1
+            if temp_path is None:
+                return None
+            _fill_from_full(best, fields)
+            if _DOWNLOAD_REFS[shared_path] == 1:
+                took_shared = True  # nobody else still needs it: tag the shared file itself
+                return temp_path
+            private = temp_path.with_name(f"{temp_path.stem}_{index}{temp_path.suffix}")
+            await asyncio.to_thread(_link_or_copy, temp_path, private)
+            return private
+        finally:
+            left = _DOWNLOAD_REFS[shared_path] - 1
+            if left:
+                _DOWNLOAD_REFS[shared_path] = left
+            else:
+                del _DOWNLOAD_REFS[shared_path]
+                if temp_path and not took_shared:
+                    # Every claimant made its own copy; the last one out removes the original
+                    temp_path.unlink(missing_ok=True)
+
+    async def _process(self, index: int, track: dict, best: dict | None) -> None:
+        """Sequential mode: one worker takes a track through every stage."""
+        track_start = time.perf_counter()
+
+        async def stages():
+            job = await self._stage_match(index, track, best, "ARCHIVING")
+            if job:
+                temp_path = await self._stage_download(index, track, *job)
+                if temp_path:
+                    await self._stage_tag(index, track, *job, temp_path, track_start)
+
+        await self._failsafe(index, track, stages())
+
+    async def _failsafe(self, index: int, track: dict, step):
+        """Await one stage; an unexpected error fails the track (logged) instead of the worker."""
+        try:
+            return await step
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _write_failure_log({
+                "timestamp": datetime.now().isoformat(),
+                "phase": "process_track",
+                "track_index": index,
+                "artist": track.get("artist", "?"),
+                "title": track.get("title", "?"),
+                "track_id": track.get("track_id"),
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+            })
+            await self._emit(TrackFailed(index, "process_track", str(e)))
+            return None
+
+    # ── Stages ──
+    async def _stage_match(self, index: int, track: dict, best: dict | None,
+                           status: str | None) -> tuple[Path, dict] | None:
+        """Library dedup, then match if needed. (dest, best) to download, or None once settled."""
+        dest = self.target_dir / _track_filename(track)
+        # P14: Dedup — skip if already in library
+        if dest.exists():
+            await self._emit(TrackStatus(index, "ALREADY ARCHIVED"))
+            return None
+        if status:
+            await self._emit(TrackStatus(index, status))
+        if best is None:
+            best = await self.match(index, track)
+            if best is None:
+                await self._emit(TrackStatus(index, "NO MATCH"))
+                return None
+        return dest, dict(best)  # filled in from the full extraction later; the cached match stays as is
+
+    async def _stage_download(self, index: int, track: dict, dest: Path, best: dict) -> Path | None:
+        track_id = best.get('id', 'tmp')
+        url = best.get('url') or best.get('webpage_url') or f"https://youtube.com/watch?v={track_id}"
+        temp_path = await self._download_shared(index, track, url, self.target_dir / f"tmp_{track_id}", best)
+        if not temp_path:
+            _write_failure_log({
+                "timestamp": datetime.now().isoformat(),
+                "phase": "download",
+                "track_index": index,
+                "artist": track.get("artist", "?"),
+                "title": track.get("title", "?"),
+                "track_id": track.get("track_id"),
+                "youtube_url": url,
+                "error": "Download returned no file (SIGNAL LOSS)",
+            })
+            # The remembered video may be gone; search for this recording again, now and next run
+            self._matches.pop(track_key(track), None)
+            await asyncio.to_thread(get_resolved_tracks().forget, _signature(track))
+            await self._emit(TrackFailed(index, "download", "Download returned no file (SIGNAL LOSS)"))
+        return temp_path
+
+    async def _stage_tag(self, index: int, track: dict, dest: Path, best: dict, temp_path: Path,
+                         track_start: float) -> None:
+        ok = await asyncio.to_thread(_tag_and_move, temp_path, dest, track, best, self.library,
+                                     track.get('track_num', index + 1), self._log_from_thread(index))
+        if not ok:
+            await self._emit(TrackFailed(index, "tag", "Tagged file missing after move"))
+            return
+        stat = await asyncio.to_thread(os.stat, dest)
+        await self._emit(TrackComplete(index, dest, stat.st_size, time.perf_counter() - track_start))
+
+    # Streaming adapters: each takes the previous stage's job tuple and returns the next one (or None)
+    async def _stream_match(self, index, track, best, track_start):
+        job = await self._stage_match(index, track, best, "MATCHING" if best is None else None)
+        return job and (index, track, *job, track_start)
+
+    async def _stream_download(self, index, track, dest, best, track_start):
+        await self._emit(TrackStatus(index, "ARCHIVING"))
+        temp_path = await self._stage_download(index, track, dest, best)
+        return temp_path and (index, track, dest, best, track_start, temp_path)
+
+    async def _stream_tag(self, index, track, dest, best, track_start, temp_path):
+        await self._stage_tag(index, track, dest, best, temp_path, track_start)
+
+
+# ── Match scheduling ───────────────────────────────────────────
+
+class MatchScheduler:
+    """Bounded, prioritized pre-matching for harvested tracks.
+
+    ``match(index)`` runs for at most ``concurrency`` tracks at a time. The next track is picked when
+    a slot frees up, in this order: within ``lookahead`` of the ingest cursor, visible in the table,
+    selected, then playlist order. ``is_selected(index)`` and ``visible()`` (a range of indices) are
+    asked at pick time, so scrolling and toggling re-prioritize the waiting tracks immediately.
+    ``on_change(queued, running)`` fires whenever the depth changes.
+    """
+
+    def __init__(self, match, concurrency: int = MATCH_CONCURRENCY, lookahead: int = MATCH_LOOKAHEAD,
+                 is_selected=None, visible=None, on_change=None):
+        self.match = match
+        self.concurrency = max(concurrency, 1)
+        self.lookahead = max(lookahead, 0)
+        self.cursor = 0
+        self.is_selected = is_selected or (lambda index: True)
+        self.visible = visible or (lambda: range(0))
+        self.on_change = on_change or (lambda queued, running: None)
+        self.running = 0
+        self._queued: set[int] = set()
+        self._inflight: dict[int, asyncio.Event] = {}
+        self._wake = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        return len(self._queued)
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def submit(self, index: int) -> None:
+        self._queued.add(index)
+        self._wake.set()
+        self._changed()
+
+    def discard(self, index: int) -> bool:
+        """Drop a still-waiting track (e.g. ingest reached it first). False if not waiting."""
+        if index not in self._queued:
+            return False
+        self._queued.discard(index)
+        self._changed()
+        return True
+
+    async def claim(self, index: int) -> None:
+        """Hand a track over to ingest: drop it if still waiting, or wait for its running match to end,
+        so the two never search (or ask the user about) the same track at once."""
+        if self.discard(index):
+            return
+        done = self._inflight.get(index)
+        if done is not None:
+            await done.wait()
+
+    def set_cursor(self, index: int) -> None:
+        self.cursor = index
+
+    def cancel(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+
+    def _priority(self, index: int, visible: range) -> tuple:
+        ahead = 0 <= index - self.cursor < self.lookahead
+        return (not ahead, index not in visible, not self.is_selected(index), index)
+
+    def _next(self) -> int:
+        visible = self.visible()
+        index = min(self._queued, key=lambda i: self._priority(i, visible))
+        self._queued.discard(index)
+        return index
+
+    def _changed(self) -> None:
+        try: self.on_change(len(self._queued), self.running)
+        except Exception: pass
+
+    async def _worker(self) -> None:
+        while True:
+            if not self._queued:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            index = self._next()
+            done = self._inflight[index] = asyncio.Event()
+            self.running += 1
+            self._changed()
+            try:
+                await self.match(index)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass  # match() reports its own failures
+            finally:
+                del self._inflight[index]
+                done.set()
+                self.running -= 1
+                self._changed()
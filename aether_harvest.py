@@ -0,0 +1,1122 @@
+"""Aether playlist harvester — one streaming Spotify scraper for every consumer.
+
+Importable without Textual. ``harvest_playlist`` is an async generator that yields
+batches of track descriptors while the list is still scrolling, so the Archivist
+can start matching early and the Watchdog can show live counts.
+"""
+import asyncio
+import json
+import re
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from aether_engine import DEFAULT_USER_AGENT, _lazy_import, track_key
+from aether_store import HarvestCache, get_harvest_cache
+
+# ARCHITECT: MATTHEW BUBB (SOLE PROGRAMMER)
+# ==============================================================================
+
+ROW_SELECTOR = '[data-testid="tracklist-row"]'
+MAIN_TRACKLIST_SELECTOR = '[data-testid="playlist-tracklist"]'
+
+# Adaptive scroll pacing: waits shrink while rows keep arriving and back off when they stall
+MIN_SCROLL_WAIT = 0.05
+MAX_SCROLL_WAIT = 0.8
+MIN_SCROLL_STEP = 2500
+MAX_SCROLL_STEP = 20000
+STALL_SECONDS = 4.0  # idle time without new rows before the list counts as exhausted
+
+STOP_DECLARED_COUNT = "declared count reached"
+STOP_STALLED = "no new rows"
+STOP_STALLED_SHORT = "no new rows before declared count"
+STOP_JSON_COMPLETE = "json complete"
+STOP_EMBED_COMPLETE = "embed complete"
+STOP_CACHE_HIT = "cache hit"
+STOP_KNOWN_ROWS = "reached known rows"
+
+# Harvest strategies: "json" reads the web player's playlist responses (DOM fallback), "dom" scrolls
+HARVEST_STRATEGIES = ("json", "dom")
+PLAYLIST_JSON_MARKERS = ("/pathfinder/", "/v1/playlists/")
+JSON_PAGE_LIMIT = 100
+
+# Browserless first attempt: public playlists' embed page inlines the track list (capped at 100 rows)
+EMBED_BASE_URL = "https://open.spotify.com/embed/playlist/"
+EMBED_TRACK_LIMIT = 100
+EMBED_TIMEOUT = 15
+_PLAYLIST_ID_RE = re.compile(r"playlist[/:]([A-Za-z0-9]{10,})")
+_NEXT_DATA_RE = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+# Same AppData root as the dependency manifest; cookies (consent included) survive restarts
+BROWSER_PROFILE_DIR = Path.home() / "AppData" / "Local" / "AetherArchivist" / "browser_profile"
+MAX_BROWSER_PAGES = 3
+CONSENT_COOKIE = "OptanonAlertBoxClosed"
+
+# Route filter: the harvest needs DOM text only. Stylesheets stay so the virtualized list lays out.
+BLOCKED_RESOURCE_TYPES = frozenset(["image", "media", "font", "texttrack", "manifest"])
+ESSENTIAL_HOST_SUFFIXES = ("spotify.com", "spotifycdn.com", "scdn.co", "cookielaw.org", "onetrust.com")
+TRACKER_HOST_MARKERS = ("google-analytics", "googletagmanager", "doubleclick", "facebook", "hotjar",
+                        "sentry", "branch.io", "gabo-receiver", "analytics", "pixel")
+# Rough per-request payloads for the "bytes saved" estimate (aborted requests never report a size)
+ESTIMATED_BLOCKED_BYTES = {"image": 60_000, "media": 400_000, "font": 45_000, "script": 70_000}
+DEFAULT_BLOCKED_BYTES = 15_000
+
+# ── Incremental harvest (page side) ───────────────────────────
+# Installed once per page: a MutationObserver extracts each tracklist-row as it is
+# rendered (or re-rendered by the virtualized list), dedupes in the page and buffers
+# only unseen rows. Python drains the buffer each scroll tick, so the data shipped per
+# tick is the delta, not the whole list.
+HARVEST_OBSERVER_JS = r'''(includeRecommended) => {
+    if (window.__aetherHarvest) return window.__aetherHarvest.seen.size;
+    const ROW = '[data-testid="tracklist-row"]';
+    const MAIN = '[data-testid="playlist-tracklist"]';
+    const durRegex = /^\d{1,2}:\d{2}(:\d{2})?$/;
+    const state = { seen: new Set(), buffer: [] };
+
+    const durationOf = (row) => {
+        const durElem = row.querySelector('div[data-testid="tracklist-row-duration"]');
+        const text = durElem ? durElem.innerText.trim() : "";
+        if (durRegex.test(text)) return text;
+        // Virtualization artifact: walk leaf text nodes instead of innerText of every div
+        const walker = document.createTreeWalker(row, NodeFilter.SHOW_TEXT);
+        for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+            const t = n.nodeValue.trim();
+            if (durRegex.test(t)) return t;
+        }
+        return "0:00";
+    };
+
+    const visit = (row) => {
+        if (!includeRecommended && !row.closest(MAIN)) return;
+        const titleElem = row.querySelector('div[dir="auto"]');
+        if (!titleElem) return;  // not rendered yet; a later mutation revisits it
+        const title = titleElem.innerText;
+        const artists = Array.from(row.querySelectorAll('a[href*="/artist/"]')).map(a => a.innerText).join(", ");
+        // The track link gives a stable ID, so repeated titles by different tracks both survive
+        const link = row.querySelector('a[href*="/track/"]');
+        const m = link ? (link.getAttribute("href") || "").match(/\/track\/([A-Za-z0-9]+)/) : null;
+        const trackId = m ? m[1] : null;
+        const key = trackId ? "id:" + trackId : (artists + "_" + title).trim();
+        if (!key || state.seen.has(key)) return;
+        state.seen.add(key);
+        state.buffer.push({ title: title, artists: artists, duration: durationOf(row), track_id: trackId });
+    };
+
+    const scan = (node) => {
+        if (!node || node.nodeType !== 1) return;
+        const row = node.closest(ROW);
+        if (row) { visit(row); return; }
+        node.querySelectorAll(ROW).forEach(visit);
+    };
+
+    new MutationObserver((mutations) => {
+        for (const m of mutations) {
+            if (m.type === "childList") {
+                m.addedNodes.forEach(scan);
+                scan(m.target);
+            } else {
+                scan(m.target.parentElement);
+            }
+        }
+    }).observe(document.body, { childList: true, subtree: true, characterData: true });
+
+    document.querySelectorAll(ROW).forEach(visit);
+    window.__aetherHarvest = state;
+    return state.seen.size;
+}'''
+
+HARVEST_DRAIN_JS = r'''() => {
+    const state = window.__aetherHarvest;
+    if (!state) return [];
+    const rows = state.buffer;
+    state.buffer = [];
+    return rows;
+}'''
+
+# Header / meta track count, e.g. "50 songs, about 3 hr" or og:description "Playlist · Spotify · 50 items"
+DECLARED_COUNT_JS = r'''() => {
+    const meta = document.querySelector('meta[name="music:song_count"], meta[property="music:song_count"]');
+    const texts = [];
+    if (meta) texts.push(meta.getAttribute("content") + " songs");
+    const header = document.querySelector('[data-testid="playlist-page"] [data-testid="entity-header"]')
+        || document.querySelector('[data-testid="entity-header"]')
+        || document.querySelector('[data-testid="playlist-page"]');
+    if (header) header.querySelectorAll("span").forEach(s => texts.push(s.innerText || ""));
+    const og = document.querySelector('meta[property="og:description"]');
+    if (og) texts.push(og.getAttribute("content") || "");
+    return texts;
+}'''
+
+_DECLARED_COUNT_RE = re.compile(r"(\d[\d,.\u00a0 ]*)\s*(?:songs?|items?|tracks?)\b", re.IGNORECASE)
+
+_SCROLL_JS = r'''(includeRecommended) => {
+    const scope = includeRecommended ? document : (document.querySelector('[data-testid="playlist-tracklist"]') || document);
+    const rows = scope.querySelectorAll('[data-testid="tracklist-row"]');
+    if (rows.length > 0) rows[rows.length - 1].scrollIntoView();
+    return rows.length;
+}'''
+
+
+@dataclass
+class HarvestBatch:
+    """Rows first seen since the previous batch. ``total`` counts every row yielded so far."""
+    tracks: list = field(default_factory=list)
+    total: int = 0
+    playlist_name: str = "Unknown Playlist"
+    declared_total: int | None = None
+    stop_reason: str | None = None  # set on the final batch only
+    route_report: dict | None = None  # final batch only, when the route filter ran
+    strategy: str = "dom"
+    scroll_ticks: int = 0  # DOM strategy: scroll iterations so far
+
+
+def _parse_declared_count(texts: list) -> int | None:
+    """First "<n> songs/items" figure from the header texts, ignoring separators."""
+    for text in texts or []:
+        m = _DECLARED_COUNT_RE.search(text or "")
+        if m:
+            digits = re.sub(r"\D", "", m.group(1))
+            if digits:
+                return int(digits)
+    return None
+
+
+class ScrollPacer:
+    """Decides scroll step, wait and termination from the observed row arrival rate."""
+
+    def __init__(self, declared_total: int | None = None):
+        self.declared_total = declared_total
+        self.wait = 0.2
+        self.step = 5000
+        self.idle = 0.0
+        self.ticks = 0
+
+    def observe(self, new_rows: int) -> None:
+        self.ticks += 1
+        if new_rows:
+            self.idle = 0.0
+            self.wait = max(MIN_SCROLL_WAIT, self.wait * 0.7)
+            self.step = min(MAX_SCROLL_STEP, int(self.step * 1.25))
+        else:
+            # Nothing rendered: give the network more time and nudge in smaller steps
+            self.idle += self.wait
+            self.wait = min(MAX_SCROLL_WAIT, self.wait * 1.6)
+            self.step = max(MIN_SCROLL_STEP, int(self.step * 0.8))
+
+    def stop_reason(self, total: int) -> str | None:
+        if self.declared_total and total >= self.declared_total:
+            return STOP_DECLARED_COUNT
+        if self.idle >= STALL_SECONDS:
+            return STOP_STALLED_SHORT if self.declared_total else STOP_STALLED
+        return None
+
+
+def _playlist_name_from_title(raw_title: str) -> str:
+    # Spotify titles are like "Playlist Name - playlist by Creator | Spotify"
+    return raw_title.split(" - ")[0].strip() if raw_title else "Unknown Playlist"
+
+
+# ── JSON harvest ───────────────────────────────────────────────
+def _ms_to_clock(ms) -> str:
+    secs = int(round((ms or 0) / 1000))
+    h, rem = divmod(secs, 3600)
+    return f"{h}:{rem // 60:02d}:{rem % 60:02d}" if h else f"{rem // 60}:{rem % 60:02d}"
+
+
+def _json_track_row(item: dict) -> dict | None:
+    """One playlist item (pathfinder ``itemV2`` or Web API ``track``) → track descriptor."""
+    pathfinder = "itemV2" in item
+    data = ((item.get("itemV2") or {}).get("data")) if pathfinder else item.get("track")
+    if not isinstance(data, dict) or not data.get("name"):
+        return None
+    if pathfinder:
+        if data.get("__typename", "Track") != "Track":
+            return None
+        artists = [a.get("profile", {}).get("name", "") for a in (data.get("artists") or {}).get("items", [])]
+        duration_ms = (data.get("trackDuration") or {}).get("totalMilliseconds") or 0
+        track_id = (data.get("uri") or "").rsplit(":", 1)[-1] or None
+    else:  # Web API
+        if data.get("type", "track") != "track":
+            return None
+        artists = [a.get("name", "") for a in data.get("artists") or []]
+        duration_ms = data.get("duration_ms") or 0
+        track_id = data.get("id")
+    return {"artist": ", ".join(a for a in artists if a), "title": data["name"],
+            "duration": _ms_to_clock(duration_ms), "duration_ms": duration_ms, "track_id": track_id}
+
+
+def _parse_playlist_json(payload) -> dict | None:
+    """Playlist page from a pathfinder or Web API response, or None if it is something else.
+
+    Returns {rows, items, total, offset, name, next}. ``items`` is the raw item count, episodes and
+    unavailable entries included: the API's offset and total count those, ``rows`` does not.
+    """
+    if not isinstance(payload, dict):
+        return None
+    playlist = (payload.get("data") or {}).get("playlistV2")
+    if isinstance(playlist, dict) and isinstance(playlist.get("content"), dict):
+        content = playlist["content"]
+        items = content.get("items") or []
+        paging = content.get("pagingInfo") or {}
+        return {"rows": [r for r in map(_json_track_row, items) if r], "items": len(items),
+                "total": content.get("totalCount"), "offset": paging.get("offset", 0),
+                "name": playlist.get("name"), "next": None}
+    name = payload.get("name")
+    page = payload.get("tracks") if isinstance(payload.get("tracks"), dict) else payload
+    if isinstance(page.get("items"), list) and "total" in page:
+        return {"rows": [r for r in map(_json_track_row, page["items"]) if r], "items": len(page["items"]),
+                "total": page.get("total"), "offset": page.get("offset", 0),
+                "name": name, "next": page.get("next")}
+    return None
+
+
+class _JsonPager:
+    """Replays a captured playlist request with a new offset, reusing the page's auth headers."""
+
+    def __init__(self, page, url: str, method: str, headers: dict, post_data: str | None):
+        self.page = page
+        self.url = url
+        self.method = method
+        self.post_data = post_data
+        self.headers = {k: v for k, v in headers.items()
+                        if not k.startswith(":") and k.lower() not in ("host", "content-length")}
+
+    def request_for(self, offset: int, limit: int, next_url: str | None = None) -> tuple[str, str | None]:
+        if next_url:
+            return next_url, None
+        parts = urlsplit(self.url)
+        if "/pathfinder/" not in parts.path:
+            return None, None  # Web API pages only continue through "next"
+        if self.method == "POST" and self.post_data:
+            body = json.loads(self.post_data)
+            body.setdefault("variables", {}).update(offset=offset, limit=limit)
+            return self.url, json.dumps(body)
+        qs = dict(parse_qsl(parts.query))
+        variables = json.loads(qs.get("variables") or "{}")
+        variables.update(offset=offset, limit=limit)
+        qs["variables"] = json.dumps(variables, separators=(",", ":"))
+        return parts._replace(query=urlencode(qs)).geturl(), self.post_data
+
+    async def fetch(self, offset: int, limit: int = JSON_PAGE_LIMIT, next_url: str | None = None) -> dict | None:
+        url, data = self.request_for(offset, limit, next_url)
+        if not url:
+            return None
+        resp = await self.page.request.fetch(url, method="GET" if next_url else self.method,
+                                             headers=self.headers, data=data)
+        if not resp.ok:
+            raise RuntimeError(f"playlist JSON HTTP {resp.status}")
+        return _parse_playlist_json(await resp.json())
+
+
+class _JsonCapture:
+    """page.on("response") listener collecting playlist JSON pages the web player fetched."""
+
+    def __init__(self):
+        self.pages: list[dict] = []
+        self.pager_args = None
+        self._pending: set = set()
+
+    def on_response(self, response) -> None:
+        if any(marker in response.url for marker in PLAYLIST_JSON_MARKERS):
+            task = asyncio.ensure_future(self._read(response))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response) -> None:
+        try:
+            parsed = _parse_playlist_json(await response.json())
+            if not parsed or not parsed["items"]:
+                return
+            if self.pager_args is None:
+                req = response.request
+                self.pager_args = (req.url, req.method, await req.all_headers(), req.post_data)
+            self.pages.append(parsed)
+        except Exception:
+            pass
+
+    async def settle(self) -> None:
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+
+# ── Embed harvest (no browser) ─────────────────────────────────
+def playlist_id_from_url(url: str) -> str | None:
+    """Spotify playlist ID from an open.spotify.com URL or spotify:playlist: URI (query ignored)."""
+    m = _PLAYLIST_ID_RE.search(url or "")
+    return m.group(1) if m else None
+
+
+def _find_track_list(node) -> dict | None:
+    """Depth-first search for the entity dict carrying ``trackList`` (its path moves between builds)."""
+    if isinstance(node, dict):
+        if isinstance(node.get("trackList"), list):
+            return node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = _find_track_list(child)
+        if found is not None:
+            return found
+    return None
+
+
+def parse_embed_page(html: str) -> dict | None:
+    """Embed page HTML → {name, rows, truncated}, or None when it carries no track list."""
+    m = _NEXT_DATA_RE.search(html or "")
+    if not m:
+        return None
+    try:
+        entity = _find_track_list(json.loads(m.group(1)))
+    except ValueError:
+        return None
+    if entity is None:
+        return None
+    rows = []
+    for item in entity["trackList"]:
+        if not isinstance(item, dict) or not item.get("title"):
+            continue
+        if item.get("entityType", "track") != "track":
+            continue
+        duration_ms = item.get("duration") or 0
+        rows.append({
+            "artist": (item.get("subtitle") or "").replace("\u00a0", " ").strip(),
+            "title": item["title"],
+            "duration": _ms_to_clock(duration_ms),
+            "duration_ms": duration_ms,
+            "track_id": (item.get("uri") or "").rsplit(":", 1)[-1] or None,
+        })
+    return {"name": entity.get("name") or entity.get("title"), "rows": rows,
+            "truncated": len(entity["trackList"]) >= EMBED_TRACK_LIMIT}
+
+
+def _fetch_embed_html(url: str) -> str:
+    req = urllib.request.Request(url, headers={"User-Agent": DEFAULT_USER_AGENT})
+    with urllib.request.urlopen(req, timeout=EMBED_TIMEOUT) as resp:
+        return resp.read().decode("utf-8", errors="replace")
+
+
+async def fetch_embed_playlist(url: str, base_url: str = EMBED_BASE_URL) -> dict | None:
+    """Plain-HTTP harvest of a public playlist's embed page; None when missing or unparseable."""
+    playlist_id = playlist_id_from_url(url)
+    if not playlist_id:
+        return None
+    try:
+        html = await asyncio.to_thread(_fetch_embed_html, base_url + playlist_id)
+    except Exception:
+        return None
+    return parse_embed_page(html)
+
+
+# ── Route filter ───────────────────────────────────────────────
+class RouteFilter:
+    """Aborts images, fonts, media, trackers and third-party hosts; tallies what it saved."""
+
+    def __init__(self, extra_hosts: tuple = ()):
+        self.allowed_suffixes = ESSENTIAL_HOST_SUFFIXES + tuple(extra_hosts)
+        self.blocked: dict[str, int] = {}
+        self.blocked_bytes = 0
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+        self.started = time.perf_counter()
+        self.ready_seconds = None
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in BLOCKED_RESOURCE_TYPES:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        if not host:
+            return False  # data:, blob: and friends
+        if any(marker in host for marker in TRACKER_HOST_MARKERS):
+            return True
+        return not any(host == sfx or host.endswith("." + sfx) for sfx in self.allowed_suffixes)
+
+    async def handle(self, route) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            kind = request.resource_type
+            self.blocked[kind] = self.blocked.get(kind, 0) + 1
+            self.blocked_bytes += ESTIMATED_BLOCKED_BYTES.get(kind, DEFAULT_BLOCKED_BYTES)
+            try: await route.abort()
+            except: pass
+        else:
+            self.allowed_requests += 1
+            # fallback, not continue_: a context-level route (HAR replay) may still serve it
+            try: await route.fallback()
+            except: pass
+
+    def on_response(self, response) -> None:
+        try:
+            self.allowed_bytes += int(response.headers.get("content-length") or 0)
+        except (TypeError, ValueError):
+            pass
+
+    def mark_ready(self) -> None:
+        if self.ready_seconds is None:
+            self.ready_seconds = time.perf_counter() - self.started
+
+    def report(self) -> dict:
+        ready = self.ready_seconds if self.ready_seconds is not None else time.perf_counter() - self.started
+        # Time saved ~= blocked bytes at the throughput the allowed requests actually achieved
+        rate = self.allowed_bytes / ready if ready > 0 else 0
+        return {
+            "blocked_requests": sum(self.blocked.values()),
+            "blocked_by_type": dict(self.blocked),
+            "bytes_saved_est": self.blocked_bytes,
+            "seconds_saved_est": round(self.blocked_bytes / rate, 2) if rate else None,
+            "allowed_requests": self.allowed_requests,
+            "allowed_bytes": self.allowed_bytes,
+            "page_ready_seconds": round(ready, 2),
+        }
+
+
+def format_route_report(report: dict) -> str:
+    saved = report.get("seconds_saved_est")
+    saved_txt = f", ~{saved:.1f}s" if saved else ""
+    return (f"BLOCKED {report['blocked_requests']} REQUESTS (~{report['bytes_saved_est'] / 1048576:.1f} MB{saved_txt}) | "
+            f"PAGE READY {report['page_ready_seconds']:.1f}s")
+
+
+# ── Browser pool ───────────────────────────────────────────────
+class BrowserPool:
+    """One long-lived Chromium with a persistent context; at most ``max_pages`` pages at once.
+
+    Extra scrapes queue on the semaphore (FIFO) instead of launching more browsers.
+    The browser starts on first use and restarts if it crashed or its loop went away.
+    ``har_path`` with ``har_mode`` "record" captures all traffic to a HAR; "replay" serves it back
+    offline (unmatched requests abort). ``allow_hosts`` extends the route filter's host allowlist.
+    """
+
+    def __init__(self, max_pages: int = MAX_BROWSER_PAGES, profile_dir: Path = BROWSER_PROFILE_DIR,
+                 headless: bool = True, block_resources: bool = True, allow_hosts: tuple = (),
+                 har_path: Path | None = None, har_mode: str | None = None):
+        self.max_pages = max(max_pages, 1)
+        self.profile_dir = Path(profile_dir)
+        self.headless = headless
+        self.block_resources = block_resources
+        self.allow_hosts = tuple(allow_hosts)
+        self.har_path = Path(har_path) if har_path else None
+        self.har_mode = har_mode if har_path else None
+        self.in_use = 0
+        self.waiting = 0
+        self.launches = 0
+        self._playwright = None
+        self._context = None
+        self._loop = None
+        self._sem = None
+        self._start_lock = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Playwright objects are tied to the loop that created them
+            self._loop = loop
+            self._sem = asyncio.Semaphore(self.max_pages)
+            self._start_lock = asyncio.Lock()
+            self._playwright = self._context = None
+
+    async def _ensure_context(self):
+        async with self._start_lock:
+            if self._context is not None:
+                return self._context
+            if self._playwright is None:
+                # Import off the event loop so the UI keeps painting while Playwright loads
+                async_playwright = (await asyncio.to_thread(_lazy_import, "playwright.async_api")).async_playwright
+                self._playwright = await async_playwright().start()
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            extra = {}
+            if self.har_mode == "record":
+                self.har_path.parent.mkdir(parents=True, exist_ok=True)
+                extra = {"record_har_path": str(self.har_path), "record_har_content": "embed"}
+            self._context = await self._playwright.chromium.launch_persistent_context(
+                str(self.profile_dir), headless=self.headless, user_agent=DEFAULT_USER_AGENT,
+                # Service workers would serve requests past page.route
+                service_workers="block" if (self.block_resources or self.har_mode) else "allow",
+                **extra,
+            )
+            if self.har_mode == "replay":
+                await self._context.route_from_har(str(self.har_path), not_found="abort")
+            self._context.on("close", lambda *_: setattr(self, "_context", None))
+            self.launches += 1
+            return self._context
+
+    async def _has_consent(self) -> bool:
+        try:
+            return any(c["name"] == CONSENT_COOKIE for c in await self._context.cookies())
+        except Exception:
+            return False
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a fresh page in the shared context; it is closed on exit."""
+        self._bind_loop()
+        self.waiting += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_use += 1
+        page = None
+        try:
+            context = await self._ensure_context()
+            try:
+                page = await context.new_page()
+            except Exception:
+                # Browser died under us: relaunch once
+                self._context = None
+                context = await self._ensure_context()
+                page = await context.new_page()
+            yield page
+        finally:
+            if page is not None:
+                try: await page.close()
+                except: pass
+            self.in_use -= 1
+            self._sem.release()
+
+    async def dismiss_consent(self, page) -> None:
+        """Click the cookie wall only while the profile has no consent cookie yet."""
+        if await self._has_consent():
+            return
+        try: await page.click('button#onetrust-accept-btn-handler', timeout=3000)
+        except: pass
+
+    async def close(self) -> None:
+        context, playwright = self._context, self._playwright
+        self._context = self._playwright = None
+        if context is not None:
+            try: await context.close()
+            except: pass
+        if playwright is not None:
+            try: await playwright.stop()
+            except: pass
+
+
+_BROWSER_POOL: BrowserPool | None = None
+
+def get_browser_pool() -> BrowserPool:
+    global _BROWSER_POOL
+    if _BROWSER_POOL is None:
+        _BROWSER_POOL = BrowserPool()
+    return _BROWSER_POOL
+
+async def shutdown_browser_pool() -> None:
+    if _BROWSER_POOL is not None:
+        await _BROWSER_POOL.close()
+
+
+def _dom_row(td: dict) -> dict:
+    row = {"artist": td["artists"], "title": td["title"], "duration": td["duration"]}
+    if td.get("track_id"):
+        row["track_id"] = td["track_id"]
+    return row
+
+
+def _mark_seen(seen_keys: set, row: dict) -> None:
+    """Remember a JSON/embed row by ID and by text, so ID-less DOM rows still dedupe against it."""
+    seen_keys.add(track_key(row))
+    seen_keys.add(track_key({"artist": row["artist"], "title": row["title"]}))
+
+
+async def harvest_playlist(url: str, include_recommended: bool = False, pool: BrowserPool | None = None,
+                           strategy: str = "json", embed_first: bool = True, embed_base_url: str = EMBED_BASE_URL):
+    """Stream a Spotify playlist as HarvestBatch objects: {artist, title, duration} rows.
+
+    The first batch is yielded as soon as the first rows render (it may be empty,
+    carrying only the playlist name). Failures raise after any batches already yielded.
+    Pages come from the shared BrowserPool, so concurrent harvests queue rather than fork browsers.
+
+    ``strategy="json"`` parses the playlist JSON the web player fetches (exact durations and
+    track IDs, no scrolling) and falls back to DOM scrolling when none is seen or paging fails.
+    Recommended rows only exist in the DOM, so ``include_recommended`` always scrolls.
+
+    With ``embed_first`` the embed page is tried over plain HTTP before any browser; Chromium is
+    only used when the embed is missing or truncated, and then skips the rows it already gave.
+    """
+    seen_keys: set = set()
+    embed_total = 0
+    if embed_first and not include_recommended:
+        embed = await fetch_embed_playlist(url, embed_base_url)
+        if embed and embed["rows"]:
+            for row in embed["rows"]:
+                _mark_seen(seen_keys, row)
+            embed_total = len(embed["rows"])
+            done = not embed["truncated"]
+            yield HarvestBatch(embed["rows"], embed_total, embed["name"] or "Unknown Playlist",
+                               embed_total if done else None, STOP_EMBED_COMPLETE if done else None,
+                               strategy="embed")
+            if done:
+                return
+
+    pool = pool or get_browser_pool()
+    use_json = strategy == "json" and not include_recommended
+    # Scope selector: only main tracklist, or all rows if including recommended
+    row_scope = ROW_SELECTOR if include_recommended else f"{MAIN_TRACKLIST_SELECTOR} {ROW_SELECTOR}"
+
+    async with pool.page() as page:
+        route_filter = None
+        if pool.block_resources:
+            route_filter = RouteFilter(pool.allow_hosts)
+            await page.route("**/*", route_filter.handle)
+            page.on("response", route_filter.on_response)
+        capture = None
+        if use_json:
+            capture = _JsonCapture()
+            page.on("response", capture.on_response)
+        # The rows are all we need: don't hold out for the full "load" event
+        await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        await pool.dismiss_consent(page)
+        await page.wait_for_selector(row_scope, timeout=30000)
+        if route_filter:
+            route_filter.mark_ready()
+        try:
+            playlist_name = _playlist_name_from_title(await page.title())
+        except Exception:
+            playlist_name = "Unknown Playlist"
+
+        total = embed_total
+        if capture:
+            # Rows render from the first playlist response, so it has arrived by now
+            await capture.settle()
+            if capture.pages:
+                async for batch in _harvest_json(page, capture, playlist_name, seen_keys, total):
+                    total = batch.total
+                    if batch.stop_reason:
+                        batch.route_report = route_filter.report() if route_filter else None
+                        yield batch
+                        return
+                    yield batch
+
+        async for batch in _harvest_dom(page, include_recommended, playlist_name, seen_keys, total):
+            if batch.stop_reason and route_filter:
+                batch.route_report = route_filter.report()
+            yield batch
+
+
+async def _harvest_json(page, capture: _JsonCapture, playlist_name: str, seen_keys: set, total: int = 0):
+    """Yield the captured JSON pages, then fetch the rest by offset; the final batch has stop_reason set.
+
+    Returns without a final batch when paging fails, leaving the DOM path to finish the list.
+    """
+    pages = sorted(capture.pages, key=lambda p: p["offset"] or 0)
+    declared = max((p["total"] for p in pages if p["total"] is not None), default=None)
+    playlist_name = next((p["name"] for p in pages if p["name"]), playlist_name)
+
+    def take(rows):
+        fresh = []
+        for row in rows:
+            key = track_key(row)
+            if key in seen_keys:
+                continue
+            _mark_seen(seen_keys, row)
+            fresh.append(row)
+        return fresh
+
+    rows = []
+    for p in pages:
+        rows += take(p["rows"])
+    total += len(rows)
+    offset = max((p["offset"] or 0) + p["items"] for p in pages)
+    next_url = pages[-1]["next"]
+    pager = _JsonPager(page, *capture.pager_args)
+    while True:
+        done = declared is not None and offset >= declared
+        yield HarvestBatch(rows, total, playlist_name, declared,
+                           STOP_JSON_COMPLETE if done else None, strategy="json")
+        if done:
+            return
+        try:
+            parsed = await pager.fetch(offset, JSON_PAGE_LIMIT, next_url)
+        except Exception:
+            return
+        if not parsed or not parsed["items"]:
+            if declared is None:
+                yield HarvestBatch([], total, playlist_name, declared, STOP_JSON_COMPLETE, strategy="json")
+            return
+        rows = take(parsed["rows"])
+        total += len(rows)
+        offset += parsed["items"]
+        next_url = parsed["next"]
+
+
+async def _harvest_dom(page, include_recommended: bool, playlist_name: str, seen_keys: set, total: int = 0):
+    """Scroll the virtualized list and drain newly rendered rows until the pacer says stop."""
+    # Recommended rows are not part of the declared count, so it only bounds the main list
+    declared = None
+    if not include_recommended:
+        try:
+            declared = _parse_declared_count(await page.evaluate(DECLARED_COUNT_JS))
+        except Exception:
+            pass
+    pacer = ScrollPacer(declared)
+
+    await page.evaluate(HARVEST_OBSERVER_JS, include_recommended)
+    first = True
+    while True:
+        # Only rows first seen since the last tick (deduped page-side, and against any JSON rows)
+        rows = [row for row in map(_dom_row, await page.evaluate(HARVEST_DRAIN_JS))
+                if track_key(row) not in seen_keys]
+        total += len(rows)
+        if not first:
+            pacer.observe(len(rows))
+        reason = pacer.stop_reason(total)
+        if rows or first or reason:
+            first = False
+            yield HarvestBatch(rows, total, playlist_name, declared, reason, scroll_ticks=pacer.ticks)
+        if reason:
+            break
+        await page.evaluate(_SCROLL_JS, include_recommended)
+        await page.mouse.wheel(0, pacer.step)
+        await asyncio.sleep(pacer.wait)
+
+
+# ── Harvest worker process ─────────────────────────────────────
+# Optional: Playwright, page JSON and row dedupe run in a child process that owns the BrowserPool.
+# Requests go down stdin and compact batches come back up stdout, one JSON line each, so the
+# parent's event loop (Textual + ingestion) only decodes small records.
+ROW_FIELDS = ("artist", "title", "duration", "duration_ms", "track_id")
+WORKER_FLAG = "--harvest-worker"
+WORKER_LINE_LIMIT = 16 * 1024 * 1024
+WORKER_STDERR_TAIL = 20
+
+
+def encode_batch(request_id: int, batch: HarvestBatch) -> str:
+    return json.dumps({
+        "id": request_id,
+        "rows": [[row.get(f) for f in ROW_FIELDS] for row in batch.tracks],
+        "total": batch.total, "name": batch.playlist_name, "declared": batch.declared_total,
+        "stop": batch.stop_reason, "route": batch.route_report, "strategy": batch.strategy,
+        "ticks": batch.scroll_ticks,
+    }, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_batch(msg: dict) -> HarvestBatch:
+    tracks = [{f: v for f, v in zip(ROW_FIELDS, row) if v is not None or f in ROW_FIELDS[:3]}
+              for row in msg["rows"]]
+    return HarvestBatch(tracks, msg["total"], msg["name"], msg["declared"], msg["stop"],
+                        msg["route"], msg["strategy"], msg.get("ticks", 0))
+
+
+def _write_stdout_line(line: str) -> None:
+    # Bytes, not text: the console code page must not decide whether a track title survives
+    sys.stdout.buffer.write(line.encode("utf-8") + b"\n")
+    sys.stdout.buffer.flush()
+
+
+async def _serve_worker(stdin_readline=None, write=None) -> None:
+    """Child side: one request per stdin line, batches tagged with the request id on stdout."""
+    stdin_readline = stdin_readline or sys.stdin.readline
+    write = write or _write_stdout_line
+    tasks: dict[int, asyncio.Future] = {}
+
+    async def serve(req: dict) -> None:
+        rid = req["id"]
+        try:
+            async for batch in harvest_playlist(req["url"], req.get("include_recommended", False),
+                                                strategy=req.get("strategy", "json"),
+                                                embed_base_url=req.get("embed_base_url", EMBED_BASE_URL)):
+                write(encode_batch(rid, batch))
+            write(json.dumps({"id": rid, "done": True}))
+        except Exception as e:
+            write(json.dumps({"id": rid, "error": f"{type(e).__name__}: {e}"}))
+
+    try:
+        while True:
+            line = await asyncio.to_thread(stdin_readline)
+            if not line:
+                break  # parent went away
+            try:
+                req = json.loads(line)
+            except ValueError:
+                continue
+            if req.get("shutdown"):
+                break
+            if "cancel" in req:
+                # Parent stopped listening (e.g. incremental refresh hit known rows): stop scrolling
+                task = tasks.get(req["cancel"])
+                if task:
+                    task.cancel()
+                continue
+            rid = req["id"]
+            tasks[rid] = asyncio.ensure_future(serve(req))
+            tasks[rid].add_done_callback(lambda _t, rid=rid: tasks.pop(rid, None))
+        for task in list(tasks.values()):
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+    finally:
+        await shutdown_browser_pool()
+
+
+def run_worker() -> int:
+    asyncio.run(_serve_worker())
+    return 0
+
+
+def worker_command() -> list[str]:
+    if getattr(sys, "frozen", False):
+        # PyInstaller build: the app binary dispatches WORKER_FLAG before anything else
+        return [sys.executable, WORKER_FLAG]
+    return [sys.executable, str(Path(__file__).resolve()), WORKER_FLAG]
+
+
+class HarvestWorker:
+    """Parent side: a long-lived child process multiplexing concurrent harvests by request id."""
+
+    def __init__(self, command: list[str] | None = None):
+        self.command = command or worker_command()
+        self._proc = None
+        self._reader = None
+        self._stderr_reader = None
+        self._stderr_tail: deque[str] = deque(maxlen=WORKER_STDERR_TAIL)
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._next_id = 0
+        self._start_lock = None
+        self._loop = None
+
+    async def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._start_lock, self._proc = loop, asyncio.Lock(), None
+        async with self._start_lock:
+            if self._proc is not None and self._proc.returncode is None:
+                return
+            self._proc = await asyncio.create_subprocess_exec(
+                *self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE, limit=WORKER_LINE_LIMIT,
+            )
+            self._stderr_tail.clear()
+            self._stderr_reader = asyncio.ensure_future(self._drain_stderr(self._proc))
+            self._reader = asyncio.ensure_future(self._read_loop(self._proc))
+
+    async def _drain_stderr(self, proc) -> None:
+        # Keep the pipe empty so the child never blocks on it; remember the tail for exit errors
+        while True:
+            line = await proc.stderr.readline()
+            if not line:
+                return
+            self._stderr_tail.append(line.decode("utf-8", "replace").rstrip())
+
+    async def _exit_error(self) -> str:
+        """'harvest worker exited', with the child's last stderr lines when it left any."""
+        if self._stderr_reader is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._stderr_reader), 2.0)
+            except Exception:
+                pass
+        tail = "\n".join(line for line in self._stderr_tail if line)
+        return f"harvest worker exited:\n{tail}" if tail else "harvest worker exited"
+
+    async def _read_loop(self, proc) -> None:
+        try:
+            while True:
+                line = await proc.stdout.readline()
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                queue = self._queues.get(msg.get("id"))
+                if queue is not None:
+                    queue.put_nowait(msg)
+        finally:
+            # Worker exited: fail every harvest still waiting on it
+            error = await self._exit_error()
+            for queue in self._queues.values():
+                queue.put_nowait({"error": error})
+
+    async def harvest(self, url: str, include_recommended: bool = False, strategy: str = "json",
+                      embed_base_url: str = EMBED_BASE_URL):
+        """Same HarvestBatch stream as harvest_playlist, produced in the worker process."""
+        await self._ensure_started()
+        self._next_id += 1
+        rid = self._next_id
+        queue = self._queues[rid] = asyncio.Queue()
+        finished = False
+        try:
+            req = {"id": rid, "url": url, "include_recommended": include_recommended, "strategy": strategy,
+                   "embed_base_url": embed_base_url}
+            try:
+                self._proc.stdin.write((json.dumps(req) + "\n").encode())
+                await self._proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                raise RuntimeError(await self._exit_error())
+            while True:
+                msg = await queue.get()
+                if "error" in msg:
+                    finished = True
+                    raise RuntimeError(msg["error"])
+                if msg.get("done"):
+                    finished = True
+                    return
+                yield decode_batch(msg)
+        finally:
+            self._queues.pop(rid, None)
+            if not finished and self._proc is not None and self._proc.returncode is None:
+                try: self._proc.stdin.write((json.dumps({"cancel": rid}) + "\n").encode())
+                except: pass
+
+    async def close(self, timeout: float = 5.0) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.returncode is None:
+            try:
+                proc.stdin.write(b'{"shutdown": true}\n')
+                await proc.stdin.drain()
+                await asyncio.wait_for(proc.wait(), timeout)
+            except Exception:
+                try: proc.kill()
+                except: pass
+                await proc.wait()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self._stderr_reader is not None:
+            await asyncio.gather(self._stderr_reader, return_exceptions=True)
+            self._stderr_reader = None
+
+
+_HARVEST_WORKER: HarvestWorker | None = None
+
+def get_harvest_worker() -> HarvestWorker:
+    global _HARVEST_WORKER
+    if _HARVEST_WORKER is None:
+        _HARVEST_WORKER = HarvestWorker()
+    return _HARVEST_WORKER
+
+async def shutdown_harvest_worker() -> None:
+    if _HARVEST_WORKER is not None:
+        await _HARVEST_WORKER.close()
+
+
+def open_harvest(url: str, include_recommended: bool = False, strategy: str = "json", in_worker: bool = False):
+    """harvest_playlist in this process, or streamed from the harvest worker process."""
+    if in_worker:
+        return get_harvest_worker().harvest(url, include_recommended, strategy)
+    return harvest_playlist(url, include_recommended, strategy=strategy)
+
+
+# ── Harvest cache ──────────────────────────────────────────────
+KNOWN_RUN = 5  # consecutive rows matching the cached order before a refresh trusts the rest
+
+
+def harvest_cache_key(url: str, include_recommended: bool = False) -> str | None:
+    """Canonical playlist ID (``?si=`` and other query noise ignored); recommended rows are a separate list."""
+    playlist_id = playlist_id_from_url(url)
+    if not playlist_id:
+        return None
+    return playlist_id + (":recommended" if include_recommended else "")
+
+
+_row_key = track_key
+
+
+# Stops that mean the whole playlist was seen; a short stall or an undeclared-but-unfinished list is not cached
+WHOLE_PLAYLIST_STOPS = frozenset({STOP_DECLARED_COUNT, STOP_JSON_COMPLETE, STOP_EMBED_COMPLETE})
+
+
+def _is_whole_playlist(batch: HarvestBatch) -> bool:
+    if batch.stop_reason in WHOLE_PLAYLIST_STOPS:
+        return True
+    return batch.stop_reason == STOP_STALLED and not batch.declared_total
+
+
+async def cached_harvest(url: str, include_recommended: bool = False, strategy: str = "json",
+                         in_worker: bool = False, cache: HarvestCache | None = None, refresh: bool = False):
+    """open_harvest behind the persistent harvest cache.
+
+    A fresh entry is served instantly as one "cache hit" batch. Otherwise (stale, or ``refresh``)
+    the playlist is re-harvested from the top; once KNOWN_RUN consecutive rows line up with the
+    cached list, and the declared count agrees, the cached remainder is spliced in and scrolling
+    stops. Only whole playlists are written back (see WHOLE_PLAYLIST_STOPS).
+    """
+    key = harvest_cache_key(url, include_recommended)
+    if key is None:
+        async for batch in open_harvest(url, include_recommended, strategy, in_worker):
+            yield batch
+        return
+    cache = cache or get_harvest_cache()
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry and not refresh and cache.is_fresh(entry):
+        tracks = entry["tracks"]
+        yield HarvestBatch(tracks, len(tracks), entry["name"] or "Unknown Playlist", len(tracks),
+                           STOP_CACHE_HIT, strategy="cache")
+        return
+
+    known = entry["tracks"] if entry else []
+    known_pos = {}
+    for i, row in enumerate(known):
+        known_pos.setdefault(_row_key(row), i)
+    harvested, harvested_keys = [], set()
+    name = "Unknown Playlist"
+    run, last_pos = 0, -1
+    complete = False
+    gen = open_harvest(url, include_recommended, strategy, in_worker)
+    try:
+        async for batch in gen:
+            name = batch.playlist_name
+            fresh, splice = [], None
+            for row in batch.tracks:
+                fresh.append(row)
+                harvested.append(row)
+                harvested_keys.add(_row_key(row))
+                pos = known_pos.get(_row_key(row))
+                if pos is None:
+                    run = 0
+                elif run and pos == last_pos + 1:
+                    run += 1
+                else:
+                    run = 1
+                last_pos = pos if pos is not None else -1
+                if run >= KNOWN_RUN:
+                    remainder = [r for r in known[pos + 1:] if _row_key(r) not in harvested_keys]
+                    # Without a declared count (a truncated embed batch never has one) rows appended
+                    # since the last sync would be silently dropped, so keep harvesting instead
+                    if batch.declared_total is not None and len(harvested) + len(remainder) == batch.declared_total:
+                        splice = remainder
+                        break
+            if splice is not None:
+                harvested += splice
+                yield HarvestBatch(fresh + splice, len(harvested), name, batch.declared_total,
+                                   STOP_KNOWN_ROWS, batch.route_report, batch.strategy, batch.scroll_ticks)
+                complete = True
+                break
+            yield HarvestBatch(fresh, len(harvested), name, batch.declared_total, batch.stop_reason,
+                               batch.route_report, batch.strategy, batch.scroll_ticks)
+            complete = _is_whole_playlist(batch)
+    finally:
+        # Stops the scroll loop (or the worker's request) when the refresh ended early
+        await gen.aclose()
+    if complete and harvested:
+        await asyncio.to_thread(cache.put, key, name, harvested)
+
+
+async def scrape_playlist_data(url: str, include_recommended: bool = False,
+                               strategy: str = "json", in_worker: bool = False,
+                               refresh: bool = False) -> tuple[str, list[dict]]:
+    """Collect a whole playlist — returns (playlist_name, [{artist, title, duration}, ...]).
+
+    Keeps whatever was harvested before a mid-scroll failure, like the old one-shot scraper.
+    """
+    playlist_name = "Unknown Playlist"
+    tracks = []
+    try:
+        async for batch in cached_harvest(url, include_recommended, strategy, in_worker, refresh=refresh):
+            playlist_name = batch.playlist_name
+            tracks.extend(batch.tracks)
+    except Exception:
+        pass
+    return playlist_name, tracks
+
+
+if __name__ == "__main__" and WORKER_FLAG in sys.argv:
+    sys.exit(run_worker())
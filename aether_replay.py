@@ -0,0 +1,412 @@
+"""Aether scraper replay harness — record Spotify pages once, harvest them offline forever.
+
+Importable without Textual.
+
+    python aether_replay.py record <playlist-url> <capture-dir>   # live: HAR + embed page
+    python aether_replay.py replay <capture-dir>                  # offline harvest of a capture
+    python aether_replay.py bench [--sizes 100 1000 10000]        # synthetic fixtures, all strategies
+    python aether_replay.py ydl [--query "artist title"]          # fresh vs pooled YoutubeDL per call
+    python aether_replay.py ydl --query "..." --profiles search search_flat   # full vs flat search
+
+Captures replay through Playwright's HAR router, so every host the web player touched is served
+from disk. Benchmarks use FixtureServer, a local stand-in for the playlist page (virtualized
+list + paged pathfinder JSON) and the embed page, generated at any size.
+"""
+import argparse
+import asyncio
+import json
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from aether_engine import YDL_PROFILES, YdlPool, _lazy_import
+from aether_harvest import (
+    EMBED_BASE_URL, EMBED_TRACK_LIMIT, BrowserPool, _fetch_embed_html, harvest_playlist,
+    playlist_id_from_url,
+)
+
+# ARCHITECT: MATTHEW BUBB (SOLE PROGRAMMER)
+# ==============================================================================
+
+BENCH_SIZES = (100, 1000, 10000)
+BENCH_STRATEGIES = ("embed", "json", "dom")
+FIXTURE_ID_PREFIX = "AetherBench"
+PAGE_FETCH_LIMIT = 50  # rows per pathfinder call the fixture page itself makes, like the web player
+
+
+# ── Synthetic fixtures ─────────────────────────────────────────
+def fixture_id(size: int) -> str:
+    return f"{FIXTURE_ID_PREFIX}{size:08d}"
+
+
+def fixture_track(i: int) -> dict:
+    """Deterministic pathfinder track item #i."""
+    return {"__typename": "Track", "name": f"Bench Track {i}", "uri": f"spotify:track:bench{i:017d}",
+            "artists": {"items": [{"profile": {"name": f"Bench Artist {i % 97}"}}]},
+            "trackDuration": {"totalMilliseconds": (120 + (i * 37) % 240) * 1000}}
+
+
+def fixture_pathfinder(size: int, offset: int, limit: int) -> dict:
+    items = [{"itemV2": {"data": fixture_track(i)}} for i in range(offset, min(size, offset + limit))]
+    return {"data": {"playlistV2": {"name": f"Bench {size}", "content": {
+        "items": items, "totalCount": size, "pagingInfo": {"offset": offset, "limit": limit}}}}}
+
+
+def fixture_embed_html(size: int) -> str:
+    track_list = []
+    for i in range(min(size, EMBED_TRACK_LIMIT)):
+        t = fixture_track(i)
+        track_list.append({"uri": t["uri"], "uid": f"u{i}", "title": t["name"],
+                           "subtitle": t["artists"]["items"][0]["profile"]["name"],
+                           "duration": t["trackDuration"]["totalMilliseconds"], "entityType": "track"})
+    data = {"props": {"pageProps": {"state": {"data": {"entity": {
+        "type": "playlist", "name": f"Bench {size}", "id": fixture_id(size), "trackList": track_list}}}}}}
+    return ('<!DOCTYPE html><html><head><title>Spotify Embed</title></head><body><div id="__next"></div>'
+            f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></body></html>')
+
+
+# Virtualized like the web player: ~40 rows in the DOM at once, next page fetched near the end
+_PLAYLIST_PAGE = """<!DOCTYPE html><html><head><meta charset="utf-8">
+<title>Bench __SIZE__ - playlist by aether | Spotify</title>
+<meta name="music:song_count" content="__SIZE__">
+<style>body{margin:0}[data-testid="tracklist-row"]{height:56px;display:flex;gap:8px}</style></head>
+<body><div data-testid="playlist-page">
+<div data-testid="entity-header" style="height:300px"><h1>Bench __SIZE__</h1><span>__SIZE__ songs, about 10 hr</span></div>
+<div data-testid="playlist-tracklist" style="position:relative"><div id="spacer"></div><div id="rows" style="position:absolute;left:0;right:0"></div></div>
+</div><script>
+const TOTAL = __SIZE__, ROW_H = 56, WINDOW = 40, LIMIT = __LIMIT__;
+const items = []; let loading = false;
+document.getElementById("spacer").style.height = (TOTAL * ROW_H) + "px";
+const clock = ms => { const s = Math.round(ms / 1000); return Math.floor(s / 60) + ":" + String(s % 60).padStart(2, "0"); };
+async function load(offset) {
+    loading = true;
+    const v = encodeURIComponent(JSON.stringify({uri: "spotify:playlist:__ID__", offset: offset, limit: LIMIT}));
+    const r = await fetch("/pathfinder/v1/query?operationName=fetchPlaylist&variables=" + v);
+    const c = (await r.json()).data.playlistV2.content;
+    for (const it of c.items) items.push(it.itemV2.data);
+    loading = false;
+    render();
+}
+function render() {
+    const list = document.querySelector('[data-testid="playlist-tracklist"]');
+    const first = Math.max(0, Math.floor((window.scrollY - list.offsetTop) / ROW_H) - 5);
+    const last = Math.min(items.length, first + WINDOW);
+    const rows = document.getElementById("rows");
+    rows.style.top = (first * ROW_H) + "px";
+    let html = "";
+    for (let i = first; i < last; i++) {
+        const t = items[i], a = t.artists.items[0].profile.name;
+        html += '<div data-testid="tracklist-row" role="row">'
+              + '<a data-testid="internal-track-link" href="/track/' + t.uri.split(":").pop() + '"><div dir="auto">' + t.name + '</div></a>'
+              + '<a href="/artist/' + i + '">' + a + '</a>'
+              + '<div data-testid="tracklist-row-duration">' + clock(t.trackDuration.totalMilliseconds) + '</div></div>';
+    }
+    rows.innerHTML = html;
+    if (last >= items.length - 10 && items.length < TOTAL && !loading) load(items.length);
+}
+window.addEventListener("scroll", render, {passive: true});
+load(0);
+</script></body></html>"""
+
+
+class FixtureServer:
+    """Local HTTP stand-in for open.spotify.com serving synthetic playlists of any size.
+
+    /playlist/<id>, /pathfinder/v1/query and /embed/playlist/<id>; ``latency`` delays the JSON.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._server = None
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def embed_base(self) -> str:
+        return self.base + "/embed/playlist/"
+
+    def playlist_url(self, size: int) -> str:
+        return f"{self.base}/playlist/{fixture_id(size)}?si=bench"
+
+    def _route(self, path: str, query: dict) -> tuple[int, str, str]:
+        m = re.fullmatch(r"/(embed/)?playlist/" + FIXTURE_ID_PREFIX + r"(\d+)", path)
+        if m:
+            size = int(m.group(2))
+            if m.group(1):
+                return 200, "text/html; charset=utf-8", fixture_embed_html(size)
+            page = (_PLAYLIST_PAGE.replace("__SIZE__", str(size)).replace("__ID__", fixture_id(size))
+                    .replace("__LIMIT__", str(PAGE_FETCH_LIMIT)))
+            return 200, "text/html; charset=utf-8", page
+        if path == "/pathfinder/v1/query":
+            variables = json.loads(query.get("variables") or "{}")
+            size = int(variables.get("uri", "").rsplit(FIXTURE_ID_PREFIX, 1)[-1] or 0)
+            if self.latency:
+                time.sleep(self.latency)
+            payload = fixture_pathfinder(size, int(variables.get("offset", 0)), int(variables.get("limit", 25)))
+            return 200, "application/json", json.dumps(payload)
+        return 404, "text/plain", "not found"
+
+    def __enter__(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                status, ctype, body = server._route(parts.path, dict(parse_qsl(parts.query)))
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _EmbedDirServer:
+    """Serves <dir>/<id>.html at /embed/playlist/<id> for replaying a capture's embed page."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def __enter__(self):
+        directory = self.directory
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                page = directory / (self.path.split("?")[0].rsplit("/", 1)[-1] + ".html")
+                if not self.path.startswith("/embed/playlist/") or not page.exists():
+                    self.send_error(404)
+                    return
+                data = page.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.embed_base = f"http://127.0.0.1:{self._server.server_address[1]}/embed/playlist/"
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ── Measurement ────────────────────────────────────────────────
+async def measure_harvest(url: str, **harvest_kwargs) -> dict:
+    """One harvest_playlist run → rows, seconds, rows/sec, scroll iterations, stop reason."""
+    t0 = time.perf_counter()
+    rows = ticks = 0
+    stop = strategy = None
+    async for batch in harvest_playlist(url, **harvest_kwargs):
+        rows = batch.total
+        ticks = max(ticks, batch.scroll_ticks)
+        stop, strategy = batch.stop_reason or stop, batch.strategy
+    seconds = time.perf_counter() - t0
+    return {"rows": rows, "seconds": round(seconds, 3), "rows_per_sec": round(rows / seconds, 1) if seconds else 0,
+            "scroll_iterations": ticks, "stop_reason": stop, "final_strategy": strategy}
+
+
+async def bench_harvest(sizes=BENCH_SIZES, strategies=BENCH_STRATEGIES, latency: float = 0.02) -> list[dict]:
+    """Harvest every synthetic fixture size with every strategy on one pooled browser."""
+    results = []
+    profile = Path(tempfile.mkdtemp(prefix="aether-bench-"))
+    pool = BrowserPool(max_pages=1, profile_dir=profile, allow_hosts=("127.0.0.1",))
+    try:
+        with FixtureServer(latency) as server:
+            for size in sizes:
+                for strategy in strategies:
+                    result = await measure_harvest(
+                        server.playlist_url(size), pool=pool,
+                        strategy="dom" if strategy == "dom" else "json",
+                        embed_first=strategy == "embed", embed_base_url=server.embed_base,
+                    )
+                    results.append({"size": size, "strategy": strategy, **result})
+    finally:
+        await pool.close()
+        shutil.rmtree(profile, ignore_errors=True)
+    return results
+
+
+# ── yt-dlp instance reuse ──────────────────────────────────────
+def _ydl_call(ydl, query: str | None) -> None:
+    if query:
+        ydl.extract_info(f"ytsearch5:{query}", download=False)
+    else:
+        # Offline stand-in for a call: the extractors every search/download touches
+        ydl.get_info_extractor("YoutubeSearch")
+        ydl.get_info_extractor("Youtube")
+
+
+def bench_ydl(calls: int = 40, threads: int = 4, query: str | None = None,
+              profiles=("search", "download")) -> list[dict]:
+    """Per-call cost of a fresh YoutubeDL per call (the old path) vs this thread's pooled instance.
+
+    Without ``query`` only setup is measured (no network); with it, real ``ytsearch5`` calls.
+    """
+    yt_dlp = _lazy_import("yt_dlp")
+    cache_dir = Path(tempfile.mkdtemp(prefix="aether-ydl-"))
+    results = []
+    try:
+        for profile in profiles:
+            opts = {**YDL_PROFILES[profile], "cachedir": str(cache_dir)}
+            pool = YdlPool(cache_dir)
+
+            def fresh(_):
+                with yt_dlp.YoutubeDL(opts) as ydl:
+                    _ydl_call(ydl, query)
+
+            def pooled(_):
+                _ydl_call(pool.get(profile), query)
+
+            for mode, fn in (("fresh", fresh), ("pooled", pooled)):
+                with ThreadPoolExecutor(threads) as executor:
+                    t0 = time.perf_counter()
+                    list(executor.map(fn, range(calls)))
+                    seconds = time.perf_counter() - t0
+                results.append({"profile": profile, "mode": mode, "calls": calls, "seconds": round(seconds, 3),
+                                "ms_per_call": round(seconds * 1000 * threads / calls, 2),
+                                "instances": calls if mode == "fresh" else pool.created})
+            pool.close()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def print_ydl_results(rows: list[dict], out=None) -> None:
+    out = out or sys.stdout
+    header = f"{'PROFILE':<11} {'MODE':<7} {'CALLS':>6} {'SECONDS':>8} {'MS/CALL':>8} {'INSTANCES':>9}"
+    out.write(header + "\n" + "-" * len(header) + "\n")
+    for r in rows:
+        out.write(f"{r['profile']:<11} {r['mode']:<7} {r['calls']:>6} {r['seconds']:>8.2f} "
+                  f"{r['ms_per_call']:>8.2f} {r['instances']:>9}\n")
+
+
+# ── Record / replay of live pages ──────────────────────────────
+async def record_playlist(url: str, capture_dir: Path, strategy: str = "dom") -> dict:
+    """Harvest ``url`` live with HAR recording on; saves playlist.har, embed/<id>.html, capture.json."""
+    capture_dir = Path(capture_dir)
+    playlist_id = playlist_id_from_url(url)
+    (capture_dir / "embed").mkdir(parents=True, exist_ok=True)
+    if playlist_id:
+        try:
+            html = await asyncio.to_thread(_fetch_embed_html, EMBED_BASE_URL + playlist_id)
+            (capture_dir / "embed" / f"{playlist_id}.html").write_text(html, encoding="utf-8")
+        except Exception:
+            pass
+    pool = BrowserPool(max_pages=1, profile_dir=capture_dir / "profile",
+                       har_path=capture_dir / "playlist.har", har_mode="record")
+    try:
+        result = await measure_harvest(url, pool=pool, strategy=strategy, embed_first=False)
+    finally:
+        await pool.close()  # flushes the HAR
+        shutil.rmtree(capture_dir / "profile", ignore_errors=True)
+    manifest = {"url": url, "playlist_id": playlist_id, "strategy": strategy,
+                "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "live": result}
+    (capture_dir / "capture.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+async def replay_capture(capture_dir: Path, strategies=BENCH_STRATEGIES) -> list[dict]:
+    """Harvest a recorded capture offline (HAR router + local embed server) with each strategy."""
+    capture_dir = Path(capture_dir)
+    manifest = json.loads((capture_dir / "capture.json").read_text(encoding="utf-8"))
+    results = []
+    profile = Path(tempfile.mkdtemp(prefix="aether-replay-"))
+    pool = BrowserPool(max_pages=1, profile_dir=profile, har_path=capture_dir / "playlist.har", har_mode="replay")
+    try:
+        with _EmbedDirServer(capture_dir / "embed") as embed:
+            for strategy in strategies:
+                result = await measure_harvest(
+                    manifest["url"], pool=pool, strategy="dom" if strategy == "dom" else "json",
+                    embed_first=strategy == "embed", embed_base_url=embed.embed_base,
+                )
+                results.append({"capture": capture_dir.name, "strategy": strategy, **result})
+    finally:
+        await pool.close()
+        shutil.rmtree(profile, ignore_errors=True)
+    return results
+
+
+def print_results(rows: list[dict], out=None) -> None:
+    out = out or sys.stdout
+    header = f"{'FIXTURE':>10}  {'STRATEGY':<8} {'ROWS':>6} {'SECONDS':>8} {'ROWS/S':>9} {'SCROLLS':>7}  STOP"
+    out.write(header + "\n" + "-" * len(header) + "\n")
+    for r in rows:
+        label = str(r.get("size", r.get("capture", "")))
+        out.write(f"{label:>10}  {r['strategy']:<8} {r['rows']:>6} {r['seconds']:>8.2f} "
+                  f"{r['rows_per_sec']:>9.1f} {r['scroll_iterations']:>7}  {r['stop_reason']}\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Record, replay and benchmark the playlist harvester")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record", help="Capture a live playlist page to a HAR")
+    rec.add_argument("url")
+    rec.add_argument("capture_dir")
+    rec.add_argument("--strategy", choices=("json", "dom"), default="dom")
+    rep = sub.add_parser("replay", help="Harvest a capture offline")
+    rep.add_argument("capture_dir")
+    rep.add_argument("--strategies", nargs="+", choices=BENCH_STRATEGIES, default=list(BENCH_STRATEGIES))
+    bench = sub.add_parser("bench", help="Benchmark synthetic fixtures")
+    bench.add_argument("--sizes", nargs="+", type=int, default=list(BENCH_SIZES))
+    bench.add_argument("--strategies", nargs="+", choices=BENCH_STRATEGIES, default=list(BENCH_STRATEGIES))
+    bench.add_argument("--latency", type=float, default=0.02, help="Seconds added to every JSON response")
+    ydl = sub.add_parser("ydl", help="Benchmark fresh vs pooled YoutubeDL instances")
+    ydl.add_argument("--calls", type=int, default=40)
+    ydl.add_argument("--threads", type=int, default=4)
+    ydl.add_argument("--query", help="Run real ytsearch5 queries (needs network); default measures setup only")
+    ydl.add_argument("--profiles", nargs="+", choices=sorted(YDL_PROFILES), default=["search", "download"],
+                     help="With --query, compare 'search' (full) against 'search_flat'")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "ydl":
+        rows = bench_ydl(args.calls, args.threads, args.query, args.profiles)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print_ydl_results(rows)
+        return 0
+
+    if args.cmd == "record":
+        result = asyncio.run(record_playlist(args.url, Path(args.capture_dir), args.strategy))
+        print(json.dumps(result, indent=2))
+        return 0
+    if args.cmd == "replay":
+        rows = asyncio.run(replay_capture(Path(args.capture_dir), args.strategies))
+    else:
+        rows = asyncio.run(bench_harvest(args.sizes, args.strategies, args.latency))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_results(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""Aether persistent stores — SQLite tables under the AppData directory.
+
+Importable without Textual. Each store opens a short-lived connection per call, so the
+TUI, headless runs and the harvest worker process can share one database file safely.
+"""
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# ARCHITECT: MATTHEW BUBB (SOLE PROGRAMMER)
+# ==============================================================================
+
+# Same AppData root as the dependency manifest and the browser profile
+STORE_DIR = Path.home() / "AppData" / "Local" / "AetherArchivist"
+STORE_PATH = STORE_DIR / "aether_store.sqlite3"
+
+HARVEST_CACHE_TTL = 12 * 3600  # a nightly re-sync always finds yesterday's harvest stale
+
+
+@contextmanager
+def _session(path: Path, schema: str | None = None):
+    """One transaction on a fresh connection; commits on success, always closes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=10)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        if schema:
+            conn.executescript(schema)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+# ── Harvest cache ──────────────────────────────────────────────
+class HarvestCache:
+    """Harvested track lists per canonical playlist key, with a timestamp for the TTL check."""
+
+    SCHEMA = """CREATE TABLE IF NOT EXISTS harvest_cache (
+        playlist_key TEXT PRIMARY KEY,
+        name TEXT,
+        tracks TEXT NOT NULL,
+        harvested_at REAL NOT NULL);"""
+
+    def __init__(self, path: Path = STORE_PATH, ttl: float = HARVEST_CACHE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._ready = False
+
+    @contextmanager
+    def _conn(self):
+        with _session(self.path, None if self._ready else self.SCHEMA) as conn:
+            self._ready = True
+            yield conn
+
+    def get(self, key: str) -> dict | None:
+        """{name, tracks, harvested_at, age} or None. Stale entries are still returned (see is_fresh)."""
+        try:
+            with self._conn() as conn:
+                row = conn.execute("SELECT name, tracks, harvested_at FROM harvest_cache WHERE playlist_key = ?",
+                                   (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row:
+            return None
+        return {"name": row[0], "tracks": json.loads(row[1]), "harvested_at": row[2],
+                "age": time.time() - row[2]}
+
+    def is_fresh(self, entry: dict | None) -> bool:
+        return bool(entry) and entry["age"] < self.ttl
+
+    def put(self, key: str, name: str, tracks: list[dict]) -> None:
+        try:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO harvest_cache VALUES (?, ?, ?, ?)",
+                             (key, name, json.dumps(tracks, ensure_ascii=False), time.time()))
+        except sqlite3.Error:
+            pass
+
+    def forget(self, key: str) -> None:
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM harvest_cache WHERE playlist_key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+
+_HARVEST_CACHE: HarvestCache | None = None
+
+def get_harvest_cache() -> HarvestCache:
+    global _HARVEST_CACHE
+    if _HARVEST_CACHE is None:
+        _HARVEST_CACHE = HarvestCache()
+    return _HARVEST_CACHE
+
+
+# ── Search cache ───────────────────────────────────────────────
+SEARCH_CACHE_TTL = 7 * 24 * 3600   # uploads churn slowly; a week old search still ranks the same
+SEARCH_CACHE_MAX_ENTRIES = 20_000  # ~5 candidates each, a few KB per row after compaction
+
+# Everything scoring, download and tagging read from a yt-dlp entry; the rest (formats, etc.) is dropped
+CANDIDATE_FIELDS = ("id", "title", "duration", "view_count", "channel", "uploader", "channel_is_verified",
+                    "url", "webpage_url", "thumbnail", "upload_date")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def compact_candidate(entry: dict) -> dict:
+    return {k: entry[k] for k in CANDIDATE_FIELDS if entry.get(k) is not None}
+
+
+class SearchCache:
+    """yt-dlp search results per normalized query, with a TTL and least-recently-used eviction.
+
+    The row count is counted once, then kept up to date from this instance's own inserts and
+    deletes, so eviction needs no COUNT(*) per write. Hit/miss totals for the mission report are
+    kept by the caller (IngestEngine.search_stats).
+    """
+
+    SCHEMA = """CREATE TABLE IF NOT EXISTS search_cache (
+        query TEXT PRIMARY KEY,
+        results TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used REAL NOT NULL);
+        CREATE INDEX IF NOT EXISTS search_cache_lru ON search_cache (last_used);"""
+
+    def __init__(self, path: Path = STORE_PATH, ttl: float = SEARCH_CACHE_TTL,
+                 max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._rows: int | None = None
+        self._ready = False
+
+    @contextmanager
+    def _conn(self):
+        with _session(self.path, None if self._ready else self.SCHEMA) as conn:
+            self._ready = True
+            yield conn
+
+    def get(self, query: str) -> list[dict] | None:
+        """Cached candidates for the query, or None when absent or older than the TTL. Blocking."""
+        key, now = normalize_query(query), time.time()
+        try:
+            with self._conn() as conn:
+                row = conn.execute("SELECT results, created_at FROM search_cache WHERE query = ?",
+                                   (key,)).fetchone()
+                if row and now - row[1] >= self.ttl:
+                    conn.execute("DELETE FROM search_cache WHERE query = ?", (key,))
+                    if self._rows:
+                        self._rows -= 1
+                    row = None
+                if row:
+                    conn.execute("UPDATE search_cache SET last_used = ? WHERE query = ?", (now, key))
+        except sqlite3.Error:
+            row = None
+        if not row:
+            return None
+        return json.loads(row[0])
+
+    def put(self, query: str, results: list[dict]) -> None:
+        """Store compacted candidates, then evict least-recently-used rows beyond the size cap."""
+        now = time.time()
+        key = normalize_query(query)
+        payload = json.dumps([compact_candidate(r) for r in results], ensure_ascii=False)
+        try:
+            with self._conn() as conn:
+                if self._rows is None:
+                    self._rows = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+                updated = conn.execute("UPDATE search_cache SET results = ?, created_at = ?, last_used = ? "
+                                       "WHERE query = ?", (payload, now, now, key)).rowcount
+                if not updated:
+                    conn.execute("INSERT INTO search_cache VALUES (?, ?, ?, ?)", (key, payload, now, now))
+                    self._rows += 1
+                if self._rows > self.max_entries:
+                    self._rows -= conn.execute("DELETE FROM search_cache WHERE query IN "
+                                               "(SELECT query FROM search_cache ORDER BY last_used LIMIT ?)",
+                                               (self._rows - self.max_entries,)).rowcount
+        except sqlite3.Error:
+            self._rows = None  # unknown after a failed write; re-counted next time
+
+
+_SEARCH_CACHE: SearchCache | None = None
+
+def get_search_cache() -> SearchCache:
+    global _SEARCH_CACHE
+    if _SEARCH_CACHE is None:
+        _SEARCH_CACHE = SearchCache()
+    return _SEARCH_CACHE
+
+
+def configure_search_cache(ttl: float | None = None, max_entries: int | None = None) -> SearchCache:
+    """Apply --search-cache-* overrides to the shared instance."""
+    cache = get_search_cache()
+    if ttl is not None:
+        cache.ttl = ttl
+    if max_entries is not None:
+        cache.max_entries = max(max_entries, 1)
+    return cache
+
+
+# ── Negative cache ─────────────────────────────────────────────
+NO_MATCH_TTL = 30 * 24 * 3600  # re-runs skip known misses; a month later new uploads get a chance
+
+
+def track_signature(artist: str, title: str, seconds: float) -> str:
+    """Normalized artist/title plus rounded length — the same recording across playlists and re-runs."""
+    return f"{normalize_query(artist)}|{normalize_query(title)}|{round(seconds or 0)}"
+
+
+class NoMatchCache:
+    """Tracks whose whole query ladder came back without a usable candidate.
+
+    ``bypass`` (--retry-no-match) ignores stored verdicts for this run without deleting them.
+    """
+
+    SCHEMA = """CREATE TABLE IF NOT EXISTS no_match (
+        signature TEXT PRIMARY KEY,
+        artist TEXT,
+        title TEXT,
+        created_at REAL NOT NULL);"""
+
+    def __init__(self, path: Path = STORE_PATH, ttl: float = NO_MATCH_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.bypass = False
+        self._ready = False
+
+    @contextmanager
+    def _conn(self):
+        with _session(self.path, None if self._ready else self.SCHEMA) as conn:
+            self._ready = True
+            yield conn
+
+    def contains(self, signature: str) -> bool:
+        """True when the track is a known miss younger than the TTL. Blocking."""
+        if self.bypass:
+            return False
+        try:
+            with self._conn() as conn:
+                row = conn.execute("SELECT created_at FROM no_match WHERE signature = ?",
+                                   (signature,)).fetchone()
+                if row and time.time() - row[0] >= self.ttl:
+                    conn.execute("DELETE FROM no_match WHERE signature = ?", (signature,))
+                    row = None
+        except sqlite3.Error:
+            return False
+        return bool(row)
+
+    def add(self, signature: str, artist: str = "", title: str = "") -> None:
+        try:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO no_match VALUES (?, ?, ?, ?)",
+                             (signature, artist, title, time.time()))
+        except sqlite3.Error:
+            pass
+
+    def forget(self, signature: str) -> None:
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM no_match WHERE signature = ?", (signature,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> int:
+        """Drop every stored verdict (--forget-no-match); returns how many there were."""
+        try:
+            with self._conn() as conn:
+                return conn.execute("DELETE FROM no_match").rowcount
+        except sqlite3.Error:
+            return 0
+
+
+_NO_MATCH_CACHE: NoMatchCache | None = None
+
+def get_no_match_cache() -> NoMatchCache:
+    global _NO_MATCH_CACHE
+    if _NO_MATCH_CACHE is None:
+        _NO_MATCH_CACHE = NoMatchCache()
+    return _NO_MATCH_CACHE
+
+
+def configure_no_match_cache(ttl: float | None = None, bypass: bool = False) -> NoMatchCache:
+    """Apply --no-match-ttl / --retry-no-match to the shared instance."""
+    cache = get_no_match_cache()
+    if ttl is not None:
+        cache.ttl = ttl
+    cache.bypass = bypass
+    return cache
+
+
+# ── Resolved tracks ────────────────────────────────────────────
+class ResolvedTracks:
+    """The video each recording was matched to, automatically or by the user, reused by every later run.
+
+    ``bypass`` (--rematch) searches again for this run; the new decisions replace the stored ones.
+    """
+
+    SCHEMA = """CREATE TABLE IF NOT EXISTS resolved_tracks (
+        signature TEXT PRIMARY KEY,
+        video_id TEXT NOT NULL,
+        candidate TEXT NOT NULL,
+        source TEXT NOT NULL,
+        resolved_at REAL NOT NULL);"""
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self.bypass = False
+        self._ready = False
+
+    @contextmanager
+    def _conn(self):
+        with _session(self.path, None if self._ready else self.SCHEMA) as conn:
+            self._ready = True
+            yield conn
+
+    def get(self, signature: str) -> dict | None:
+        """The stored candidate ({id, url, title...}), or None. Blocking."""
+        if self.bypass:
+            return None
+        try:
+            with self._conn() as conn:
+                row = conn.execute("SELECT candidate FROM resolved_tracks WHERE signature = ?",
+                                   (signature,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row:
+            return None
+        return json.loads(row[0])
+
+    def put(self, signature: str, candidate: dict, source: str) -> None:
+        """source is "auto" (scored past the auto-accept bar) or "user" (picked in the resolver)."""
+        entry = compact_candidate(candidate)
+        try:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO resolved_tracks VALUES (?, ?, ?, ?, ?)",
+                             (signature, entry.get("id", ""), json.dumps(entry, ensure_ascii=False),
+                              source, time.time()))
+        except sqlite3.Error:
+            pass
+
+    def forget(self, signature: str) -> None:
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM resolved_tracks WHERE signature = ?", (signature,))
+        except sqlite3.Error:
+            pass
+
+
+_RESOLVED_TRACKS: ResolvedTracks | None = None
+
+def get_resolved_tracks() -> ResolvedTracks:
+    global _RESOLVED_TRACKS
+    if _RESOLVED_TRACKS is None:
+        _RESOLVED_TRACKS = ResolvedTracks()
+    return _RESOLVED_TRACKS
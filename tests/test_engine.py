@@ -0,0 +1,657 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# The engine has no Textual dependency, so it imports directly (no pre-import mocking)
+import aether_engine
+import aether_store
+from aether_engine import (
+    IngestEngine, TrackStatus, TrackComplete, TrackFailed, EngineLog,
+)
+
+
+def _candidate(video_id, title, duration=180, views=1_000_000, channel="Artist A"):
+    return {"id": video_id, "title": title, "duration": duration,
+            "view_count": views, "channel": channel, "url": f"https://yt/{video_id}"}
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch, tmp_path):
+    """Swap yt-dlp search/download for in-memory fakes and record calls."""
+    calls = {"search": [], "download": []}
+    catalogue = {}
+
+    async def fake_search(query):
+        calls["search"].append(query)
+        for key, results in catalogue.items():
+            if query.startswith(key):
+                return results
+        return []
+
+    def fake_download(url, out_stem, progress_hook=None):
+        calls["download"].append(url)
+        out_stem.with_suffix(".mp3").write_bytes(b"\x00" * 64)
+
+    monkeypatch.setattr(aether_engine, "perform_youtube_search", fake_search)
+    monkeypatch.setattr(aether_engine, "_download_audio", fake_download)
+    monkeypatch.setattr(aether_engine, "_fetch_art", lambda url: None)
+    monkeypatch.setattr(aether_store, "_SEARCH_CACHE", aether_store.SearchCache(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(aether_store, "_NO_MATCH_CACHE", aether_store.NoMatchCache(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(aether_store, "_RESOLVED_TRACKS", aether_store.ResolvedTracks(tmp_path / "store.sqlite3"))
+    return catalogue, calls
+
+
+def _collect(engine, tracks):
+    async def go():
+        return [e async for e in engine.run(tracks)]
+    return asyncio.run(go())
+
+
+class TestIngestEngine:
+    def test_happy_path_and_no_match(self, tmp_path, fake_pipeline):
+        catalogue, calls = fake_pipeline
+        catalogue["Artist A Song A"] = [_candidate("aaa", "Artist A - Song A (Official Audio)")]
+        tracks = [
+            {"artist": "Artist A", "title": "Song A", "duration": "3:00"},
+            {"artist": "Nobody", "title": "Nothing", "duration": "3:00"},
+        ]
+        events = _collect(IngestEngine(tmp_path, "Lib", concurrency=2), tracks)
+
+        done = [e for e in events if isinstance(e, TrackComplete)]
+        assert [e.index for e in done] == [0]
+        assert done[0].path == tmp_path / "Artist A - Song A.mp3"
+        assert done[0].path.exists()
+        assert any(isinstance(e, TrackStatus) and e.index == 1 and e.status == "NO MATCH" for e in events)
+        assert calls["download"] == ["https://yt/aaa"]
+
+    def test_already_archived_skips_search(self, tmp_path, fake_pipeline):
+        _, calls = fake_pipeline
+        (tmp_path / "Artist A - Song A.mp3").write_bytes(b"x")
+        events = _collect(IngestEngine(tmp_path, "Lib", concurrency=1),
+                          [{"artist": "Artist A", "title": "Song A", "duration": "3:00"}])
+        assert [e.status for e in events if isinstance(e, TrackStatus)] == ["ALREADY ARCHIVED"]
+        assert calls["search"] == []
+
+    def test_prematched_best_skips_search(self, tmp_path, fake_pipeline):
+        _, calls = fake_pipeline
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00",
+                 "youtube_best": _candidate("pre", "whatever")}
+        events = _collect(IngestEngine(tmp_path, "Lib", concurrency=1), [track])
+        assert calls["search"] == []
+        assert any(isinstance(e, TrackComplete) for e in events)
+
+    def test_download_failure_emits_track_failed(self, tmp_path, fake_pipeline, monkeypatch):
+        catalogue, _ = fake_pipeline
+        catalogue["Artist A"] = [_candidate("aaa", "Artist A - Song A")]
+        monkeypatch.setattr(aether_engine, "_download_audio", lambda *a, **k: None)
+        monkeypatch.setattr(aether_engine, "_write_failure_log", lambda entry: None)
+        monkeypatch.setattr(aether_engine.asyncio, "sleep", _no_sleep)
+        events = _collect(IngestEngine(tmp_path, "Lib", concurrency=1),
+                          [{"artist": "Artist A", "title": "Song A", "duration": "3:00"}])
+        failed = [e for e in events if isinstance(e, TrackFailed)]
+        assert len(failed) == 1 and failed[0].phase == "download"
+
+    def test_ambiguous_match_goes_to_resolver(self, tmp_path, fake_pipeline):
+        catalogue, _ = fake_pipeline
+        # Two marginal candidates (right title, 60s off, no views) -> below auto-accept
+        catalogue["Artist A"] = [
+            _candidate("w1", "Artist A - Song A", duration=240, views=0, channel="x"),
+            _candidate("w2", "Artist A Song A", duration=240, views=0, channel="y"),
+        ]
+        seen = []
+
+        async def resolver(index, track, candidates):
+            seen.append([c["id"] for c in candidates])
+            return candidates[-1]
+
+        engine = IngestEngine(tmp_path, "Lib", concurrency=1, resolver=resolver)
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00"}
+        best = asyncio.run(engine.match(0, track, log=lambda m: None))
+        assert len(seen) == 1 and sorted(seen[0]) == ["w1", "w2"]
+        assert best["id"] == seen[0][-1]
+
+    def test_submit_applies_backpressure(self, tmp_path, fake_pipeline):
+        async def go():
+            engine = IngestEngine(tmp_path, "Lib", concurrency=1, queue_size=1)
+            # Engine not started: the bounded queue holds one job, the second put must wait
+            await engine.submit(0, {"artist": "a", "title": "b", "duration": "1:00"})
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    engine.submit(1, {"artist": "c", "title": "d", "duration": "1:00"}), 0.05)
+        asyncio.run(go())
+
+    def test_logs_are_events(self, tmp_path, fake_pipeline, monkeypatch):
+        monkeypatch.setattr(aether_engine, "_write_failure_log", lambda entry: None)
+
+        async def boom(query):
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(aether_engine, "perform_youtube_search", boom)
+        events = _collect(IngestEngine(tmp_path, "Lib", concurrency=1),
+                          [{"artist": "Artist A", "title": "Song A", "duration": "3:00"}])
+        assert any(isinstance(e, EngineLog) and "SEARCH TIMEOUT" in e.message for e in events)
+
+    def test_match_cached_by_track_id(self, tmp_path, fake_pipeline):
+        catalogue, calls = fake_pipeline
+        catalogue["Artist A Song A"] = [_candidate("aaa", "Artist A - Song A (Official Audio)")]
+        engine = IngestEngine(tmp_path, "Lib", concurrency=1)
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00", "track_id": "t1"}
+
+        async def go():
+            first = await engine.match(0, track, log=lambda m: None)
+            # Same track in another playlist, listed with different text: still one search
+            again = await engine.match(5, {**track, "title": "Song A - Remastered"}, log=lambda m: None)
+            return first, again
+
+        first, again = asyncio.run(go())
+        assert first["id"] == again["id"] == "aaa"
+        assert len(calls["search"]) == 1
+
+    def test_repeat_run_served_from_search_cache(self, tmp_path, fake_pipeline):
+        catalogue, calls = fake_pipeline
+        catalogue["Artist A Song A"] = [_candidate("aaa", "Artist A - Song A (Official Audio)")]
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00"}
+        first, second = (IngestEngine(tmp_path, "Lib", concurrency=1) for _ in range(2))
+        asyncio.run(first.match(0, track, log=lambda m: None))
+        aether_store.get_resolved_tracks().forget(aether_engine._signature(track))  # force the ladder again
+        best = asyncio.run(second.match(0, track, log=lambda m: None))
+        assert best["id"] == "aaa" and len(calls["search"]) == 1
+        assert (first.search_stats["cache_hits"], first.search_stats["cache_misses"]) == (0, 1)
+        assert (second.search_stats["cache_hits"], second.search_stats["cache_misses"]) == (1, 0)
+
+    def test_resolved_track_skips_search_and_resolver(self, tmp_path, fake_pipeline):
+        catalogue, calls = fake_pipeline
+        catalogue["Artist A Song A"] = [
+            _candidate("w1", "Artist A - Song A", duration=240, views=0, channel="x"),
+            _candidate("w2", "Artist A Song A", duration=240, views=0, channel="y"),
+        ]
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00"}
+        asked = []
+
+        async def user_picks_second(index, track, candidates):
+            asked.append(index)
+            return candidates[1]
+
+        first = IngestEngine(tmp_path, "Lib", concurrency=1, resolver=user_picks_second)
+        chosen = asyncio.run(first.match(0, track, log=lambda m: None))
+        searched = len(calls["search"])
+        # Another playlist, another run: same answer, no search, no question
+        second = IngestEngine(tmp_path, "Lib", concurrency=1, resolver=user_picks_second)
+        again = asyncio.run(second.match(3, {**track, "title": "song a"}, log=lambda m: None))
+        assert again["id"] == chosen["id"] and asked == [0]
+        assert len(calls["search"]) == searched and second.search_stats["resolved_hits"] == 1
+
+    def test_failed_download_forgets_the_match(self, tmp_path, fake_pipeline, monkeypatch):
+        catalogue, calls = fake_pipeline
+        catalogue["Artist A Song A"] = [_candidate("aaa", "Artist A - Song A (Official Audio)")]
+        async def signal_loss(*args, **kwargs):
+            return None
+
+        monkeypatch.setattr(aether_engine, "_download_with_retry", signal_loss)
+        monkeypatch.setattr(aether_engine, "_write_failure_log", lambda entry: None)
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00", "track_id": "t1"}
+        engine = IngestEngine(tmp_path, "Lib", concurrency=1)
+        events = _collect(engine, [track])
+        assert any(isinstance(e, TrackFailed) for e in events)
+        assert engine._matches == {}
+        assert aether_store.get_resolved_tracks().get(aether_engine._signature(track)) is None
+
+    def test_unattended_guess_is_not_remembered(self, tmp_path, fake_pipeline):
+        catalogue, _ = fake_pipeline
+        catalogue["Artist A Song A"] = [
+            _candidate("w1", "Artist A - Song A", duration=240, views=0, channel="x"),
+            _candidate("w2", "Artist A Song A", duration=240, views=0, channel="y"),
+        ]
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00"}
+        assert asyncio.run(IngestEngine(tmp_path, "Lib", concurrency=1).match(0, track, log=lambda m: None))
+        assert aether_store.get_resolved_tracks().get(aether_engine._signature(track)) is None
+
+    def test_known_no_match_skips_search_on_rerun(self, tmp_path, fake_pipeline):
+        _, calls = fake_pipeline
+        track = {"artist": "Nobody", "title": "Nothing", "duration": "3:00"}
+        first, second = (IngestEngine(tmp_path, "Lib", concurrency=1) for _ in range(2))
+        assert asyncio.run(first.match(0, track, log=lambda m: None)) is None
+        searched = len(calls["search"])
+        # Same recording, different spelling of the text: still a known miss
+        assert asyncio.run(second.match(0, {**track, "artist": " nobody "}, log=lambda m: None)) is None
+        assert len(calls["search"]) == searched
+        assert (first.search_stats["no_match_skipped"], second.search_stats["no_match_skipped"]) == (0, 1)
+
+    def test_failed_searches_are_not_remembered(self, tmp_path, fake_pipeline, monkeypatch):
+        async def broken(query):
+            raise OSError("network down")
+        monkeypatch.setattr(aether_engine, "perform_youtube_search", broken)
+        engine = IngestEngine(tmp_path, "Lib", concurrency=1)
+        track = {"artist": "Nobody", "title": "Nothing", "duration": "3:00"}
+        assert asyncio.run(engine.match(0, track, log=lambda m: None)) is None
+        assert engine.search_stats["search_errors"] > 0
+        assert not aether_store.get_no_match_cache().contains(aether_engine._signature(track))
+
+    def test_retry_no_match_searches_again_and_forgets(self, tmp_path, fake_pipeline):
+        catalogue, calls = fake_pipeline
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00"}
+        no_match = aether_store.get_no_match_cache()
+        no_match.add(aether_engine._signature(track))
+        engine = IngestEngine(tmp_path, "Lib", concurrency=1)
+        assert asyncio.run(engine.match(0, track, log=lambda m: None)) is None and not calls["search"]
+        # The upload appeared since: --retry-no-match finds it and drops the stale verdict
+        catalogue["Artist A Song A"] = [_candidate("aaa", "Artist A - Song A (Official Audio)")]
+        no_match.bypass = True
+        assert asyncio.run(engine.match(0, track, log=lambda m: None))["id"] == "aaa"
+        no_match.bypass = False
+        assert not no_match.contains(aether_engine._signature(track))
+
+
+class TestHedgedSearch:
+    def _search(self, monkeypatch, answers, delay):
+        """answers: query prefix -> (seconds, results). Returns (candidates, started queries, stats)."""
+        started = []
+
+        async def fake_search(query):
+            started.append(query)
+            for key, (seconds, results) in answers.items():
+                if query.startswith(key):
+                    await asyncio.sleep(seconds)
+                    return results
+            return []
+
+        monkeypatch.setattr(aether_engine, "perform_youtube_search", fake_search)
+        monkeypatch.setattr(aether_engine, "_HEDGE_DELAY", delay)
+        stats = {"cache_hits": 0, "cache_misses": 0, "hedged_queries": 0, "coalesced_searches": 0}
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00"}
+        got = asyncio.run(aether_engine._search_candidates(track, stats=stats))
+        return got, started, stats
+
+    def test_slow_primary_is_hedged_and_cancelled(self, fake_pipeline, monkeypatch):
+        good = [_candidate("fast", "Artist A - Song A (Official Video)")]
+        got, started, stats = self._search(monkeypatch, {
+            "Artist A Song A official audio": (5.0, [_candidate("slow", "Artist A - Song A")]),
+            "Artist A Song A official video": (0.0, good),
+        }, delay=0.05)
+        assert [c["id"] for c in got] == ["fast"]
+        assert len(started) == 2 and stats["hedged_queries"] == 1
+
+    def test_empty_answer_fires_next_rung_immediately(self, fake_pipeline, monkeypatch):
+        got, started, stats = self._search(monkeypatch, {
+            "Artist A Song A official video": (0.0, [_candidate("v", "Artist A - Song A (Official Video)")]),
+        }, delay=60)
+        assert [c["id"] for c in got] == ["v"]
+        assert len(started) == 2 and stats["hedged_queries"] == 0
+
+    def test_marginal_answer_does_not_escalate(self, fake_pipeline, monkeypatch):
+        marginal = [_candidate("m", "Artist A Song A", duration=240, views=0, channel="x")]
+        got, started, _ = self._search(monkeypatch, {"Artist A": (0.0, marginal)}, delay=60)
+        assert [c["id"] for c in got] == ["m"] and len(started) == 1
+
+    def test_marginal_answer_waits_for_rung_in_flight(self, fake_pipeline, monkeypatch):
+        marginal = [_candidate("m", "Artist A Song A", duration=240, views=0, channel="x")]
+        got, started, stats = self._search(monkeypatch, {
+            "Artist A Song A official audio": (0.3, marginal),
+            "Artist A Song A official video": (0.5, [_candidate("v", "Artist A - Song A (Official Video)")]),
+        }, delay=0.05)
+        # The slow primary was hedged once; its marginal answer fires nothing more but the hedge still wins
+        assert [c["id"] for c in got] == ["v"] and len(started) == 2 and stats["hedged_queries"] == 1
+
+    def test_hedging_is_opt_in(self):
+        assert aether_engine._HEDGE_DELAY is None
+
+    def test_sequential_when_disabled(self, fake_pipeline, monkeypatch):
+        got, started, _ = self._search(monkeypatch, {
+            "Artist A Song A official audio": (0.0, [_candidate("a", "Artist A - Song A", views=0, channel="x")]),
+        }, delay=None)
+        assert [c["id"] for c in got] == ["a"] and len(started) == 1
+
+
+class TestStreamingPipeline:
+    def test_first_file_lands_while_harvest_is_still_running(self, tmp_path, fake_pipeline):
+        catalogue, calls = fake_pipeline
+        for i in range(6):
+            catalogue[f"Artist {i} Song {i}"] = [_candidate(f"v{i}", f"Artist {i} - Song {i} (Official Audio)",
+                                                            channel=f"Artist {i}")]
+        harvested, timeline = [], []
+
+        async def harvest():
+            for i in range(6):
+                await asyncio.sleep(0.02)  # rows trickle in like a scrolling harvest
+                harvested.append(i)
+                yield i, {"artist": f"Artist {i}", "title": f"Song {i}", "duration": "3:00"}
+
+        async def go():
+            engine = IngestEngine(tmp_path, "Lib", concurrency=2)
+            async for event in engine.run_stream(harvest(), match_workers=2, stage_queue=1):
+                if isinstance(event, TrackComplete):
+                    timeline.append((event.index, len(harvested)))
+
+        asyncio.run(go())
+        assert sorted(i for i, _ in timeline) == list(range(6))
+        assert timeline[0][1] < 6  # the first file landed before the last row was harvested
+        assert len(calls["download"]) == 6
+
+    def test_stream_statuses_and_settled_tracks(self, tmp_path, fake_pipeline):
+        catalogue, _ = fake_pipeline
+        catalogue["Artist A Song A"] = [_candidate("aaa", "Artist A - Song A (Official Audio)")]
+        (tmp_path / "Artist B - Song B.mp3").write_bytes(b"x")
+
+        async def source():
+            yield 0, {"artist": "Artist A", "title": "Song A", "duration": "3:00"}
+            yield 1, {"artist": "Artist B", "title": "Song B", "duration": "3:00"}
+            yield 2, {"artist": "Nobody", "title": "Nothing", "duration": "3:00"}
+
+        async def go():
+            return [e async for e in IngestEngine(tmp_path, "Lib", concurrency=1).run_stream(source())]
+
+        statuses = {}
+        for e in asyncio.run(go()):
+            if isinstance(e, TrackStatus):
+                statuses.setdefault(e.index, []).append(e.status)
+        assert statuses == {0: ["MATCHING", "ARCHIVING"], 1: ["ALREADY ARCHIVED"], 2: ["MATCHING", "NO MATCH"]}
+
+    def test_source_error_ends_stream_cleanly(self, tmp_path, fake_pipeline):
+        async def source():
+            yield 0, {"artist": "Nobody", "title": "Nothing", "duration": "3:00"}
+            raise RuntimeError("harvest died")
+
+        async def go():
+            return [e async for e in IngestEngine(tmp_path, "Lib", concurrency=1).run_stream(source())]
+
+        events = asyncio.run(go())
+        assert any(isinstance(e, EngineLog) and "harvest died" in e.message for e in events)
+        assert any(isinstance(e, TrackStatus) and e.status == "NO MATCH" for e in events)
+
+
+class TestSingleFlight:
+    def test_concurrent_identical_calls_share_one_task(self):
+        flights, started = aether_engine.SingleFlight(), []
+
+        async def work():
+            started.append(1)
+            await asyncio.sleep(0.01)
+            return "r"
+
+        async def go():
+            return await asyncio.gather(*(flights.do("k", work) for _ in range(3)))
+
+        assert asyncio.run(go()) == [("r", False), ("r", True), ("r", True)]
+        assert started == [1] and flights.counters() == {"calls": 1, "coalesced": 2}
+
+    def test_shared_task_survives_until_last_waiter_cancels(self):
+        flights = aether_engine.SingleFlight()
+
+        async def go():
+            work = asyncio.Event()
+            first = asyncio.create_task(flights.do("k", work.wait))
+            second = asyncio.create_task(flights.do("k", work.wait))
+            await asyncio.sleep(0)
+            shared = flights._inflight["k"][0]
+            first.cancel()
+            await asyncio.sleep(0)
+            assert not shared.cancelled()
+            second.cancel()
+            await asyncio.gather(first, second, shared, return_exceptions=True)
+            return shared.cancelled()
+
+        assert asyncio.run(go())
+
+    def test_identical_searches_in_flight_are_coalesced(self, tmp_path, fake_pipeline, monkeypatch):
+        started = []
+
+        async def slow_search(query):
+            started.append(query)
+            await asyncio.sleep(0.02)
+            return [_candidate("aaa", "Artist A - Song A (Official Audio)")]
+
+        monkeypatch.setattr(aether_engine, "perform_youtube_search", slow_search)
+        engine = IngestEngine(tmp_path, "Lib", concurrency=1)
+        track = {"artist": "Artist A", "title": "Song A", "duration": "3:00"}
+
+        async def go():
+            # Same track in two playlists, no Spotify ID: both match calls search at once
+            return await asyncio.gather(engine.match(0, track, log=lambda m: None),
+                                        engine.match(1, dict(track), log=lambda m: None))
+
+        assert [b["id"] for b in asyncio.run(go())] == ["aaa", "aaa"]
+        assert len(started) == 1 and engine.search_stats["coalesced_searches"] == 1
+
+    def test_same_video_downloaded_once_for_two_tracks(self, tmp_path, fake_pipeline, monkeypatch):
+        _, calls = fake_pipeline
+
+        def slow_download(url, out_stem, progress_hook=None):
+            calls["download"].append(url)
+            aether_engine.time.sleep(0.05)
+            out_stem.with_suffix(".mp3").write_bytes(b"\x00" * 64)
+            return {"upload_date": "20200101"}
+
+        monkeypatch.setattr(aether_engine, "_download_audio", slow_download)
+        video = _candidate("vvv", "Artist A - Song A")
+        tracks = [{"artist": "Artist A", "title": "Song A", "duration": "3:00", "youtube_best": video},
+                  {"artist": "Artist A", "title": "Song A (Remix)", "duration": "3:00", "youtube_best": video}]
+        engine = IngestEngine(tmp_path, "Lib", concurrency=2)
+        events = _collect(engine, tracks)
+        done = sorted(e.path.name for e in events if isinstance(e, TrackComplete))
+        assert done == ["Artist A - Song A (Remix).mp3", "Artist A - Song A.mp3"]
+        assert calls["download"] == ["https://yt/vvv"] and engine.search_stats["coalesced_downloads"] == 1
+        assert not list(tmp_path.glob("tmp_*")) and aether_engine._DOWNLOAD_REFS == {}
+
+
+class TestScoring:
+    TRACKS = [
+        {"artist": "Artist A", "title": "Song A", "duration": "3:00"},
+        {"artist": "Big Band", "title": "Live Forever (Cover)", "duration_ms": 241_500},
+        {"artist": "", "title": "Untitled", "duration": ""},
+    ]
+    CANDIDATES = [
+        _candidate("a1", "Artist A - Song A (Official Audio)"),
+        _candidate("a2", "Song A (Cover) live", duration=215, views=12, channel="someone"),
+        {**_candidate("a3", "ARTIST A — song a", duration=300, views=0, channel="ArtistAVEVO"),
+         "channel_is_verified": True},
+        {"id": "a4", "title": None, "duration": None, "view_count": None, "uploader": "Artist A - Topic"},
+        _candidate("a5", "Big Band - Live Forever", duration=242, channel="Big Band Official"),
+    ]
+    # The pre-batch _score_result, run on these candidates (a4's missing title read as ""; that scorer
+    # raised on None), rounded to 6 places
+    EXPECTED = [
+        [0.780782, 0.0, 0.3375, 0.075, 0.214939],
+        [0.286664, 0.386773, 0.261095, 0.0, 0.816497],
+        [0.179845, 0.0, 0.166154, 0.45, 0.128333],
+    ]
+
+    def test_per_track_features_keep_scores(self):
+        for track, expected in zip(self.TRACKS, self.EXPECTED):
+            got = aether_engine.score_candidates(self.CANDIDATES, aether_engine.TrackFeatures.of(track))
+            assert got == pytest.approx(expected, abs=1e-6)
+            assert got == [aether_engine._score_result(c, track, aether_engine._track_seconds(track))
+                           for c in self.CANDIDATES]
+
+    def test_batch_of_tracks_splits_back_per_track(self):
+        jobs = [(self.CANDIDATES[:k], aether_engine.TrackFeatures.of(t)) for k, t in zip((2, 0, 5), self.TRACKS)]
+        batched = aether_engine.score_batch(jobs)
+        assert [len(b) for b in batched] == [2, 0, 5]
+        assert batched == [aether_engine.score_candidates(r, f) for r, f in jobs]
+        assert batched[2] == pytest.approx(self.EXPECTED[2], abs=1e-6)
+
+    def test_ranking_off_loop_is_the_same(self, monkeypatch):
+        track = self.TRACKS[0]
+        on_loop = asyncio.run(aether_engine._rank_off_loop(self.CANDIDATES, track))
+        monkeypatch.setattr(aether_engine, "_SCORE_IN_THREAD", True)
+        assert asyncio.run(aether_engine._rank_off_loop(self.CANDIDATES, track)) == on_loop
+
+
+class TestMatchScheduler:
+    def _drain(self, scheduler, indices, before=None):
+        async def go():
+            for i in indices:
+                scheduler.submit(i)
+            if before:
+                before()
+            scheduler.start()
+            while scheduler.queued or scheduler.running:
+                await asyncio.sleep(0.005)
+            scheduler.cancel()
+        asyncio.run(go())
+
+    def test_concurrency_is_bounded(self):
+        active, peak = [0], [0]
+
+        async def match(index):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.002)
+            active[0] -= 1
+
+        depths = []
+        scheduler = aether_engine.MatchScheduler(match, concurrency=3,
+                                                 on_change=lambda q, r: depths.append((q, r)))
+        self._drain(scheduler, range(30))
+        assert peak[0] == 3 and depths[-1] == (0, 0) and max(q for q, _ in depths) == 30
+
+    def test_claim_waits_for_running_match_and_drops_waiting(self):
+        release, matched = asyncio.Event(), []
+
+        async def match(index):
+            await release.wait()
+            matched.append(index)
+
+        async def go():
+            scheduler = aether_engine.MatchScheduler(match, concurrency=1)
+            scheduler.submit(0)
+            scheduler.submit(1)
+            scheduler.start()
+            await asyncio.sleep(0.01)  # 0 running, 1 waiting
+            await scheduler.claim(1)
+            claim = asyncio.create_task(scheduler.claim(0))
+            await asyncio.sleep(0.01)
+            assert not claim.done()  # ingest must not match track 0 while the scheduler still is
+            release.set()
+            await claim
+            scheduler.cancel()
+            return scheduler
+
+        scheduler = asyncio.run(go())
+        assert matched == [0] and scheduler.queued == 0 and scheduler.running == 0
+
+    def test_priority_lookahead_then_visible_then_selected(self):
+        order = []
+
+        async def match(index):
+            order.append(index)
+
+        scheduler = aether_engine.MatchScheduler(
+            match, concurrency=1, lookahead=2, is_selected=lambda i: i in (7, 9),
+            visible=lambda: range(4, 6))
+        scheduler.set_cursor(10)
+        self._drain(scheduler, range(12), before=lambda: scheduler.discard(0))
+        assert order == [10, 11, 4, 5, 7, 9, 1, 2, 3, 6, 8]
+
+
+class TestSearchCache:
+    def test_compacts_and_normalizes(self, tmp_path):
+        cache = aether_store.SearchCache(tmp_path / "s.sqlite3")
+        cache.put("Artist  A Song", [{**_candidate("a", "t"), "formats": [{"big": 1}] * 50}])
+        got = cache.get("artist a   song")
+        assert got == [_candidate("a", "t")]
+
+    def test_expired_entries_miss(self, tmp_path, monkeypatch):
+        cache = aether_store.SearchCache(tmp_path / "s.sqlite3", ttl=60)
+        cache.put("q", [_candidate("a", "t")])
+        monkeypatch.setattr(aether_store.time, "time", lambda: 10**11)
+        assert cache.get("q") is None
+
+    def test_no_match_verdicts_expire(self, tmp_path, monkeypatch):
+        cache = aether_store.NoMatchCache(tmp_path / "s.sqlite3", ttl=60)
+        cache.add("nobody|nothing|180")
+        assert cache.contains("nobody|nothing|180")
+        monkeypatch.setattr(aether_store.time, "time", lambda: 10**11)
+        assert not cache.contains("nobody|nothing|180")
+
+    def test_rewriting_a_query_does_not_count_twice(self, tmp_path):
+        cache = aether_store.SearchCache(tmp_path / "s.sqlite3", max_entries=2)
+        for _ in range(3):
+            cache.put("same", [_candidate("s", "t")])
+        cache.put("other", [_candidate("o", "t")])
+        assert cache.get("same") and cache.get("other") and cache._rows == 2
+
+    def test_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        clock = iter(range(1000, 2000))
+        monkeypatch.setattr(aether_store.time, "time", lambda: next(clock))
+        cache = aether_store.SearchCache(tmp_path / "s.sqlite3", max_entries=2)
+        cache.put("old", [_candidate("o", "t")])
+        cache.put("kept", [_candidate("k", "t")])
+        cache.get("old")  # touch: "kept" is now the least recently used
+        cache.put("new", [_candidate("n", "t")])
+        assert cache.get("kept") is None
+        assert cache.get("old") and cache.get("new")
+
+
+class _FakeYdl:
+    def __init__(self, params):
+        self.params = {**params, "outtmpl": {"default": "%(title)s.%(ext)s"}}
+        self.hooks = []
+        self.closed = False
+
+    def add_progress_hook(self, hook):
+        self.hooks.append(hook)
+
+    def extract_info(self, url, download=False):
+        if url.startswith("ytsearch"):
+            return {"entries": [{"id": "v", "flat": bool(self.params.get("extract_flat"))}]}
+        for hook in self.hooks:
+            hook({"status": "downloading", "url": url})
+        Path(self.params["outtmpl"]["default"].replace("%(ext)s", "mp3")).write_bytes(b"x")
+        return {"id": "v", "upload_date": "20200101", "thumbnail": "https://i/v.jpg"}
+
+    def close(self):
+        self.closed = True
+
+
+class TestYdlPool:
+    def test_one_instance_per_thread_and_profile(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(aether_engine._LAZY_MODULES, "yt_dlp", type("M", (), {"YoutubeDL": _FakeYdl}))
+        pool = aether_engine.YdlPool(tmp_path)
+        with ThreadPoolExecutor(2) as ex:
+            searchers = list(ex.map(lambda _: pool.get("search"), range(20)))
+        assert len({id(y) for y in searchers}) == pool.created <= 2
+        assert searchers[0].params["cachedir"] == str(tmp_path)
+        assert pool.get("download") is not pool.get("search")
+        pool.close()
+        assert all(y.closed for y in searchers)
+
+    def test_download_reuses_instance_with_per_call_output_and_hook(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(aether_engine._LAZY_MODULES, "yt_dlp", type("M", (), {"YoutubeDL": _FakeYdl}))
+        pool = aether_engine.YdlPool(tmp_path)
+        monkeypatch.setattr(aether_engine, "_YDL_POOL", pool)
+        seen = []
+        aether_engine._download_audio("u1", tmp_path / "one", lambda d: seen.append(d["url"]))
+        aether_engine._download_audio("u2", tmp_path / "two")
+        assert (tmp_path / "one.mp3").exists() and (tmp_path / "two.mp3").exists()
+        assert seen == ["u1"] and pool.created == 1
+
+    def test_flat_search_mode(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(aether_engine._LAZY_MODULES, "yt_dlp", type("M", (), {"YoutubeDL": _FakeYdl}))
+        monkeypatch.setattr(aether_engine, "_YDL_POOL", aether_engine.YdlPool(tmp_path))
+        assert asyncio.run(aether_engine.perform_youtube_search("q"))[0]["flat"] is True
+        monkeypatch.setattr(aether_engine, "_SEARCH_MODE", "full")
+        assert asyncio.run(aether_engine.perform_youtube_search("q"))[0]["flat"] is False
+        with pytest.raises(ValueError):
+            aether_engine.set_search_mode("fast")
+
+    def test_download_fills_tag_fields_missing_from_flat_result(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(aether_engine._LAZY_MODULES, "yt_dlp", type("M", (), {"YoutubeDL": _FakeYdl}))
+        monkeypatch.setattr(aether_engine, "_YDL_POOL", aether_engine.YdlPool(tmp_path))
+        best = {"id": "v", "title": "t", "upload_date": "20240505"}
+        path = asyncio.run(aether_engine._download_with_retry("u", tmp_path / "tmp_v", "x", best=best))
+        assert path == tmp_path / "tmp_v.mp3"
+        assert best == {"id": "v", "title": "t", "upload_date": "20240505", "thumbnail": "https://i/v.jpg"}
+
+
+def test_track_key_prefers_spotify_id():
+    assert aether_engine.track_key({"artist": "A", "title": "B", "track_id": "x1"}) == "spotify:x1"
+    assert aether_engine.track_key({"artist": "A ", "title": "Song"}) == "text:a _song"
+    # Two different recordings sharing artist + title stay distinct once IDs are known
+    assert (aether_engine.track_key({"artist": "A", "title": "B", "track_id": "x1"})
+            != aether_engine.track_key({"artist": "A", "title": "B", "track_id": "x2"}))
+
+
+async def _no_sleep(_seconds):
+    return None
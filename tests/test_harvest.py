@@ -0,0 +1,546 @@
+import asyncio
+import http.server
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# The harvester has no Textual dependency, so it imports directly (no pre-import mocking)
+import aether_harvest
+import aether_store
+from aether_harvest import HarvestBatch, _playlist_name_from_title
+
+
+def _row(n):
+    return {"artist": f"Artist {n}", "title": f"Song {n}", "duration": "3:00"}
+
+
+class TestScrapePlaylistData:
+    def test_collects_streamed_batches(self, monkeypatch):
+        async def fake_harvest(url, include_recommended=False, strategy="json"):
+            yield HarvestBatch([], 0, "Mix")
+            yield HarvestBatch([_row(1), _row(2)], 2, "Mix")
+            yield HarvestBatch([_row(3)], 3, "Mix")
+
+        monkeypatch.setattr(aether_harvest, "harvest_playlist", fake_harvest)
+        name, tracks = asyncio.run(aether_harvest.scrape_playlist_data("https://x"))
+        assert name == "Mix"
+        assert [t["title"] for t in tracks] == ["Song 1", "Song 2", "Song 3"]
+
+    def test_keeps_partial_rows_on_failure(self, monkeypatch):
+        async def fake_harvest(url, include_recommended=False, strategy="json"):
+            yield HarvestBatch([_row(1)], 1, "Mix")
+            raise RuntimeError("page crashed")
+
+        monkeypatch.setattr(aether_harvest, "harvest_playlist", fake_harvest)
+        name, tracks = asyncio.run(aether_harvest.scrape_playlist_data("https://x"))
+        assert name == "Mix" and len(tracks) == 1
+
+
+def test_playlist_name_from_title():
+    assert _playlist_name_from_title("Chill Mix - playlist by Someone | Spotify") == "Chill Mix"
+    assert _playlist_name_from_title("") == "Unknown Playlist"
+
+
+class TestScrollTermination:
+    def test_parse_declared_count(self):
+        assert aether_harvest._parse_declared_count(["Someone", "1,204 songs, about 80 hr"]) == 1204
+        assert aether_harvest._parse_declared_count(["Playlist · Spotify · 50 items · 3 saves"]) == 50
+        assert aether_harvest._parse_declared_count(["no numbers here"]) is None
+
+    def test_stops_at_declared_count(self):
+        pacer = aether_harvest.ScrollPacer(declared_total=30)
+        pacer.observe(20)
+        assert pacer.stop_reason(20) is None
+        pacer.observe(10)
+        assert pacer.stop_reason(30) == aether_harvest.STOP_DECLARED_COUNT
+
+    def test_backs_off_then_stalls(self):
+        pacer = aether_harvest.ScrollPacer()
+        waits = []
+        while pacer.stop_reason(5) is None:
+            pacer.observe(0)
+            waits.append(pacer.wait)
+        assert waits == sorted(waits) and waits[-1] <= aether_harvest.MAX_SCROLL_WAIT
+        assert pacer.idle >= aether_harvest.STALL_SECONDS
+        assert pacer.stop_reason(5) == aether_harvest.STOP_STALLED
+
+    def test_speeds_up_while_rows_arrive(self):
+        pacer = aether_harvest.ScrollPacer(declared_total=500)
+        start_wait, start_step = pacer.wait, pacer.step
+        for _ in range(5):
+            pacer.observe(25)
+        assert pacer.wait < start_wait and pacer.step > start_step
+        for _ in range(100):
+            pacer.observe(0)
+        assert pacer.stop_reason(125) == aether_harvest.STOP_STALLED_SHORT
+
+
+class _FakeContext:
+    def __init__(self, cookies):
+        self._cookies = cookies
+        self.pages_open = 0
+        self.peak = 0
+
+    def on(self, event, handler):
+        pass
+
+    async def cookies(self):
+        return self._cookies
+
+    async def new_page(self):
+        ctx = self
+        ctx.pages_open += 1
+        ctx.peak = max(ctx.peak, ctx.pages_open)
+
+        class _Page:
+            clicks = 0
+
+            async def click(self, selector, timeout=0):
+                _Page.clicks += 1
+
+            async def close(self):
+                ctx.pages_open -= 1
+        return _Page()
+
+    async def close(self):
+        pass
+
+
+def _fake_playwright(monkeypatch, cookies=()):
+    launched = []
+
+    class _Chromium:
+        async def launch_persistent_context(self, user_data_dir, **kwargs):
+            launched.append(user_data_dir)
+            return _FakeContext(list(cookies))
+
+    class _Playwright:
+        chromium = _Chromium()
+
+        async def stop(self):
+            pass
+
+    class _Starter:
+        async def start(self):
+            return _Playwright()
+
+    class _Module:
+        async_playwright = staticmethod(lambda: _Starter())
+
+    monkeypatch.setattr(aether_harvest, "_lazy_import", lambda name: _Module)
+    return launched
+
+
+class TestBrowserPool:
+    def test_reuses_one_browser_and_caps_pages(self, tmp_path, monkeypatch):
+        launched = _fake_playwright(monkeypatch)
+        pool = aether_harvest.BrowserPool(max_pages=2, profile_dir=tmp_path / "profile")
+
+        async def scrape():
+            async with pool.page():
+                await asyncio.sleep(0.01)
+
+        async def go():
+            await asyncio.gather(*(scrape() for _ in range(6)))
+            peak = pool._context.peak
+            await pool.close()
+            return peak
+
+        assert asyncio.run(go()) == 2
+        assert len(launched) == 1
+        assert pool.in_use == 0 and pool.waiting == 0
+
+    def test_consent_click_skipped_when_cookie_present(self, tmp_path, monkeypatch):
+        _fake_playwright(monkeypatch, cookies=[{"name": aether_harvest.CONSENT_COOKIE}])
+        pool = aether_harvest.BrowserPool(profile_dir=tmp_path / "profile")
+
+        async def go():
+            async with pool.page() as page:
+                await pool.dismiss_consent(page)
+                return type(page).clicks
+
+        assert asyncio.run(go()) == 0
+
+
+class TestRouteFilter:
+    def test_should_block(self):
+        block = aether_harvest.RouteFilter().should_block
+        assert block("image", "https://i.scdn.co/image/ab67")
+        assert block("font", "https://encore.scdn.co/fonts/x.woff2")
+        assert block("script", "https://www.googletagmanager.com/gtm.js")
+        assert block("xhr", "https://gabo-receiver-service.spotify.com/v3/events")
+        assert block("script", "https://cdn.example-ads.net/tag.js")
+        assert not block("document", "https://open.spotify.com/playlist/abc")
+        assert not block("script", "https://open.spotifycdn.com/cdn/build/web-player.js")
+        assert not block("fetch", "https://api-partner.spotify.com/pathfinder/v1/query")
+        assert not block("stylesheet", "https://encore.scdn.co/web/index.css")
+
+    def test_handle_tallies_blocked_and_allowed(self):
+        rf = aether_harvest.RouteFilter()
+        actions = []
+
+        class _Route:
+            def __init__(self, kind, url):
+                self.request = type("Req", (), {"resource_type": kind, "url": url})()
+
+            async def abort(self):
+                actions.append("abort")
+
+            async def fallback(self):
+                actions.append("continue")
+
+        async def go():
+            await rf.handle(_Route("image", "https://i.scdn.co/a.jpg"))
+            await rf.handle(_Route("image", "https://i.scdn.co/b.jpg"))
+            await rf.handle(_Route("document", "https://open.spotify.com/playlist/x"))
+
+        asyncio.run(go())
+        rf.on_response(type("Resp", (), {"headers": {"content-length": "1000"}})())
+        rf.mark_ready()
+        report = rf.report()
+        assert actions == ["abort", "abort", "continue"]
+        assert report["blocked_by_type"] == {"image": 2}
+        assert report["bytes_saved_est"] == 2 * aether_harvest.ESTIMATED_BLOCKED_BYTES["image"]
+        assert report["allowed_bytes"] == 1000
+        assert "BLOCKED 2 REQUESTS" in aether_harvest.format_route_report(report)
+
+
+def _pathfinder_payload(offset, names, total):
+    """Names starting with "ep:" become podcast episodes, which the parser skips."""
+    items = [{"itemV2": {"data": {"__typename": "Episode", "name": n}}} if n.startswith("ep:") else
+             {"itemV2": {"data": {
+                 "__typename": "Track", "name": n, "uri": f"spotify:track:id{n}",
+                 "artists": {"items": [{"profile": {"name": "Artist A"}}, {"profile": {"name": "Artist B"}}]},
+                 "trackDuration": {"totalMilliseconds": 215_400}}}} for n in names]
+    return {"data": {"playlistV2": {"name": "Mix", "content": {
+        "items": items, "totalCount": total, "pagingInfo": {"offset": offset, "limit": len(names)}}}}}
+
+
+class TestJsonHarvest:
+    def test_parse_pathfinder_page(self):
+        parsed = aether_harvest._parse_playlist_json(_pathfinder_payload(0, ["S1", "S2"], 40))
+        assert parsed["total"] == 40 and parsed["name"] == "Mix"
+        assert parsed["rows"][0] == {"artist": "Artist A, Artist B", "title": "S1", "duration": "3:35",
+                                     "duration_ms": 215_400, "track_id": "idS1"}
+
+    def test_parse_web_api_page_and_skips_episodes(self):
+        payload = {"items": [
+            {"track": {"type": "track", "name": "Song", "id": "t1", "duration_ms": 3_600_000,
+                       "artists": [{"name": "X"}]}},
+            {"track": {"type": "episode", "name": "Podcast", "id": "e1"}},
+        ], "total": 2, "offset": 0, "next": None}
+        rows = aether_harvest._parse_playlist_json(payload)["rows"]
+        assert [r["track_id"] for r in rows] == ["t1"] and rows[0]["duration"] == "1:00:00"
+
+    def test_unrelated_json_is_ignored(self):
+        assert aether_harvest._parse_playlist_json({"data": {"me": {}}}) is None
+
+    def test_pager_rewrites_offset(self):
+        url = "https://api-partner.spotify.com/pathfinder/v1/query?operationName=fetchPlaylist&variables=%7B%22offset%22%3A0%2C%22limit%22%3A25%7D"
+        pager = aether_harvest._JsonPager(None, url, "GET", {":authority": "x", "authorization": "Bearer t"}, None)
+        new_url, _ = pager.request_for(25, 100)
+        assert '"offset":25' in aether_harvest.urlsplit(new_url).query.replace("%22", '"').replace("%3A", ":")
+        assert pager.headers == {"authorization": "Bearer t"}
+        body = '{"variables": {"uri": "spotify:playlist:x", "offset": 0, "limit": 25}}'
+        post = aether_harvest._JsonPager(None, url, "POST", {}, body)
+        assert aether_harvest.json.loads(post.request_for(50, 100)[1])["variables"]["offset"] == 50
+
+    def _page_json(self, first, pages):
+        """Run _harvest_json over a captured first page, serving ``pages`` (offset -> payload) to the pager."""
+        capture = aether_harvest._JsonCapture()
+        capture.pages.append(aether_harvest._parse_playlist_json(first))
+        capture.pager_args = ("https://api-partner.spotify.com/pathfinder/v1/query?variables=%7B%7D", "GET", {}, None)
+        fetched = []
+
+        class _Resp:
+            ok = True
+
+            def __init__(self, payload):
+                self.payload = payload
+
+            async def json(self):
+                return self.payload
+
+        class _Request:
+            async def fetch(self, url, **kwargs):
+                query = dict(aether_harvest.parse_qsl(aether_harvest.urlsplit(url).query))
+                offset = aether_harvest.json.loads(query["variables"])["offset"]
+                fetched.append(offset)
+                return _Resp(pages[offset])
+
+        page = type("Page", (), {"request": _Request()})()
+        seen = set()
+
+        async def go():
+            return [b async for b in aether_harvest._harvest_json(page, capture, "Mix", seen)]
+
+        return asyncio.run(go()), fetched, seen
+
+    def test_pages_until_declared_total(self):
+        batches, fetched, seen = self._page_json(_pathfinder_payload(0, ["S1", "S2"], 3),
+                                                 {2: _pathfinder_payload(2, ["S3"], 3)})
+        assert [len(b.tracks) for b in batches] == [2, 1]
+        assert batches[-1].stop_reason == aether_harvest.STOP_JSON_COMPLETE
+        assert batches[-1].total == 3 and fetched == [2]
+        assert "text:artist a, artist b_s3" in seen  # DOM fallback dedupes against JSON rows
+
+    def test_skipped_items_still_advance_the_offset(self):
+        # Offsets and the declared total count the episode too; paging must not re-request item 2
+        batches, fetched, _ = self._page_json(_pathfinder_payload(0, ["S1", "ep:Talk", "S2"], 5),
+                                              {3: _pathfinder_payload(3, ["S3", "S4"], 5)})
+        assert fetched == [3] and batches[-1].stop_reason == aether_harvest.STOP_JSON_COMPLETE
+        assert [t["title"] for b in batches for t in b.tracks] == ["S1", "S2", "S3", "S4"]
+
+    def test_dom_rows_dedupe_by_track_id(self):
+        seen = set()
+        aether_harvest._mark_seen(seen, {"artist": "A", "title": "Intro", "track_id": "t1"})
+        drained = [{"artists": "A", "title": "Intro", "duration": "1:00", "track_id": "t1"},
+                   {"artists": "A", "title": "Intro", "duration": "1:30", "track_id": "t2"},
+                   {"artists": "A", "title": "Intro", "duration": "1:00", "track_id": None}]
+        rows = [r for r in map(aether_harvest._dom_row, drained)
+                if aether_harvest.track_key(r) not in seen]
+        # Same title, different track survives; the ID-less row still dedupes on text
+        assert [r.get("track_id") for r in rows] == ["t2"]
+
+
+# ── Embed harvest against a local HTTP stand-in ─────────────────
+EMBED_FIXTURES = Path(__file__).parent / "fixtures" / "embed"
+FIXTURE_ID = "1a2B3c4D5e6F7g8H9i0J"
+
+
+@pytest.fixture
+def embed_server(tmp_path):
+    """Serves <dir>/<id>.html at /embed/playlist/<id>, like open.spotify.com; 404 otherwise."""
+    pages = tmp_path / "embed"
+    shutil.copytree(EMBED_FIXTURES, pages)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            page = pages / (self.path.rsplit("/", 1)[-1] + ".html")
+            if not self.path.startswith("/embed/playlist/") or not page.exists():
+                self.send_error(404)
+                return
+            body = page.read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield pages, f"http://127.0.0.1:{server.server_address[1]}/embed/playlist/"
+    server.shutdown()
+
+
+class _NoBrowserPool:
+    block_resources = False
+
+    def page(self):
+        raise RuntimeError("browser needed")
+
+
+def _harvest(url, base_url):
+    async def go():
+        batches = []
+        try:
+            async for b in aether_harvest.harvest_playlist(url, pool=_NoBrowserPool(), embed_base_url=base_url):
+                batches.append(b)
+        except RuntimeError as e:
+            return batches, str(e)
+        return batches, None
+    return asyncio.run(go())
+
+
+class TestEmbedHarvest:
+    def test_playlist_id_from_url(self):
+        assert aether_harvest.playlist_id_from_url(
+            f"https://open.spotify.com/playlist/{FIXTURE_ID}?si=abc123") == FIXTURE_ID
+        assert aether_harvest.playlist_id_from_url(f"spotify:playlist:{FIXTURE_ID}") == FIXTURE_ID
+        assert aether_harvest.playlist_id_from_url("https://example.com") is None
+
+    def test_parse_captured_page(self):
+        parsed = aether_harvest.parse_embed_page((EMBED_FIXTURES / f"{FIXTURE_ID}.html").read_text("utf-8"))
+        assert parsed["name"] == "Late Night Drive" and not parsed["truncated"]
+        assert parsed["rows"][0] == {"artist": "M83", "title": "Midnight City", "duration": "4:04",
+                                     "duration_ms": 243960, "track_id": "4uLU6hMCjMI75M1A2tKUQC"}
+        assert parsed["rows"][2]["artist"] == "The Killers, Someone Else"
+
+    def test_complete_embed_needs_no_browser(self, embed_server):
+        _, base = embed_server
+        batches, error = _harvest(f"https://open.spotify.com/playlist/{FIXTURE_ID}?si=x", base)
+        assert error is None and len(batches) == 1
+        assert batches[0].strategy == "embed" and batches[0].total == 3
+        assert batches[0].stop_reason == aether_harvest.STOP_EMBED_COMPLETE
+
+    def test_truncated_embed_falls_back_to_browser(self, embed_server):
+        pages, base = embed_server
+        html = (pages / f"{FIXTURE_ID}.html").read_text("utf-8")
+        start = html.index('"trackList": [') + len('"trackList": [')
+        item = html[start:html.index("}", start) + 1]
+        big = html[:start] + ", ".join([item] * aether_harvest.EMBED_TRACK_LIMIT) + html[html.index("]", start):]
+        (pages / "0123456789abcdef").with_suffix(".html").write_text(big, "utf-8")
+        batches, error = _harvest("https://open.spotify.com/playlist/0123456789abcdef", base)
+        assert error == "browser needed"
+        assert len(batches) == 1 and batches[0].stop_reason is None
+
+    def test_missing_embed_goes_straight_to_browser(self, embed_server):
+        _, base = embed_server
+        batches, error = _harvest("https://open.spotify.com/playlist/NoSuchPlaylist00", base)
+        assert batches == [] and error == "browser needed"
+
+
+class TestHarvestWorker:
+    def test_batch_round_trip(self):
+        batch = HarvestBatch([_row(1), {"artist": "A", "title": "Ü", "duration": "1:00",
+                                        "duration_ms": 60000, "track_id": "t1"}],
+                             2, "Mix", 2, "embed complete", None, "embed")
+        line = aether_harvest.encode_batch(7, batch)
+        msg = aether_harvest.json.loads(line)
+        assert msg["id"] == 7
+        assert aether_harvest.decode_batch(msg) == batch
+
+    def test_streams_batches_from_child_process(self, embed_server):
+        _, base = embed_server
+
+        async def go():
+            worker = aether_harvest.HarvestWorker()
+            try:
+                url = f"https://open.spotify.com/playlist/{FIXTURE_ID}"
+                first = [b async for b in worker.harvest(url, embed_base_url=base)]
+                second = [b async for b in worker.harvest(url, embed_base_url=base)]
+                pid = worker._proc.pid
+            finally:
+                await worker.close()
+            return first, second, pid
+
+        first, second, pid = asyncio.run(go())
+        assert [b.total for b in first] == [3] and first[0].strategy == "embed"
+        assert first[0].tracks[0]["track_id"] == "4uLU6hMCjMI75M1A2tKUQC"
+        assert second == first  # one long-lived child served both requests
+        assert pid
+
+    def test_worker_exit_fails_pending_harvest(self):
+        async def go():
+            worker = aether_harvest.HarvestWorker(command=[sys.executable, "-c", "import sys; sys.exit(3)"])
+            try:
+                with pytest.raises(RuntimeError, match="worker exited"):
+                    async for _ in worker.harvest("https://open.spotify.com/playlist/x"):
+                        pass
+            finally:
+                await worker.close()
+
+        asyncio.run(go())
+
+    def test_worker_exit_reports_stderr_tail(self):
+        script = "import sys; sys.stderr.write('noise\\nplaywright not installed\\n'); sys.exit(1)"
+
+        async def go():
+            worker = aether_harvest.HarvestWorker(command=[sys.executable, "-c", script])
+            try:
+                with pytest.raises(RuntimeError) as exc:
+                    async for _ in worker.harvest("https://open.spotify.com/playlist/x"):
+                        pass
+            finally:
+                await worker.close()
+            return str(exc.value)
+
+        message = asyncio.run(go())
+        assert message.startswith("harvest worker exited")
+        assert message.rstrip().endswith("playwright not installed")
+
+
+class TestHarvestCache:
+    URL = f"https://open.spotify.com/playlist/{FIXTURE_ID}"
+
+    def _run(self, cache, monkeypatch, batches, refresh=False):
+        pulled = []
+
+        async def fake_open(url, include_recommended=False, strategy="json", in_worker=False):
+            for b in batches:
+                pulled.append(b)
+                yield b
+
+        monkeypatch.setattr(aether_harvest, "open_harvest", fake_open)
+
+        async def go():
+            return [b async for b in aether_harvest.cached_harvest(self.URL, cache=cache, refresh=refresh)]
+        return asyncio.run(go()), pulled
+
+    def test_cache_key_ignores_share_noise(self):
+        key = aether_harvest.harvest_cache_key
+        assert key(self.URL + "?si=abc") == key(self.URL) == FIXTURE_ID
+        assert key(self.URL, include_recommended=True) != key(self.URL)
+
+    def test_fresh_entry_served_without_harvest(self, tmp_path, monkeypatch):
+        cache = aether_store.HarvestCache(tmp_path / "store.sqlite3")
+        cache.put(FIXTURE_ID, "Mix", [_row(1), _row(2)])
+        out, pulled = self._run(cache, monkeypatch, [HarvestBatch([_row(9)], 1, "Mix", None, "done")])
+        assert pulled == [] and len(out) == 1
+        assert out[0].stop_reason == aether_harvest.STOP_CACHE_HIT and out[0].total == 2
+
+    def test_complete_harvest_is_stored(self, tmp_path, monkeypatch):
+        cache = aether_store.HarvestCache(tmp_path / "store.sqlite3")
+        self._run(cache, monkeypatch, [HarvestBatch([_row(1)], 1, "Mix"),
+                                       HarvestBatch([_row(2)], 2, "Mix", 2, "json complete")])
+        entry = cache.get(FIXTURE_ID)
+        assert [t["title"] for t in entry["tracks"]] == ["Song 1", "Song 2"] and cache.is_fresh(entry)
+
+    def test_incomplete_harvest_is_not_stored(self, tmp_path, monkeypatch):
+        cache = aether_store.HarvestCache(tmp_path / "store.sqlite3")
+        self._run(cache, monkeypatch, [HarvestBatch([_row(1)], 1, "Mix")])
+        assert cache.get(FIXTURE_ID) is None
+
+    def test_short_stall_is_not_stored(self, tmp_path, monkeypatch):
+        cache = aether_store.HarvestCache(tmp_path / "store.sqlite3")
+        # Scrolling gave up at 2 of 5 declared rows: serving this for the whole TTL would lose 3 tracks
+        self._run(cache, monkeypatch, [HarvestBatch([_row(1), _row(2)], 2, "Mix", 5,
+                                                    aether_harvest.STOP_STALLED_SHORT)])
+        assert cache.get(FIXTURE_ID) is None
+
+    def test_plain_stall_without_declared_count_is_stored(self, tmp_path, monkeypatch):
+        cache = aether_store.HarvestCache(tmp_path / "store.sqlite3")
+        self._run(cache, monkeypatch, [HarvestBatch([_row(1)], 1, "Mix", None, aether_harvest.STOP_STALLED)])
+        assert len(cache.get(FIXTURE_ID)["tracks"]) == 1
+
+    def test_refresh_stops_at_known_rows(self, tmp_path, monkeypatch):
+        cache = aether_store.HarvestCache(tmp_path / "store.sqlite3")
+        cache.put(FIXTURE_ID, "Mix", [_row(n) for n in range(1, 21)])
+        new = [_row(100), _row(101)]
+        batches = [HarvestBatch(new + [_row(n) for n in range(1, 8)], 9, "Mix", 22),
+                   HarvestBatch([_row(n) for n in range(8, 21)], 22, "Mix", 22, "json complete")]
+        out, pulled = self._run(cache, monkeypatch, batches, refresh=True)
+        assert len(pulled) == 1  # never asked for the second page
+        assert out[-1].stop_reason == aether_harvest.STOP_KNOWN_ROWS and out[-1].total == 22
+        titles = [t["title"] for b in out for t in b.tracks]
+        assert titles == ["Song 100", "Song 101"] + [f"Song {n}" for n in range(1, 21)]
+        assert len(cache.get(FIXTURE_ID)["tracks"]) == 22
+
+    def test_refresh_keeps_going_when_declared_count_disagrees(self, tmp_path, monkeypatch):
+        cache = aether_store.HarvestCache(tmp_path / "store.sqlite3")
+        cache.put(FIXTURE_ID, "Mix", [_row(n) for n in range(1, 11)])
+        # Rows appended at the end: the top matches, but 10 + remainder != 12 declared
+        batches = [HarvestBatch([_row(n) for n in range(1, 11)], 10, "Mix", 12),
+                   HarvestBatch([_row(11), _row(12)], 12, "Mix", 12, "json complete")]
+        out, pulled = self._run(cache, monkeypatch, batches, refresh=True)
+        assert len(pulled) == 2 and out[-1].total == 12
+
+    def test_refresh_never_splices_from_truncated_embed(self, tmp_path, monkeypatch):
+        cache = aether_store.HarvestCache(tmp_path / "store.sqlite3")
+        cache.put(FIXTURE_ID, "Mix", [_row(n) for n in range(1, 151)])
+        limit = aether_harvest.EMBED_TRACK_LIMIT
+        # Over-limit playlist with 3 tracks appended since the last sync: the embed batch is cut off
+        # at the limit and declares no count, so only the browser pass can see the new tail
+        batches = [HarvestBatch([_row(n) for n in range(1, limit + 1)], limit, "Mix", None, None,
+                                strategy="embed"),
+                   HarvestBatch([_row(n) for n in range(limit + 1, 154)], 153, "Mix", 153, "json complete")]
+        out, pulled = self._run(cache, monkeypatch, batches, refresh=True)
+        assert len(pulled) == 2
+        assert out[-1].total == 153 and out[-1].stop_reason == "json complete"
+        assert [t["title"] for t in cache.get(FIXTURE_ID)["tracks"]][-3:] == ["Song 151", "Song 152", "Song 153"]
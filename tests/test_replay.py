@@ -0,0 +1,66 @@
+import asyncio
+import json
+import urllib.request
+
+# The replay harness has no Textual dependency, so it imports directly (no pre-import mocking)
+import aether_harvest
+import aether_replay
+from aether_replay import FixtureServer
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.read().decode("utf-8")
+
+
+class _NoBrowserPool:
+    block_resources = False
+    allow_hosts = ()
+
+    def page(self):
+        raise RuntimeError("browser needed")
+
+
+class TestFixtureServer:
+    def test_playlist_page_is_virtualized_stand_in(self):
+        with FixtureServer() as server:
+            html = _get(server.playlist_url(1000))
+        assert "Bench 1000 - playlist by aether | Spotify" in html
+        assert 'data-testid="playlist-tracklist"' in html and "1000 songs" in html
+
+    def test_pathfinder_pages_through_pager(self):
+        with FixtureServer() as server:
+            url = (f"{server.base}/pathfinder/v1/query?operationName=fetchPlaylist&variables="
+                   + urllib.request.quote(json.dumps({"uri": f"spotify:playlist:{aether_replay.fixture_id(1000)}",
+                                                     "offset": 0, "limit": 50})))
+            pager = aether_harvest._JsonPager(None, url, "GET", {}, None)
+            page_url, _ = pager.request_for(950, 100)
+            parsed = aether_harvest._parse_playlist_json(json.loads(_get(page_url)))
+        assert parsed["total"] == 1000 and parsed["offset"] == 950
+        assert len(parsed["rows"]) == 50 and parsed["rows"][-1]["title"] == "Bench Track 999"
+
+    def test_small_fixture_harvests_from_embed_without_browser(self):
+        with FixtureServer() as server:
+            result = asyncio.run(aether_replay.measure_harvest(
+                server.playlist_url(40), pool=_NoBrowserPool(), embed_base_url=server.embed_base))
+        assert result["rows"] == 40 and result["stop_reason"] == aether_harvest.STOP_EMBED_COMPLETE
+        assert result["scroll_iterations"] == 0 and result["final_strategy"] == "embed"
+
+    def test_large_fixture_embed_is_truncated(self):
+        with FixtureServer() as server:
+            embed = asyncio.run(aether_harvest.fetch_embed_playlist(server.playlist_url(10000), server.embed_base))
+        assert embed["truncated"] and len(embed["rows"]) == aether_harvest.EMBED_TRACK_LIMIT
+
+
+def test_print_results_table():
+    import io
+    out = io.StringIO()
+    aether_replay.print_results([{"size": 1000, "strategy": "json", "rows": 1000, "seconds": 0.5,
+                                  "rows_per_sec": 2000.0, "scroll_iterations": 0, "stop_reason": "json complete"}], out)
+    assert "2000.0" in out.getvalue() and "json complete" in out.getvalue()
+
+
+def test_ydl_bench_reports_fresh_and_pooled():
+    rows = aether_replay.bench_ydl(calls=4, threads=2, profiles=("search",))
+    by_mode = {r["mode"]: r for r in rows}
+    assert by_mode["fresh"]["instances"] == 4 and by_mode["pooled"]["instances"] <= 2